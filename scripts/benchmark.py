@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks wall time and peak memory of parsing synthetic data dumps of several sizes.
+
+Each measurement runs in a fresh process, so its peak RSS is not distorted by earlier ones. Usage:
+
+    python scripts/benchmark.py --scales 10000 100000 1000000 --output benchmark.csv
+
+Data dumps are generated once with ``health_tracking.synthetic.generate_export`` and kept in ``--directory``.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+import pandas as pd
+
+from health_tracking import constants
+from health_tracking.stats import peak_rss_mib
+from health_tracking.synthetic import generate_export
+
+STAGES = [
+    "construction",
+    "extract_all",
+    "get_export_date",
+    "extract_me",
+    "extract_records",
+    "extract_workouts",
+    "extract_correlations",
+    "extract_activity_summaries",
+    "extract_clinical_records",
+    "workouts"
+]
+
+DEFAULT_SCALES = [10 ** 4, 10 ** 5, 10 ** 6]
+
+
+def run_stage(stage: str, zip_dump_path: str, unzip_path: str, parser_arguments: dict) -> dict:
+    """
+    Measures one stage in the current process. Construction of the parser is only timed for ``"construction"``.
+
+    Args:
+        stage (str): One of ``STAGES``
+        zip_dump_path (str): Path to the zipped data dump
+        unzip_path (str): Path to unzip the data dump to, is removed first
+        parser_arguments (dict): Further arguments of ``AppleHealthParser``
+
+    Returns:
+        dict: ``wall_seconds`` and ``peak_rss_mib`` of the stage
+    """
+
+    from health_tracking import AppleHealthParser
+
+    shutil.rmtree(unzip_path, ignore_errors=True)
+
+    if stage == "workouts":
+        from health_tracking.workouts import Workouts
+
+        start = time.perf_counter()
+        Workouts(zip_dump_path, unzip_path)
+
+    else:
+        start = time.perf_counter()
+        parser = AppleHealthParser(zip_dump_path, unzip_path, **parser_arguments)
+
+        if stage != "construction":
+            start = time.perf_counter()
+            getattr(parser, stage)()
+
+    return {"wall_seconds": time.perf_counter() - start, "peak_rss_mib": peak_rss_mib()}
+
+
+def main(arguments: list = None) -> pd.DataFrame:
+    parser = argparse.ArgumentParser(description="Benchmark parsing synthetic Apple Health data dumps.")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES, help="numbers of records, e.g., 10000 50000000")
+    parser.add_argument("--stages", nargs="+", default=STAGES, choices=STAGES)
+    parser.add_argument("--directory", default=os.path.join(tempfile.gettempdir(), "health-tracking-benchmark"))
+    parser.add_argument("--output", help="CSV file to write the results to")
+    parser.add_argument("--streaming", action="store_true")
+    parser.add_argument("--compact", action="store_true")
+    parser.add_argument("--n-jobs", type=int, default=1)
+    parser.add_argument("--run", nargs=3, metavar=("STAGE", "ZIP", "UNZIP"), help=argparse.SUPPRESS)
+    arguments = parser.parse_args(arguments)
+
+    parser_arguments = {"streaming": arguments.streaming, "compact": arguments.compact, "n_jobs": arguments.n_jobs}
+
+    # child process of a single measurement
+    if arguments.run is not None:
+        print(json.dumps(run_stage(*arguments.run, parser_arguments)))
+        return None
+
+    os.makedirs(arguments.directory, exist_ok=True)
+    results = []
+
+    for scale in arguments.scales:
+        zip_dump_path = os.path.join(arguments.directory, f"export_{scale}.zip")
+        unzip_path = os.path.join(arguments.directory, f"export_{scale}", constants.EXPORT_DIR_NAME)
+
+        if not os.path.exists(zip_dump_path):
+            generate_export(zip_dump_path, records=scale, workouts=max(10, scale // 1000), routes=0)
+
+        for stage in arguments.stages:
+            command = [sys.executable, os.path.abspath(__file__), "--run", stage, zip_dump_path, unzip_path, "--n-jobs", str(arguments.n_jobs)]
+            command += ["--streaming"] if arguments.streaming else []
+            command += ["--compact"] if arguments.compact else []
+
+            output = subprocess.run(command, check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+            result = {"records": scale, "stage": stage, **json.loads(output.strip().splitlines()[-1])}
+            results.append(result)
+            print(f"{scale:>10} {stage:<28} {result['wall_seconds']:>9.3f} s {result['peak_rss_mib']:>9.1f} MiB", flush=True)
+
+    results = pd.DataFrame(results)
+
+    if arguments.output is not None:
+        results.to_csv(arguments.output, index=False)
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
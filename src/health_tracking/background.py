@@ -0,0 +1,182 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from . import constants
+from .parser import AppleHealthParser
+from .workouts import Workouts
+
+# extraction method of each table that can be prefetched
+EXTRACTORS = {
+    constants.EXPORT_DATE_TAG: "get_export_date",
+    constants.ME_TAG: "extract_me",
+    constants.RECORD_TAG: "extract_records",
+    constants.WORKOUT_TAG: "extract_workouts",
+    constants.CORRELATION_TAG: "extract_correlations",
+    constants.ACTIVITY_SUMMARY_TAG: "extract_activity_summaries",
+    constants.CLINICAL_RECORD_TAG: "extract_clinical_records",
+    constants.RECORD_METADATA_ENTRY_TABLE: "extract_record_metadata_entries",
+    constants.INSTANTANEOUS_BEATS_PER_MINUTE_TABLE: "extract_instantaneous_beats_per_minute",
+    constants.CORRELATION_METADATA_ENTRY_TABLE: "extract_correlation_metadata_entries",
+    constants.CORRELATION_RECORD_TABLE: "extract_correlation_records",
+    constants.WORKOUT_METADATA_ENTRY_TABLE: "extract_workout_metadata_entries",
+    constants.WORKOUT_EVENT_TABLE: "extract_workout_events",
+    constants.WORKOUT_ROUTE_TABLE: "extract_workout_routes"
+}
+
+
+def _chain(future: Future, function: Callable[[Any], Any]) -> Future:
+    """
+    Returns a ``Future`` of ``function`` applied to the result of ``future``, without blocking a thread to wait for it.
+    """
+
+    result = Future()
+
+    def callback(finished: Future) -> None:
+        if not result.set_running_or_notify_cancel():
+            return
+
+        try:
+            result.set_result(function(finished.result()))
+
+        except BaseException as exception:
+            result.set_exception(exception)
+
+    future.add_done_callback(callback)
+
+    return result
+
+
+class BackgroundParser(object):
+    """
+    Sets up an ``AppleHealthParser`` and extracts its tables in a background thread, construction returns immediately.
+    Tables are extracted one after another in ``order``, results are available as ``Future``s or awaitables.
+    If the parser streams, each extraction is a pass over the whole XML, so all tables of ``order`` are extracted in a
+    single pass first and become available together. Extracting a table in the foreground meanwhile waits for the
+    background extraction instead of parsing again.
+
+    Args:
+        zip_dump_path (str, optional): Path to the zipped data dump. Defaults to constants.ZIP_PATH.
+        unzip_path (str, optional): Path to the unzipped data dump. Defaults to constants.UNZIP_PATH.
+        force_unzip (bool, optional): Flag to force unzipping the data again. Can be useful for new data. Defaults to False.
+        order (list, optional): Tables to prefetch, first ones first, see ``EXTRACTORS``. Others are extracted on
+            request. Defaults to constants.PREFETCH_ORDER.
+        executor (ThreadPoolExecutor, optional): Executor to run on, e.g., shared by several data dumps. Tables are
+            extracted in ``order`` only if it has a single worker. Defaults to None, i.e., an own single thread.
+        **parser_arguments: Further arguments of ``AppleHealthParser``, e.g., ``cache_path``
+
+    Raises:
+        ValueError: If ``order`` contains unknown tables
+    """
+
+    def __init__(
+        self,
+        zip_dump_path: str = constants.ZIP_PATH,
+        unzip_path: str = constants.UNZIP_PATH,
+        force_unzip: bool = False,
+        order: list = constants.PREFETCH_ORDER,
+        executor: ThreadPoolExecutor = None,
+        **parser_arguments
+    ) -> None:
+
+        if not set(order) <= set(EXTRACTORS):
+            raise ValueError(f"'order' need to be in: {set(EXTRACTORS)}")
+
+        self._zip_dump_path = zip_dump_path
+        self._unzip_path = unzip_path
+        self._own_executor = executor is None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="health-tracking") if executor is None else executor
+        self._futures = {}
+
+        self._parser = self._executor.submit(AppleHealthParser, zip_dump_path, unzip_path, force_unzip, **parser_arguments)
+        self._prefetch = self._executor.submit(self._prefetch_streaming, set(order))
+
+        for name in order:
+            self.extract_async(name)
+
+    def _prefetch_streaming(self, names: set) -> None:
+        """
+        Extracts the tables ``names`` in a single pass if the parser streams. Otherwise, the tree is parsed once by the
+        first extraction anyway, so the tables are extracted one after another in ``order``.
+        """
+
+        parser = self._parser.result()
+
+        if parser._streaming:
+            parser._load(names)
+
+    def __enter__(self) -> "BackgroundParser":
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.shutdown()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Cancels the pending extractions and stops the own background thread.
+
+        Args:
+            wait (bool, optional): Flag to wait for the running extraction. Defaults to True.
+        """
+
+        for future in [self._prefetch, *self._futures.values()]:
+            future.cancel()
+
+        if self._own_executor:
+            self._executor.shutdown(wait=wait)
+
+    def get_parser(self) -> Future:
+        """
+        Returns the ``Future`` of the set up parser, e.g., to extract tables in the foreground.
+
+        Returns:
+            Future: Resolves to the ``AppleHealthParser``
+        """
+
+        return self._parser
+
+    def extract_async(self, name: str) -> Future:
+        """
+        Returns the ``Future`` of a table. It is queued behind the pending extractions if it was not requested yet.
+
+        Args:
+            name (str): One of ``EXTRACTORS``, e.g., ``constants.WORKOUT_TAG``
+
+        Raises:
+            ValueError: If wrong ``name`` is given
+
+        Returns:
+            Future: Resolves to the return value of the table's ``extract_*`` method, e.g., ``(workouts, workout_types)``
+        """
+
+        if name not in EXTRACTORS:
+            raise ValueError(f"'name' need to be one of: {set(EXTRACTORS)}\n\tGiven: {name}")
+
+        if name not in self._futures:
+            self._futures[name] = self._executor.submit(lambda: getattr(self._parser.result(), EXTRACTORS[name])())
+
+        return self._futures[name]
+
+    async def extract(self, name: str) -> Any:
+        """
+        Awaitable variant of ``extract_async`` for ``asyncio`` applications, e.g., web request handlers.
+
+        Args:
+            name (str): One of ``EXTRACTORS``
+
+        Returns:
+            Any: Return value of the table's ``extract_*`` method
+        """
+
+        return await asyncio.wrap_future(self.extract_async(name))
+
+    def get_workouts_async(self) -> Future:
+        """
+        Returns the ``Future`` of ``workouts.Workouts`` of this data dump. It is built as soon as the ``Workout``
+        table is extracted, other tables may still be loading.
+
+        Returns:
+            Future: Resolves to ``workouts.Workouts``
+        """
+
+        return _chain(self.extract_async(constants.WORKOUT_TAG), lambda _: Workouts(self._zip_dump_path, self._unzip_path))
@@ -0,0 +1,115 @@
+import os
+import shutil
+import hashlib
+
+import pandas as pd
+
+# bytes read from the start and the end of a file to fingerprint it
+FINGERPRINT_BLOCK_SIZE = 1024 * 1024
+
+
+def fingerprint(path: str) -> str:
+    """
+    Computes a fast fingerprint of a (large) file without reading it completely.
+    Hashes the file size together with the first and last ``FINGERPRINT_BLOCK_SIZE`` bytes. For a zipped data dump
+    the end of the file is the central directory, which contains the CRC-32 of every member.
+
+    Args:
+        path (str): Path to the file
+
+    Returns:
+        str: Hex digest identifying the file content
+    """
+
+    size = os.path.getsize(path)
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+
+    with open(path, "rb") as file:
+        digest.update(file.read(FINGERPRINT_BLOCK_SIZE))
+
+        if size > FINGERPRINT_BLOCK_SIZE:
+            file.seek(max(FINGERPRINT_BLOCK_SIZE, size - FINGERPRINT_BLOCK_SIZE))
+            digest.update(file.read())
+
+    return digest.hexdigest()
+
+
+class TableCache(object):
+    """
+    Persists ``DataFrame``s as Parquet files in a directory, one file per table.
+    Needs ``pyarrow`` or ``fastparquet``, install it with ``pip install health-tracking[cache]``.
+
+    Args:
+        directory (str): Directory of the Parquet files. Is created on first write
+    """
+
+    def __init__(self, directory: str) -> None:
+
+        self.directory = directory
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.parquet")
+
+    def __contains__(self, name: str) -> bool:
+        return os.path.exists(self._path(name))
+
+    def load(self, name: str, filters: list = None) -> pd.DataFrame:
+        """
+        Loads the table ``name``.
+
+        Args:
+            name (str): Name of the table
+            filters (list, optional): Row filters as ``(column, operator, value)`` tuples, row groups out of range
+                are skipped without reading them. Defaults to None.
+
+        Raises:
+            KeyError: If the table is not cached
+
+        Returns:
+            pd.DataFrame: Cached table or ``None`` if it was empty
+        """
+
+        if name not in self:
+            raise KeyError(f"Table '{name}' is not cached in: {self.directory}")
+
+        # empty tables have no columns to filter on, reading no columns only touches the metadata
+        if filters is not None and len(pd.read_parquet(self._path(name), columns=[])) == 0:
+            return None
+
+        result = pd.read_parquet(self._path(name), filters=filters)
+
+        return None if result.empty else result
+
+    def save(self, name: str, data_frame: pd.DataFrame) -> None:
+        """
+        Saves the table ``name``, empty tables are stored as well.
+
+        Args:
+            name (str): Name of the table
+            data_frame (pd.DataFrame): Table to store or ``None`` if empty
+        """
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        if data_frame is None:
+            data_frame = pd.DataFrame()
+
+        # dictionaries without any value are untyped and would be read as plain strings, e.g., ``categoryValue`` of
+        # ``Record``s of quantity types only
+        for column, dtype in data_frame.dtypes.items():
+            if isinstance(dtype, pd.CategoricalDtype) and len(dtype.categories) == 0:
+                data_frame = data_frame.copy(deep=False)
+                data_frame[column] = data_frame[column].cat.set_categories(pd.Index([], dtype="string"))
+
+        # write to a temporary file first to never leave half written tables behind
+        temporary_path = f"{self._path(name)}.tmp"
+        data_frame.to_parquet(temporary_path)
+        os.replace(temporary_path, self._path(name))
+
+    def clear(self) -> None:
+        """
+        Removes all cached tables.
+        """
+
+        if os.path.exists(self.directory):
+            shutil.rmtree(self.directory)
@@ -0,0 +1,154 @@
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO
+
+from . import constants
+from .compact import concat_tables
+from .index import INDEX_BLOCK_SIZE, RangeReader
+from .streaming import collect_tables, iter_elements
+
+# start of a top-level element, Apple indents them by one space
+TOP_LEVEL_START_REGEX = re.compile(rb"\n <\w")
+
+
+def _find_next_element(source: IO[bytes], offset: int, end: int) -> int:
+    """
+    Returns the offset of the first top-level element starting at or after ``offset`` and before ``end``.
+    """
+
+    position = offset
+
+    while position < end:
+        source.seek(max(0, position - 1))  # "\n" may be the byte before ``position``
+        block = source.read(min(INDEX_BLOCK_SIZE, end - position + 1))
+        match = TOP_LEVEL_START_REGEX.search(block)
+
+        if match is not None:
+            return min(end, max(0, position - 1) + match.start() + 2)
+
+        # keep the last bytes, the pattern may cross the block border
+        position += max(1, len(block) - 3)
+
+    return end
+
+
+def find_chunk_boundaries(source: IO[bytes], n_chunks: int) -> list:
+    """
+    Splits the top-level elements of ``export.xml`` into ``n_chunks`` byte ranges of similar size.
+    Each range starts at a top-level element, so it can be parsed on its own with a ``RangeReader``.
+
+    Args:
+        source (IO[bytes]): Seekable binary file object of the XML document
+        n_chunks (int): Number of ranges to create at most
+
+    Raises:
+        ValueError: If the root element is not found
+
+    Returns:
+        list: ``(start, end)`` byte offsets in document order, empty if no top-level element is indented as Apple does
+    """
+
+    size = source.seek(0, 2)
+
+    # the root start tag marks the end of the header incl. the DTD
+    source.seek(0)
+    header = source.read(min(size, INDEX_BLOCK_SIZE))
+    root_start = header.find(f"<{constants.HEALTH_DATA_TAG}".encode())
+
+    source.seek(max(0, size - INDEX_BLOCK_SIZE))
+    footer = source.read()
+    root_end = footer.rfind(f"</{constants.HEALTH_DATA_TAG}>".encode())
+
+    if root_start == -1 or root_end == -1:
+        raise ValueError(f"No '{constants.HEALTH_DATA_TAG}' element found")
+
+    first = _find_next_element(source, root_start, size)
+    last = max(0, size - INDEX_BLOCK_SIZE) + root_end
+
+    if first >= last:
+        return []
+
+    boundaries = [first]
+
+    for chunk in range(1, n_chunks):
+        boundary = _find_next_element(source, first + chunk * (last - first) // n_chunks, last)
+
+        if boundaries[-1] < boundary < last:
+            boundaries.append(boundary)
+
+    boundaries.append(last)
+
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def parse_chunk(xml_path: str, start: int, end: int, element_types: set, compact: bool = False, child_tables: set = None) -> dict:
+    """
+    Collects the raw tables of the top-level elements within one byte range. Is executed by the worker processes.
+
+    Args:
+        xml_path (str): Path to ``export.xml``
+        start (int): Offset of the first top-level element of the chunk
+        end (int): Offset after the last top-level element of the chunk
+        element_types (set): Tags of the tables to build
+        compact (bool, optional): Flag to collect into ``CompactTable``s. Defaults to False.
+        child_tables (set, optional): Nested tables to build, see ``collect_tables``. Defaults to None.
+
+    Returns:
+        dict: maps each of ``element_types`` and ``child_tables`` to its ``DataFrame`` of raw attributes
+    """
+
+    with open(xml_path, "rb") as source:
+        elements = iter_elements(RangeReader(source, [(start, end)]), element_types)
+        return collect_tables(elements, element_types, compact, child_tables=child_tables)
+
+
+def parse_parallel(xml_path: str, element_types: set, n_jobs: int, compact: bool = False, child_tables: set = None) -> dict:
+    """
+    Parses ``export.xml`` in ``n_jobs`` chunks with a process pool and concatenates the per-chunk tables in order.
+    The result equals ``collect_tables`` over the whole document.
+
+    Args:
+        xml_path (str): Path to ``export.xml``
+        element_types (set): Tags of the tables to build
+        n_jobs (int): Number of worker processes and chunks
+        compact (bool, optional): Flag to collect into ``CompactTable``s. Defaults to False.
+        child_tables (set, optional): Nested tables to build, see ``collect_tables``. Defaults to None.
+
+    Returns:
+        dict: maps each of ``element_types`` and ``child_tables`` to its ``DataFrame`` of raw attributes or ``None``
+            if the document can not be split, see ``find_chunk_boundaries``
+    """
+
+    with open(xml_path, "rb") as source:
+        ranges = find_chunk_boundaries(source, n_jobs)
+
+    if not ranges:
+        return None
+
+    element_types = set(element_types)
+    child_tables = set(child_tables or [])
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        chunk_tables = list(executor.map(
+            parse_chunk,
+            *zip(*[(xml_path, start, end, element_types, compact, child_tables) for start, end in ranges])
+        ))
+
+    # parent ids of nested tables are positions within their chunk
+    for name in child_tables:
+        parent = constants.CHILD_TABLES[name][0]
+        offset = 0
+
+        for tables in chunk_tables:
+            if not tables[name].empty:
+                tables[name][constants.PARENT_ID_COLUMN] += offset
+
+            offset += len(tables[parent])
+
+    result = {}
+
+    for name in element_types | child_tables:
+        parts = [tables[name] for tables in chunk_tables if not tables[name].empty]
+        result[name] = concat_tables(parts) if parts else chunk_tables[0][name]
+
+    return result
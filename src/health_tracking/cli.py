@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Command-line interface, installed as ``health-tracking``. Converts data dumps to Parquet tables:
+
+    health-tracking convert exports/ --output tables/ --jobs 4
+
+Each ``export.zip`` is written to its own directory below ``--output``, named like the archive without suffix.
+The XML is streamed, so each worker only holds the tables of its data dump, not their ``ElementTree``.
+"""
+
+import os
+import sys
+import time
+import argparse
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from . import constants
+
+ZIP_SUFFIX = ".zip"
+
+# libraries ``pandas`` writes Parquet files with, see the ``cache`` extra
+PARQUET_ENGINES = ["pyarrow", "fastparquet"]
+
+# tables that can be written, see ``background.EXTRACTORS``
+TABLES = sorted(constants.ELEMENT_TAGS | set(constants.CHILD_TABLES))
+
+
+def find_exports(paths: list) -> list:
+    """
+    Collects the zipped data dumps of ``paths``, directories are searched recursively for ``*.zip`` files.
+
+    Args:
+        paths (list): Zipped data dumps or directories containing them
+
+    Raises:
+        ValueError: If a path does not exist
+
+    Returns:
+        list: Paths of the zipped data dumps, sorted per directory
+    """
+
+    exports = []
+
+    for path in paths:
+        if os.path.isdir(path):
+            exports += sorted(
+                os.path.join(directory, file_name)
+                for directory, _, file_names in os.walk(path)
+                for file_name in file_names if file_name.lower().endswith(ZIP_SUFFIX)
+            )
+
+        elif os.path.isfile(path):
+            exports.append(path)
+
+        else:
+            raise ValueError(f"'paths' need to be existing files or directories\n\tGiven: {path}")
+
+    return exports
+
+
+def check_parquet_engine() -> None:
+    """
+    Checks that one of ``PARQUET_ENGINES`` is installed, without importing it.
+
+    Raises:
+        ImportError: If none is installed
+    """
+
+    if not any(importlib.util.find_spec(engine) is not None for engine in PARQUET_ENGINES):
+        raise ImportError(f"Writing Parquet tables needs one of {PARQUET_ENGINES}, install it with: pip install health-tracking[cache]")
+
+
+def _convert_export(zip_dump_path: str, output_path: str, tables: list, parser_arguments: dict) -> dict:
+    """
+    Extracts ``tables`` of a data dump and writes each as Parquet file to ``output_path``.
+    Is executed by the worker processes.
+
+    Returns:
+        dict: ``rows`` written and ``seconds`` taken
+    """
+
+    # loads pandas, workers only
+    import pandas as pd
+
+    from .background import EXTRACTORS
+    from .cache import TableCache
+    from .parser import AppleHealthParser, InstanceRegistry
+
+    start = time.perf_counter()
+    store = TableCache(output_path)
+    rows = 0
+
+    parser = AppleHealthParser(zip_dump_path, os.path.join(output_path, constants.EXPORT_DIR_NAME), read_from_zip=True, **parser_arguments)
+
+    # a single pass over the XML for all requested tables
+    parser.extract_all(tables)
+
+    for name in tables:
+        table = getattr(parser, EXTRACTORS[name])()
+
+        if name == constants.WORKOUT_TAG:
+            table = table[0]
+
+        elif name == constants.EXPORT_DATE_TAG:
+            table = None if table is None else pd.DataFrame({"value": [table]})
+
+        store.save(name, table)
+        rows += 0 if table is None else len(table)
+
+    # the worker converts further data dumps, do not keep the tables of this one alive
+    InstanceRegistry.clear()
+
+    return {"rows": rows, "seconds": time.perf_counter() - start}
+
+
+def convert(exports: list, output_path: str, tables: list = None, n_jobs: int = 1, **parser_arguments) -> int:
+    """
+    Converts zipped data dumps to Parquet tables, ``n_jobs`` of them in parallel. Nothing is unzipped, the XML is
+    read directly out of the archives. Reports the throughput of each data dump on ``stdout`` as soon as it is done.
+
+    Args:
+        exports (list): Paths of the zipped data dumps, their names without suffix need to be unique
+        output_path (str): Directory to write the tables of each data dump to, e.g., ``output_path/export/Record.parquet``
+        tables (list, optional): Tables to write, see ``TABLES``. Defaults to None, i.e., all.
+        n_jobs (int, optional): Number of data dumps converted in parallel, each in an own process. Defaults to 1.
+        **parser_arguments: Further arguments of ``AppleHealthParser``, e.g., ``compact``. ``streaming`` defaults to
+            True, the requested tables are extracted in a single pass anyway.
+
+    Raises:
+        ValueError: If names of ``exports`` are not unique or ``n_jobs`` is not positive
+        ImportError: If no Parquet engine is installed, see ``check_parquet_engine``
+
+    Returns:
+        int: Number of data dumps that failed
+    """
+
+    tables = TABLES if tables is None else list(tables)
+    names = [os.path.splitext(os.path.basename(zip_dump_path))[0] for zip_dump_path in exports]
+
+    if len(set(names)) != len(names):
+        raise ValueError(f"'exports' need to have unique file names\n\tGiven: {exports}")
+
+    if n_jobs < 1:
+        raise ValueError(f"'n_jobs' need to be positive\n\tGiven: {n_jobs}")
+
+    # fail before any data dump is parsed
+    check_parquet_engine()
+
+    parser_arguments.setdefault("streaming", True)
+    failed = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = {
+            executor.submit(_convert_export, zip_dump_path, os.path.join(output_path, name), tables, parser_arguments): zip_dump_path
+            for zip_dump_path, name in zip(exports, names)
+        }
+
+        for future in as_completed(futures):
+            zip_dump_path = futures[future]
+
+            try:
+                result = future.result()
+
+            except Exception as exception:
+                failed += 1
+                print(f"{zip_dump_path}: failed: {exception!r}", file=sys.stderr, flush=True)
+                continue
+
+            mebibytes = os.path.getsize(zip_dump_path) / 1024 ** 2
+            seconds = max(result["seconds"], 1e-9)
+            print(
+                f"{zip_dump_path}: {result['rows']} rows in {result['seconds']:.2f} s "
+                f"({result['rows'] / seconds:,.0f} rows/s, {mebibytes / seconds:.1f} MiB/s zipped)",
+                flush=True
+            )
+
+    print(f"Converted {len(exports) - failed} of {len(exports)} data dumps in {time.perf_counter() - start:.2f} s", flush=True)
+
+    return failed
+
+
+def main(arguments: list = None) -> int:
+    """
+    Entry point of ``health-tracking``.
+
+    Args:
+        arguments (list, optional): Command-line arguments. Defaults to None, i.e., ``sys.argv[1:]``.
+
+    Returns:
+        int: Exit status, ``1`` if any data dump failed
+    """
+
+    parser = argparse.ArgumentParser(prog="health-tracking", description="Parse Apple Health App data dumps.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert_parser = commands.add_parser("convert", help="convert data dumps to Parquet tables")
+    convert_parser.add_argument("paths", nargs="+", help="zipped data dumps or directories containing them")
+    convert_parser.add_argument("-o", "--output", required=True, help="directory to write the tables to")
+    convert_parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="data dumps converted in parallel")
+    convert_parser.add_argument("--tables", nargs="+", choices=TABLES, help="tables to write, defaults to all")
+    convert_parser.add_argument(
+        "--no-streaming",
+        dest="streaming",
+        action="store_false",
+        help="build the whole tree of each data dump instead of streaming the XML, needs a multiple of its size in memory"
+    )
+    convert_parser.add_argument("--compact", action="store_true", help="collect dictionary-encoded columns")
+    arguments = parser.parse_args(arguments)
+
+    try:
+        exports = find_exports(arguments.paths)
+
+        if not exports:
+            parser.error(f"no '*{ZIP_SUFFIX}' files found in: {arguments.paths}")
+
+        failed = convert(
+            exports,
+            arguments.output,
+            arguments.tables,
+            min(arguments.jobs, len(exports)),
+            streaming=arguments.streaming,
+            compact=arguments.compact
+        )
+
+    except (ValueError, ImportError) as exception:
+        parser.error(str(exception))
+
+    return int(failed > 0)
+
+
+def run() -> None:
+    sys.exit(main())
+
+
+if __name__ == "__main__":
+    run()
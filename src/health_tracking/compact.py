@@ -0,0 +1,147 @@
+from array import array
+
+import numpy as np
+import pandas as pd
+
+
+class CompactTable(object):
+    """
+    Collects element attributes column-wise instead of as list of ``dict``s.
+    Values of ``dictionary_columns`` are dictionary-encoded while collecting, i.e., each row only costs a 32 bit code
+    and every distinct string is kept once. They end up as ``pd.Categorical`` columns.
+
+    Args:
+        dictionary_columns (set): Names of the low-cardinality columns to encode
+    """
+
+    def __init__(self, dictionary_columns: set) -> None:
+
+        self._dictionary_columns = set(dictionary_columns)
+        self._columns = {}
+        self._dictionaries = {}
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _missing(self, name: str) -> list:
+        return array("i", [-1]) if name in self._dictionaries else [None]
+
+    def append(self, attributes: dict) -> None:
+        """
+        Appends a row, missing attributes are filled lazily.
+
+        Args:
+            attributes (dict): Attributes of one element
+        """
+
+        row = self._length
+
+        for name, value in attributes.items():
+            column = self._columns.get(name)
+
+            if column is None:
+                if name in self._dictionary_columns:
+                    self._dictionaries[name] = {}
+                    column = self._columns[name] = array("i")
+
+                else:
+                    column = self._columns[name] = []
+
+            dictionary = self._dictionaries.get(name)
+
+            if dictionary is not None:
+                code = dictionary.get(value)
+
+                if code is None:
+                    code = dictionary[value] = len(dictionary)
+
+                value = code
+
+            # rows before did not have this attribute
+            if len(column) < row:
+                column.extend(self._missing(name) * (row - len(column)))
+
+            column.append(value)
+
+        self._length += 1
+
+    def to_data_frame(self) -> pd.DataFrame:
+        """
+        Builds the ``DataFrame`` of all collected rows, columns are ordered by their first appearance.
+
+        Returns:
+            pd.DataFrame: Collected rows
+        """
+
+        data = {}
+
+        for name, column in self._columns.items():
+            column.extend(self._missing(name) * (self._length - len(column)))
+
+            if name in self._dictionaries:
+                categories = list(self._dictionaries[name])
+                codes = np.frombuffer(column, dtype=np.int32) if len(column) > 0 else np.array([], dtype=np.int32)
+                data[name] = pd.Categorical.from_codes(codes, categories).reorder_categories(sorted(categories))
+
+            else:
+                data[name] = column
+
+        return pd.DataFrame(data)
+
+
+def numeric_from_categorical(values: pd.Series, dtype: np.dtype = np.float64) -> pd.Series:
+    """
+    Converts a categorical column of number strings to numbers by only parsing its distinct values.
+
+    Args:
+        values (pd.Series): Categorical column
+        dtype (np.dtype, optional): Floating point type of the result. Defaults to np.float64.
+
+    Returns:
+        pd.Series: Numeric column of ``dtype``, missing values and categories that are no numbers are ``NaN``
+    """
+
+    numbers = pd.to_numeric(pd.Series(values.cat.categories, dtype=object), errors="coerce").to_numpy(dtype=dtype)
+
+    # code -1 of missing values picks the appended NaN
+    numbers = np.append(numbers, np.array(np.nan, dtype=dtype))
+
+    return pd.Series(numbers[values.cat.codes.to_numpy()], index=values.index, name=values.name)
+
+
+def concat_tables(data_frames: list) -> pd.DataFrame:
+    """
+    Concatenates tables like ``pd.concat`` but keeps categorical columns categorical, even if their categories differ.
+    Categories of columns that are categorical in all tables are unified first, so no strings are materialized.
+
+    Args:
+        data_frames (list): ``DataFrame``s to concatenate
+
+    Returns:
+        pd.DataFrame: Concatenated table with a new ``RangeIndex``
+    """
+
+    data_frames = [data_frame.copy(deep=False) for data_frame in data_frames]
+    categorical_columns = {
+        column
+        for data_frame in data_frames
+        for column, dtype in data_frame.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)
+    }
+
+    for column in categorical_columns:
+        parts = [data_frame[column] for data_frame in data_frames if column in data_frame]
+
+        if len(parts) == len(data_frames) and all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            categories = sorted(set().union(*[part.cat.categories for part in parts]))
+
+            for data_frame in data_frames:
+                data_frame[column] = data_frame[column].cat.set_categories(categories)
+
+    result = pd.concat(data_frames, ignore_index=True)
+
+    for column in categorical_columns:
+        if not isinstance(result[column].dtype, pd.CategoricalDtype):
+            result[column] = result[column].astype("category")
+
+    return result
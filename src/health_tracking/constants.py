@@ -10,9 +10,40 @@ ZIP_PATH = os.path.join("../data/raw", EXPORT_NAME)
 UNZIP_PATH = os.path.join("../data/interim", EXPORT_DIR_NAME)
 XML_PATH = os.path.join(UNZIP_PATH, XML_NAME)
 
+CACHE_PATH = "../data/preprocessed"
+
+# parsers of different data dumps kept alive at once, idle ones are evicted least recently used first
+MAX_PARSER_INSTANCES = 8
+INCREMENTAL_DIR_NAME = "incremental"
+RECORD_INDEX_TABLE = "RecordIndex"
+
+# members of the zipped data dump always use "/" as separator
+ZIP_XML_MEMBER = f"{EXPORT_DIR_NAME}/{XML_NAME}"
+
+ECG_DIR_NAME = "electrocardiograms"
+
+# fingerprint of the zipped data dump an unzipped one was extracted from, stored next to ``export.xml``
+ZIP_FINGERPRINT_NAME = ".zip_fingerprint"
+
+
+# Stages of the parsing pipeline measured by ``stats.ParseStats``
+
+STAGE_UNZIP = "unzip"
+STAGE_PARSE = "parse"
+STAGE_PARALLEL_PARSE = "parallel_parse"
+STAGE_COLLECT = "collect"
+STAGE_BUILD = "build"
+STAGE_FIX_DATA_TYPES = "fix_data_types"
+STAGE_RECORD_INDEX = "record_index"
+STAGE_CACHE_LOAD = "cache_load"
+STAGE_CACHE_SAVE = "cache_save"
+
+STATS_COLUMNS = ["stage", "table", "wall_seconds", "rows", "peak_rss_mib", "peak_rss_increase_mib"]
+
 
 # XML structure
 
+HEALTH_DATA_TAG = "HealthData"
 EXPORT_DATE_TAG = "ExportDate"
 ME_TAG = "Me"
 RECORD_TAG = "Record"
@@ -32,6 +63,134 @@ ELEMENT_TAGS = {
     CLINICAL_RECORD_TAG
 }
 
+# Nested elements, extracted into tables with a foreign key to the row of their parent element
+
+RECORD_METADATA_ENTRY_TABLE = "RecordMetadataEntry"
+INSTANTANEOUS_BEATS_PER_MINUTE_TABLE = "InstantaneousBeatsPerMinute"
+CORRELATION_METADATA_ENTRY_TABLE = "CorrelationMetadataEntry"
+CORRELATION_RECORD_TABLE = "CorrelationRecord"
+WORKOUT_METADATA_ENTRY_TABLE = "WorkoutMetadataEntry"
+WORKOUT_EVENT_TABLE = "WorkoutEvent"
+WORKOUT_ROUTE_TABLE = "WorkoutRoute"
+
+# position of the parent element's row in its table
+PARENT_ID_COLUMN = "parentId"
+
+# table name -> (tag of the parent element, path of the nested elements below it)
+CHILD_TABLES = {
+    RECORD_METADATA_ENTRY_TABLE: (RECORD_TAG, "MetadataEntry"),
+    INSTANTANEOUS_BEATS_PER_MINUTE_TABLE: (RECORD_TAG, "HeartRateVariabilityMetadataList/InstantaneousBeatsPerMinute"),
+    CORRELATION_METADATA_ENTRY_TABLE: (CORRELATION_TAG, "MetadataEntry"),
+    CORRELATION_RECORD_TABLE: (CORRELATION_TAG, RECORD_TAG),
+    WORKOUT_METADATA_ENTRY_TABLE: (WORKOUT_TAG, "MetadataEntry"),
+    WORKOUT_EVENT_TABLE: (WORKOUT_TAG, "WorkoutEvent"),
+    WORKOUT_ROUTE_TABLE: (WORKOUT_TAG, "WorkoutRoute")
+}
+
+# attributes of these nested elements are merged into the rows of the table, e.g., the path of a route's GPX file
+FLATTENED_CHILDREN = {
+    WORKOUT_ROUTE_TABLE: "FileReference"
+}
+
+WORKOUT_ROUTE_PATH = "path"
+
+# columns added by ``routes.WorkoutRoutes``
+ROUTE_COLUMN_ID = "routeId"
+ROUTE_COLUMN_POINTS = "pointCount"
+
+# rows per ``DataFrame`` of the ``iter_*`` methods
+CHUNK_SIZE = 100000
+
+# order in which ``background.BackgroundParser`` extracts tables by default, small and often used ones first
+PREFETCH_ORDER = [
+    EXPORT_DATE_TAG,
+    ME_TAG,
+    WORKOUT_TAG,
+    ACTIVITY_SUMMARY_TAG,
+    CORRELATION_TAG,
+    CLINICAL_RECORD_TAG,
+    RECORD_TAG
+]
+
+# Column schemas of the element types and nested tables, columns not listed stay strings
+
+# HealthKit format of days, e.g., "2019-06-01", timestamps are parsed by ``timestamps.parse_healthkit_timestamps``
+DAY_FORMAT = "%Y-%m-%d"
+
+# suffix of the columns holding the UTC offsets in minutes of ``DATETIME_COLUMNS``, e.g., "startDateOffsetMinutes"
+OFFSET_COLUMN_SUFFIX = "OffsetMinutes"
+
+NUMERIC_COLUMNS = {
+    RECORD_TAG: {"value"},
+    CORRELATION_RECORD_TABLE: {"value"},
+    INSTANTANEOUS_BEATS_PER_MINUTE_TABLE: {"bpm"},
+    WORKOUT_EVENT_TABLE: {"duration"},
+    WORKOUT_TAG: {"duration", "totalDistance", "totalEnergyBurned", "totalFlightsClimbed", "totalSwimmingStrokeCount"},
+    ACTIVITY_SUMMARY_TAG: {
+        "activeEnergyBurned",
+        "activeEnergyBurnedGoal",
+        "appleMoveTime",
+        "appleMoveTimeGoal",
+        "appleExerciseTime",
+        "appleExerciseTimeGoal",
+        "appleStandHours",
+        "appleStandHoursGoal"
+    }
+}
+
+# numeric columns that hold strings for some types, e.g., "HKCategoryValueSleepAnalysisAsleep" as ``value`` of sleep
+# ``Record``s. Their strings are moved to the categorical column named here, so the data types do not depend on the rows
+CATEGORY_VALUE_COLUMNS = {
+    RECORD_TAG: {"value": "categoryValue"},
+    CORRELATION_RECORD_TABLE: {"value": "categoryValue"}
+}
+
+CATEGORICAL_COLUMNS = {
+    RECORD_TAG: {"type", "unit", "sourceName", "sourceVersion", "device"},
+    WORKOUT_TAG: {"durationUnit", "totalDistanceUnit", "totalEnergyBurnedUnit", "sourceName", "sourceVersion", "device"},
+    CORRELATION_TAG: {"type", "sourceName", "sourceVersion", "device"},
+    ACTIVITY_SUMMARY_TAG: {"activeEnergyBurnedUnit"},
+    CLINICAL_RECORD_TAG: {"type", "sourceName", "fhirVersion"},
+    RECORD_METADATA_ENTRY_TABLE: {"key"},
+    CORRELATION_METADATA_ENTRY_TABLE: {"key"},
+    CORRELATION_RECORD_TABLE: {"type", "unit", "sourceName", "sourceVersion", "device"},
+    WORKOUT_METADATA_ENTRY_TABLE: {"key"},
+    WORKOUT_EVENT_TABLE: {"type", "durationUnit"},
+    WORKOUT_ROUTE_TABLE: {"sourceName", "sourceVersion", "device"}
+}
+
+DATETIME_COLUMNS = {
+    EXPORT_DATE_TAG: {"value"},
+    RECORD_TAG: {"creationDate", "startDate", "endDate"},
+    WORKOUT_TAG: {"creationDate", "startDate", "endDate"},
+    CORRELATION_TAG: {"creationDate", "startDate", "endDate"},
+    CLINICAL_RECORD_TAG: {"receivedDate"},
+    CORRELATION_RECORD_TABLE: {"creationDate", "startDate", "endDate"},
+    WORKOUT_EVENT_TABLE: {"date"},
+    WORKOUT_ROUTE_TABLE: {"creationDate", "startDate", "endDate"}
+}
+
+DAY_COLUMNS = {
+    ME_TAG: {"HKCharacteristicTypeIdentifierDateOfBirth"},
+    ACTIVITY_SUMMARY_TAG: {"dateComponents"}
+}
+
+# columns used by the ``start`` and ``end`` filters of extractions, per element type
+TIME_RANGE_COLUMNS = {
+    RECORD_TAG: "startDate",
+    WORKOUT_TAG: "startDate",
+    ACTIVITY_SUMMARY_TAG: "dateComponents"
+}
+
+# columns holding the high-water mark of an incremental import, per element type
+INCREMENTAL_COLUMNS = {
+    RECORD_TAG: "creationDate",
+    WORKOUT_TAG: "creationDate",
+    CORRELATION_TAG: "creationDate",
+    ACTIVITY_SUMMARY_TAG: "dateComponents",
+    CLINICAL_RECORD_TAG: "receivedDate"
+}
+
 # Workout Element
 
 WORKOUT_TYPE = "workoutActivityType"
@@ -54,3 +213,62 @@ WORKOUT_PLOTTING_CLOUMN = {
 # RegEx strings
 
 WORKOUT_REGEX = r"^HKWorkoutActivityType(.+)$"
+
+
+# Electrocardiograms
+
+ECG_TABLE = "Electrocardiogram"
+ECG_SAMPLES_NAME = "electrocardiogram_samples.f4"
+ECG_COLUMN_FILE = "file"
+ECG_COLUMN_SAMPLE_START = "sampleStart"
+ECG_COLUMN_SAMPLE_COUNT = "sampleCount"
+ECG_COLUMN_RECORDED_DATE = "Recorded Date"
+ECG_COLUMN_SAMPLE_RATE = "Sample Rate"
+
+
+# Deduplication
+
+# cumulative quantity types that several sources record for the same time, e.g., iPhone and Apple Watch
+DEDUPLICATION_TYPES = {
+    "HKQuantityTypeIdentifierStepCount",
+    "HKQuantityTypeIdentifierDistanceWalkingRunning",
+    "HKQuantityTypeIdentifierDistanceCycling",
+    "HKQuantityTypeIdentifierActiveEnergyBurned",
+    "HKQuantityTypeIdentifierBasalEnergyBurned",
+    "HKQuantityTypeIdentifierFlightsClimbed",
+    "HKQuantityTypeIdentifierAppleExerciseTime"
+}
+
+
+# Rollups
+
+ROLLUP_DIR_NAME = "rollups"
+QUANTITY_TYPE_PREFIX = "HKQuantityTypeIdentifier"
+
+ROLLUP_HOURLY = "hourly"
+ROLLUP_DAILY = "daily"
+ROLLUP_WEEKLY = "weekly"
+ROLLUP_FREQUENCIES = [ROLLUP_HOURLY, ROLLUP_DAILY, ROLLUP_WEEKLY]
+
+# local start of the aggregated hour, day or week (starting on Monday)
+ROLLUP_COLUMN_PERIOD = "period"
+ROLLUP_KEY_COLUMNS = ["type", "unit", ROLLUP_COLUMN_PERIOD]
+ROLLUP_AGGREGATIONS = ["sum", "mean", "min", "max", "count"]
+
+
+# SQLite store
+
+SQLITE_NAME = "health.sqlite"
+
+# rows per ``executemany`` while bulk loading
+SQLITE_BATCH_SIZE = 50000
+
+# each of these columns gets an index in every table that has it
+SQLITE_INDEX_COLUMNS = ["type", "sourceName", "startDate", PARENT_ID_COLUMN]
+
+# timestamps are stored as UTC text, which sorts chronologically and is understood by SQLite's date functions
+SQLITE_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+ROLLUP_MONTHLY = "monthly"
+ROLLUP_YEARLY = "yearly"
+SQLITE_FREQUENCIES = [ROLLUP_HOURLY, ROLLUP_DAILY, ROLLUP_WEEKLY, ROLLUP_MONTHLY, ROLLUP_YEARLY]
@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+
+from . import constants
+
+
+def _union(starts: np.ndarray, ends: np.ndarray) -> (np.ndarray, np.ndarray):
+    """
+    Merges intervals ``[start, end)`` into sorted, disjoint intervals with one sweep over their sorted starts.
+    """
+
+    order = np.argsort(starts, kind="stable")
+    starts, ends = starts[order], ends[order]
+
+    # furthest end seen so far, a start beyond it opens a new merged interval
+    reach = np.maximum.accumulate(ends)
+    opens = np.ones(len(starts), dtype=bool)
+    opens[1:] = starts[1:] > reach[:-1]
+    closes = np.append(opens[1:], True)
+
+    return starts[opens], reach[closes]
+
+
+def _covered_lengths(starts: np.ndarray, ends: np.ndarray, union_starts: np.ndarray, union_ends: np.ndarray) -> np.ndarray:
+    """
+    Returns the lengths of intervals ``[start, end)`` covered by the disjoint, sorted intervals of ``_union``.
+    """
+
+    if len(union_starts) == 0:
+        return np.zeros(len(starts), dtype=np.int64)
+
+    lengths = union_ends - union_starts
+    cumulative_lengths = np.concatenate([[0], np.cumsum(lengths)])
+
+    def covered_before(times: np.ndarray) -> np.ndarray:
+        position = np.searchsorted(union_starts, times, side="right") - 1
+        valid = position >= 0
+        position = np.maximum(position, 0)
+        inside = np.clip(times - union_starts[position], 0, lengths[position])
+
+        return np.where(valid, cumulative_lengths[position] + inside, 0)
+
+    return covered_before(ends) - covered_before(starts)
+
+
+def _is_covered(times: np.ndarray, union_starts: np.ndarray, union_ends: np.ndarray) -> np.ndarray:
+    """
+    Returns whether points in time lie within the disjoint, sorted intervals of ``_union``.
+    """
+
+    if len(union_starts) == 0:
+        return np.zeros(len(times), dtype=bool)
+
+    position = np.searchsorted(union_starts, times, side="right") - 1
+
+    return (position >= 0) & (times < union_ends[np.maximum(position, 0)])
+
+
+def _source_ranks(sources: pd.Series, source_priority: list) -> np.ndarray:
+    """
+    Ranks the sources, the first of ``source_priority`` is 0. Unlisted sources follow in alphabetical order.
+    """
+
+    sources = sources.astype("category")
+    categories = list(sources.cat.categories)
+    priority = {source: rank for rank, source in enumerate(source_priority)}
+    unlisted = sorted(source for source in categories if source not in priority)
+    priority.update({source: len(source_priority) + rank for rank, source in enumerate(unlisted)})
+
+    ranks = np.array([priority[source] for source in categories] + [len(priority)], dtype=np.int64)
+
+    return ranks[sources.cat.codes.to_numpy()]  # missing sources have code -1, i.e., the lowest rank
+
+
+def deduplicate_records(records: pd.DataFrame, source_priority: list = None, types: set = None) -> pd.DataFrame:
+    """
+    Resolves overlapping ``Record``s of different sources like the Health app, e.g., steps counted by the iPhone and
+    the Apple Watch at the same time. Per type, time covered by a source is taken from it and not from any source of
+    lower priority. Records that are partly covered keep the share of their ``value`` that is proportional to their
+    uncovered time, so summing the result does not double-count.
+
+    Each priority level is resolved with a sweep over the sorted intervals of the sources above it, all vectorized.
+    Therefore, it scales with ``O(n log n)`` per level instead of comparing all pairs of records. Overlapping records
+    of the same source are kept as they are.
+
+    Args:
+        records (pd.DataFrame): ``Record``s as extracted by ``AppleHealthParser.extract_records``
+        source_priority (list, optional): ``sourceName``s from highest to lowest priority. Unlisted sources follow in
+            alphabetical order. Defaults to None, i.e., alphabetical order.
+        types (set, optional): Cumulative types to deduplicate. Defaults to None, i.e., ``constants.DEDUPLICATION_TYPES``.
+
+    Returns:
+        pd.DataFrame: ``Record``s of ``types`` that are not covered completely, grouped by type and sorted by
+            ``startDate``. ``value`` holds the uncovered share as ``float64``. ``None`` if empty
+    """
+
+    types = constants.DEDUPLICATION_TYPES if types is None else set(types)
+
+    if records is None:
+        return None
+
+    records = records[records["type"].isin(types)]
+
+    if records.empty:
+        return None
+
+    ranks = _source_ranks(records["sourceName"], source_priority or [])
+    starts = records["startDate"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    ends = np.maximum(records["endDate"].to_numpy(dtype="datetime64[ns]").view(np.int64), starts)
+    fractions = np.ones(len(records), dtype=np.float64)
+
+    for positions in records.groupby("type", observed=True, sort=True).indices.values():
+        type_ranks = ranks[positions]
+        union_starts = union_ends = np.empty(0, dtype=np.int64)
+
+        for rank in np.unique(type_ranks):
+            level = positions[type_ranks == rank]
+            level_starts, level_ends = starts[level], ends[level]
+            lengths = level_ends - level_starts
+
+            covered = _covered_lengths(level_starts, level_ends, union_starts, union_ends)
+            uncovered = 1 - covered / np.where(lengths > 0, lengths, 1)
+
+            # records without duration are dropped if they lie in covered time
+            fractions[level] = np.where(lengths > 0, uncovered, ~_is_covered(level_starts, union_starts, union_ends))
+
+            union_starts, union_ends = _union(np.concatenate([union_starts, level_starts]), np.concatenate([union_ends, level_ends]))
+
+    result = records.copy()
+    result["value"] = pd.to_numeric(result["value"], errors="coerce").astype(np.float64) * fractions
+    result = result[fractions > 0]
+
+    if result.empty:
+        return None
+
+    return result.sort_values(["type", "startDate"], kind="stable", ignore_index=True)
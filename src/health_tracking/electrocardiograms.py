@@ -0,0 +1,235 @@
+import os
+import csv
+import glob
+import zipfile
+from typing import Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import constants
+from .cache import TableCache
+from .parser import AppleHealthParser
+from .timestamps import parse_healthkit_timestamps
+
+
+def _parse_sample(line: str) -> bool:
+    """
+    Returns whether a line of an ECG CSV file is a voltage sample, i.e., a single number.
+    """
+
+    fields = [field for field in next(csv.reader([line]), []) if field != ""]
+
+    if len(fields) != 1 or line.startswith(","):
+        return False
+
+    try:
+        float(fields[0].replace(",", "."))
+
+    except ValueError:
+        return False
+
+    return True
+
+
+def parse_electrocardiogram(content: bytes) -> (dict, np.ndarray):
+    """
+    Parses an ECG CSV file as the Apple Watch exports it, e.g., ``electrocardiograms/ecg_2020-01-01.csv``.
+    The file starts with a ``key,value`` metadata header, followed by one voltage sample per line.
+
+    Args:
+        content (bytes): Content of the CSV file
+
+    Raises:
+        ValueError: If a sample is no number
+
+    Returns:
+        (dict, np.ndarray): Metadata header and voltage samples as ``float32``
+    """
+
+    lines = content.decode("utf-8-sig").splitlines()
+    header = {}
+    start = len(lines)
+
+    for position, line in enumerate(lines):
+        if _parse_sample(line):
+            start = position
+            break
+
+        fields = next(csv.reader([line]), [])
+
+        if len(fields) >= 2 and fields[0] != "":
+            header[fields[0]] = fields[1]
+
+    # locales with decimal comma quote the samples, e.g., "-120,5"
+    samples = np.array([line for line in lines[start:] if line.strip() != ""], dtype=str)
+    samples = np.char.replace(np.char.strip(samples, '"'), ",", ".")
+
+    return header, samples.astype(np.float32)
+
+
+class Electrocardiograms(object):
+    """
+    Gives access to the Apple Watch ECG recordings of a Apple Health App dump data.
+    The CSV files are converted once: their metadata header into ``metadata`` and the samples of all recordings into
+    one binary ``float32`` file below ``cache_path``. Later sessions memory-map it and slice single recordings without
+    reading the CSV files again.
+
+    Args:
+        zip_dump_path (str, optional): Path to the zipped data dump. Defaults to constants.ZIP_PATH.
+        unzip_path (str, optional): Path to the unzipped data dump. Defaults to constants.UNZIP_PATH.
+        force_unzip (bool, optional): Flag to force unzipping and converting the data again. Defaults to False.
+        cache_path (str, optional): Directory of the converted recordings. They are keyed by a fingerprint of the data
+            dump, see ``AppleHealthParser``. Defaults to constants.CACHE_PATH.
+    """
+
+    def __init__(
+        self,
+        zip_dump_path: str = constants.ZIP_PATH,
+        unzip_path: str = constants.UNZIP_PATH,
+        force_unzip: bool = False,
+        cache_path: str = constants.CACHE_PATH
+    ) -> None:
+
+        self._parser = AppleHealthParser(zip_dump_path, unzip_path, force_unzip)
+
+        # the same key as the tables of the parser, i.e., of the data dump the CSV files are read from
+        self._cache = TableCache(os.path.join(cache_path, self._parser._fingerprint, constants.ECG_DIR_NAME))
+        samples_path = os.path.join(self._cache.directory, constants.ECG_SAMPLES_NAME)
+
+        if force_unzip:
+            self._cache.clear()
+
+        # increase performace by do not parse again.
+        if constants.ECG_TABLE not in self._cache or not os.path.exists(samples_path):
+            self._convert(samples_path)
+
+        self.metadata = self._cache.load(constants.ECG_TABLE)
+
+        # empty files can not be memory-mapped
+        if os.path.getsize(samples_path) > 0:
+            self.samples = np.memmap(samples_path, dtype=np.float32, mode="r")
+
+        else:
+            self.samples = np.empty(0, dtype=np.float32)
+
+    def _iter_files(self) -> Iterator[Tuple[str, bytes]]:
+        """
+        Reads the ECG CSV files, either from ``unzip_path`` or out of the zipped data dump.
+
+        Yields:
+            (str, bytes): Path relative to the data dump and content of each file, sorted by path
+        """
+
+        if self._parser._read_from_zip:
+            prefix = f"{constants.EXPORT_DIR_NAME}/"
+
+            with zipfile.ZipFile(self._parser._zip_dump_path) as zipped_export:
+                names = sorted({
+                    name for name in zipped_export.namelist()
+                    if name.startswith(f"{prefix}{constants.ECG_DIR_NAME}/") and name.endswith(".csv")
+                })
+
+                for name in names:
+                    yield name[len(prefix):], zipped_export.read(name)
+
+            return
+
+        export_directory = os.path.dirname(self._parser._xml_path)
+
+        for path in sorted(glob.glob(os.path.join(export_directory, constants.ECG_DIR_NAME, "*.csv"))):
+            with open(path, "rb") as file:
+                yield os.path.relpath(path, export_directory).replace(os.sep, "/"), file.read()
+
+    def _convert(self, samples_path: str) -> None:
+        """
+        Parses all ECG CSV files, appends their samples to ``samples_path`` and caches their metadata.
+
+        Args:
+            samples_path (str): Path of the binary samples file
+        """
+
+        os.makedirs(self._cache.directory, exist_ok=True)
+        rows = []
+        offset = 0
+
+        # write to a temporary file first to never leave half written samples behind
+        temporary_path = f"{samples_path}.tmp"
+
+        with open(temporary_path, "wb") as samples_file:
+            for path, content in self._iter_files():
+                header, samples = parse_electrocardiogram(content)
+                samples.tofile(samples_file)
+
+                rows.append({
+                    constants.ECG_COLUMN_FILE: path,
+                    **header,
+                    constants.ECG_COLUMN_SAMPLE_START: offset,
+                    constants.ECG_COLUMN_SAMPLE_COUNT: len(samples)
+                })
+                offset += len(samples)
+
+        os.replace(temporary_path, samples_path)
+
+        metadata = pd.DataFrame(rows)
+
+        if not metadata.empty:
+            metadata = self._fix_data_types(metadata)
+
+        self._cache.save(constants.ECG_TABLE, metadata)
+
+    @staticmethod
+    def _fix_data_types(metadata: pd.DataFrame) -> pd.DataFrame:
+        """
+        Parses the recording timestamps and the sample rates, e.g., "512 hertz", of the metadata.
+        Columns in unexpected formats, e.g., of other locales, stay strings.
+
+        Args:
+            metadata (pd.DataFrame): Metadata of the recordings
+
+        Returns:
+            pd.DataFrame: Metadata with fixed data types
+        """
+
+        if constants.ECG_COLUMN_RECORDED_DATE in metadata:
+            try:
+                metadata[constants.ECG_COLUMN_RECORDED_DATE], offsets = parse_healthkit_timestamps(metadata[constants.ECG_COLUMN_RECORDED_DATE])
+                metadata.insert(
+                    metadata.columns.get_loc(constants.ECG_COLUMN_RECORDED_DATE) + 1,
+                    f"{constants.ECG_COLUMN_RECORDED_DATE}{constants.OFFSET_COLUMN_SUFFIX}",
+                    offsets
+                )
+
+            except ValueError:
+                pass
+
+        if constants.ECG_COLUMN_SAMPLE_RATE in metadata:
+            sample_rates = metadata[constants.ECG_COLUMN_SAMPLE_RATE].str.extract(r"^\s*(\d+(?:[.,]\d+)?)", expand=False)
+            metadata[constants.ECG_COLUMN_SAMPLE_RATE] = pd.to_numeric(sample_rates.str.replace(",", "."))
+
+        return metadata
+
+    def __len__(self) -> int:
+        return 0 if self.metadata is None else len(self.metadata)
+
+    def __getitem__(self, recording: int) -> np.ndarray:
+        """
+        Get the voltage samples of a recording with the help of subscriptions.
+
+        Args:
+            recording (int): Row of the recording in ``metadata``
+
+        Raises:
+            IndexError: If ``recording`` does not exist
+
+        Returns:
+            np.ndarray: Samples as ``float32``, a read-only view into the memory-mapped file
+        """
+
+        if not -len(self) <= recording < len(self):
+            raise IndexError(f"'recording' need to be in range of {len(self)} recordings\n\tGiven: {recording}")
+
+        start = self.metadata[constants.ECG_COLUMN_SAMPLE_START].iloc[recording]
+        count = self.metadata[constants.ECG_COLUMN_SAMPLE_COUNT].iloc[recording]
+
+        return self.samples[start:start + count]
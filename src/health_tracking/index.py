@@ -0,0 +1,135 @@
+import io
+import re
+from typing import IO
+
+import pandas as pd
+
+from . import constants
+
+# Apple indents top-level elements by one space, nested ones by more. Captures the tag and, if present, the ``type``
+# of top-level elements or the closing tag of the root
+TOP_LEVEL_ELEMENT_REGEX = re.compile(rb'\n(?: <(\w+)(?:[^>]*?\stype="([^"]*)")?|</(\w+)>)')
+
+# bytes scanned at once and the margin kept for matches crossing the end of a block
+INDEX_BLOCK_SIZE = 16 * 1024 * 1024
+INDEX_BLOCK_OVERLAP = 64 * 1024
+
+INDEX_COLUMNS = ["type", "start", "end", "count"]
+
+
+def build_record_index(source: IO[bytes]) -> pd.DataFrame:
+    """
+    Scans the raw bytes of ``export.xml`` for top-level ``Record`` elements, without parsing the XML.
+    Apple writes the records grouped by their type, so each type is stored in one or a few contiguous runs.
+
+    Args:
+        source (IO[bytes]): Binary file object of the XML document, positioned at its start
+
+    Returns:
+        pd.DataFrame: One row per run of records with the same ``type``, in document order. Holds the ``type``, the
+            byte offsets ``start`` (inclusive) and ``end`` (exclusive) of the run and the ``count`` of records in it.
+            Is empty if the document is not formatted as Apple exports it
+    """
+
+    record_tag = constants.RECORD_TAG.encode()
+    runs = []
+    current = None  # [type, start, end, count] of the open run
+    offset = 0  # absolute offset of ``block``
+    block = b""
+    finished = False
+
+    while not finished:
+        data = source.read(INDEX_BLOCK_SIZE)
+        block += data
+        finished = not data
+
+        # only matches starting before this position are complete for sure
+        limit = len(block) if finished else max(0, len(block) - INDEX_BLOCK_OVERLAP)
+
+        for match in TOP_LEVEL_ELEMENT_REGEX.finditer(block):
+            if match.start() >= limit:
+                break
+
+            # position of "<", the root's closing tag is not indented
+            start = offset + (match.start() + 1 if match.group(3) else match.start() + 2)
+            tag, element_type = match.group(1), match.group(2)
+
+            if current is not None and (tag != record_tag or element_type != current[0]):
+                current[2] = start
+                runs.append(current)
+                current = None
+
+            if match.group(3):
+                finished = True
+                break
+
+            if tag == record_tag:
+                if current is None:
+                    current = [element_type, start, None, 0]
+
+                current[3] += 1
+
+        offset += limit
+        block = block[limit:]
+
+    result = pd.DataFrame([[run_type.decode(), start, end, count] for run_type, start, end, count in runs], columns=INDEX_COLUMNS)
+    return result.astype({"start": "int64", "end": "int64", "count": "int64"})
+
+
+class RangeReader(io.RawIOBase):
+    """
+    Read-only file object over byte ranges of a seekable source, wrapped in ``prefix`` and ``suffix``.
+    Used to parse runs of top-level elements as standalone XML document.
+
+    Args:
+        source (IO[bytes]): Seekable binary file object
+        ranges (list): ``(start, end)`` byte offsets to read, in this order
+        prefix (bytes, optional): Is read before the ranges. Defaults to ``b"<HealthData>"``.
+        suffix (bytes, optional): Is read after the ranges. Defaults to ``b"</HealthData>"``.
+    """
+
+    def __init__(
+        self,
+        source: IO[bytes],
+        ranges: list,
+        prefix: bytes = b"<" + constants.HEALTH_DATA_TAG.encode() + b">",
+        suffix: bytes = b"</" + constants.HEALTH_DATA_TAG.encode() + b">"
+    ) -> None:
+
+        super().__init__()
+        self._source = source
+        self._ranges = list(ranges)
+        self._pending = prefix
+        self._suffix = suffix
+        self._remaining = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+
+        while not self._pending:
+            if self._remaining > 0:
+                self._pending = self._source.read(min(self._remaining, INDEX_BLOCK_SIZE, len(buffer)))
+
+                if not self._pending:
+                    raise EOFError("Source ended before the end of the requested range")
+
+                self._remaining -= len(self._pending)
+
+            elif self._ranges:
+                start, end = self._ranges.pop(0)
+                self._source.seek(start)
+                self._remaining = end - start
+
+            elif self._suffix:
+                self._pending, self._suffix = self._suffix, b""
+
+            else:
+                return 0
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+
+        return size
@@ -0,0 +1,1331 @@
+import re
+import os
+import shutil
+import zipfile
+import inspect
+import threading
+import contextlib
+
+import numpy as np
+import pandas as pd
+import xml.etree.ElementTree as ET
+
+from collections import OrderedDict
+from typing import IO, Callable, Iterable, Iterator
+
+from . import chunks, constants, streaming
+from .cache import TableCache, fingerprint
+from .compact import concat_tables, numeric_from_categorical
+from .index import INDEX_COLUMNS, RangeReader, build_record_index
+from .stats import ParseStats
+from .store import SQLiteStore
+from .timestamps import parse_healthkit_timestamps
+
+
+class InstanceRegistry(type):
+    """
+    Is used as `metaclass` to share one instance per data dump, keyed by the fingerprint of ``zip_dump_path`` (or of
+    ``export.xml`` if only the unzipped data dump exists) and ``unzip_path``. Further arguments are only used by the
+    first construction for a data dump. Construction is thread-safe and the same data dump is never set up twice
+    concurrently. At most ``constants.MAX_PARSER_INSTANCES`` instances are kept, the least recently used idle ones
+    are evicted, i.e., dropped from the registry.
+    """
+
+    _instances = OrderedDict()
+    _constructing = {}
+    _lock = threading.Lock()
+
+    def _instance_key(cls, *args, **kwargs) -> tuple:
+        arguments = inspect.signature(cls.__init__).bind(None, *args, **kwargs)
+        arguments.apply_defaults()
+
+        zip_dump_path = arguments.arguments["zip_dump_path"]
+        unzip_path = arguments.arguments["unzip_path"]
+        source_path = zip_dump_path if os.path.exists(zip_dump_path) else os.path.join(unzip_path, constants.XML_NAME)
+        source = fingerprint(source_path) if os.path.exists(source_path) else os.path.abspath(source_path)
+
+        return cls, source, os.path.abspath(unzip_path)
+
+    def __call__(cls, *args, **kwargs):
+        key = cls._instance_key(*args, **kwargs)
+
+        with InstanceRegistry._lock:
+            if key in InstanceRegistry._instances:
+                InstanceRegistry._instances.move_to_end(key)
+                return InstanceRegistry._instances[key]
+
+            construction_lock = InstanceRegistry._constructing.setdefault(key, threading.Lock())
+
+        with construction_lock:
+
+            # another thread may have constructed it meanwhile
+            with InstanceRegistry._lock:
+                if key in InstanceRegistry._instances:
+                    InstanceRegistry._instances.move_to_end(key)
+                    return InstanceRegistry._instances[key]
+
+            instance = super(InstanceRegistry, cls).__call__(*args, **kwargs)
+
+            with InstanceRegistry._lock:
+                InstanceRegistry._instances[key] = instance
+                InstanceRegistry._constructing.pop(key, None)
+                InstanceRegistry._evict()
+
+        return instance
+
+    @staticmethod
+    def _evict() -> None:
+        """
+        Drops least recently used idle instances until at most ``constants.MAX_PARSER_INSTANCES`` are left.
+        Needs to hold ``_lock``.
+        """
+
+        for key in list(InstanceRegistry._instances):
+            if len(InstanceRegistry._instances) <= constants.MAX_PARSER_INSTANCES:
+                break
+
+            if InstanceRegistry._instances[key]._is_idle():
+                del InstanceRegistry._instances[key]
+
+    @staticmethod
+    def clear() -> None:
+        """
+        Drops all instances, the next construction sets up its data dump again.
+        """
+
+        with InstanceRegistry._lock:
+            InstanceRegistry._instances.clear()
+
+
+class AppleHealthParser(metaclass=InstanceRegistry):
+    """
+    Parse and gives access to Apple Health App dump data.
+    Use ``extract_all`` to read every element type in a single pass.
+    Nested elements, e.g., ``MetadataEntry``s, are available as separate tables, see ``constants.CHILD_TABLES``.
+
+    Args:
+        zip_dump_path (str, optional): Path to the zipped data dump. Defaults to constants.ZIP_PATH.
+        unzip_path (str, optional): Path to the unzipped data dump. Defaults to constants.UNZIP_PATH.
+        force_unzip (bool, optional): Flag to force unzipping the data again. A new data dump at ``zip_dump_path`` is
+            unzipped again anyway, see ``constants.ZIP_FINGERPRINT_NAME``. Defaults to False.
+        streaming (bool, optional): Flag to stream the XML with ``iterparse`` on each extraction instead of keeping
+            the whole ``ElementTree`` in memory. Peak memory then tracks the size of the extracted tables. Defaults to False.
+        read_from_zip (bool, optional): Flag to read ``export.xml`` directly out of the zipped data dump. Nothing is
+            unzipped to ``unzip_path`` and the archive is never buffered in memory. Defaults to False.
+        cache_path (str, optional): Directory to persist extracted ``DataFrame``s as Parquet files, e.g.
+            ``constants.CACHE_PATH``. The tables are keyed by a fingerprint of the data dump, a new dump or
+            ``force_unzip`` invalidates them. Defaults to None, i.e., no persistent cache.
+        incremental (bool, optional): Flag to import a new data dump incrementally. Requires ``cache_path``. Tables of
+            previous imports are kept in ``constants.INCREMENTAL_DIR_NAME`` below ``cache_path``, only elements from their
+            high-water mark on (see ``constants.INCREMENTAL_COLUMNS``) are built and appended. Defaults to False.
+        compact (bool, optional): Flag to collect elements column-wise with dictionary-encoded categorical and numeric
+            columns instead of one ``dict`` per element. Numeric columns are only parsed per distinct value and stored
+            as ``float32``, i.e., with about 7 significant digits. Shrinks the memory of large ``Record`` tables.
+            Defaults to False.
+        n_jobs (int, optional): Number of processes that parse chunks of the unzipped ``export.xml`` in parallel.
+            The result equals the serial one. Is ignored if ``read_from_zip`` is set or the tree is in memory already.
+            Defaults to 1.
+        stats_hook (Callable[[dict], None], optional): Is called with the measurement of each finished stage of the
+            parsing pipeline, see ``stats.ParseStats``. Defaults to None.
+
+    The measurements are available as ``stats``, a ``stats.ParseStats`` that is also logged with level ``DEBUG``.
+    Constructing a parser for a data dump that already has one returns the existing instance, see
+    ``InstanceRegistry``. Instances can be shared by threads, each table is only extracted once even if requested
+    concurrently.
+    """
+
+    # attributes that cache the ``DataFrame`` of an element type
+    _ELEMENT_ATTRIBUTES = {
+        constants.ME_TAG: "_me",
+        constants.RECORD_TAG: "_records",
+        constants.WORKOUT_TAG: "_workouts",
+        constants.CORRELATION_TAG: "_correlations",
+        constants.ACTIVITY_SUMMARY_TAG: "_activity_summaries",
+        constants.CLINICAL_RECORD_TAG: "_clinical_records"
+    }
+
+    def __init__(
+        self,
+        zip_dump_path: str = constants.ZIP_PATH,
+        unzip_path: str = constants.UNZIP_PATH,
+        force_unzip: bool = False,
+        streaming: bool = False,
+        read_from_zip: bool = False,
+        cache_path: str = None,
+        incremental: bool = False,
+        compact: bool = False,
+        n_jobs: int = 1,
+        stats_hook: Callable[[dict], None] = None
+    ) -> None:
+
+        # give information about may changing Version
+        print("AppleHealthParser is tested for HealthKit Export Version: 11")
+
+        self.stats = ParseStats(stats_hook)
+
+        self._zip_dump_path = zip_dump_path
+        self._read_from_zip = read_from_zip
+        self._streaming = streaming
+        self._compact = compact
+        self._n_jobs = n_jobs
+
+        self._xml_path = os.path.join(unzip_path, constants.XML_NAME)
+        zip_fingerprint = fingerprint(zip_dump_path) if os.path.exists(zip_dump_path) else None
+
+        # handle some cases
+        if not read_from_zip:
+            fingerprint_path = os.path.join(unzip_path, constants.ZIP_FINGERPRINT_NAME)
+
+            # a new data dump at ``zip_dump_path`` replaces the one unzipped from a previous data dump
+            stale = zip_fingerprint is not None and os.path.exists(unzip_path) and self._read_fingerprint(fingerprint_path) != zip_fingerprint
+
+            if force_unzip or stale:
+                shutil.rmtree(unzip_path)
+
+            if not os.path.exists(unzip_path):
+                with self.stats.measure(constants.STAGE_UNZIP), zipfile.ZipFile(zip_dump_path) as zipped_export:
+                    zipped_export.extractall(os.path.split(unzip_path)[0])  # need path to dir not file
+
+                with open(fingerprint_path, "w") as file:
+                    file.write(zip_fingerprint)
+
+        # the unzipped data dump matches ``zip_dump_path`` now, so its fingerprint keys the cached tables
+        self._fingerprint = zip_fingerprint or fingerprint(self._xml_path)
+        self._tree = None
+        self._health_data = None
+        self._cache = None
+        self._incremental_store = None
+
+        if incremental:
+            if cache_path is None:
+                raise ValueError("Incremental imports need a 'cache_path' to store the previous imports")
+
+            self._incremental_store = TableCache(os.path.join(cache_path, constants.INCREMENTAL_DIR_NAME))
+
+        if cache_path is not None:
+            self._cache = TableCache(os.path.join(cache_path, self._fingerprint))
+
+            if force_unzip:
+                self._cache.clear()
+
+        # element types
+        self._export_date = None
+        self._me = None
+        self._workouts = None
+        self._workout_types = None
+        self._activity_summaries = None
+        self._records = None
+        self._correlations = None
+        self._clinical_records = None
+
+        # tables of nested elements, see ``constants.CHILD_TABLES``
+        self._children = {}
+
+        # element types and nested tables that are already parsed, their ``DataFrame`` might be ``None`` if empty
+        self._parsed = set()
+
+        # ``Record``s of single types, see ``extract_records``
+        self._record_index = None
+        self._records_by_type = {}
+
+        # one lock per table and for the tree, see ``_locked``
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+        self._tree_lock = threading.Lock()
+        self._active = 0
+
+    @contextlib.contextmanager
+    def _locked(self, names: Iterable[str]) -> Iterator[None]:
+        """
+        Holds the locks of the tables ``names`` to extract them. They are acquired in sorted order, so threads
+        extracting overlapping tables can not deadlock.
+
+        Args:
+            names (Iterable[str]): Names of the tables, e.g., element types
+        """
+
+        with self._locks_lock:
+            locks = [self._locks.setdefault(name, threading.RLock()) for name in sorted(set(names))]
+            self._active += 1
+
+        try:
+            with contextlib.ExitStack() as stack:
+                for lock in locks:
+                    stack.enter_context(lock)
+
+                yield
+
+        finally:
+            with self._locks_lock:
+                self._active -= 1
+
+    def _is_idle(self) -> bool:
+        """
+        Returns whether no thread is extracting tables of this parser.
+        """
+
+        with self._locks_lock:
+            return self._active == 0
+
+    @staticmethod
+    def _read_fingerprint(path: str) -> str:
+        """
+        Returns the fingerprint stored at ``path``, ``None`` if there is none, e.g., for data dumps unzipped by hand.
+        """
+
+        if not os.path.exists(path):
+            return None
+
+        with open(path) as file:
+            return file.read().strip()
+
+    def _fix_data_types(self, data_frame: pd.DataFrame, element_type: str) -> pd.DataFrame:
+        """
+        Fix the data types of a extracted ``DataFrame`` based on the column schemas of ``element_type``, see
+        ``constants.NUMERIC_COLUMNS``, ``constants.CATEGORICAL_COLUMNS``, ``constants.DATETIME_COLUMNS`` and
+        ``constants.DAY_COLUMNS``. Timestamps are converted to UTC since exports mix UTC offsets, their original offsets
+        in minutes are kept in an additional ``int16`` column next to them (see ``constants.OFFSET_COLUMN_SUFFIX``).
+        Numeric columns are always floats (``float32`` if ``compact`` is set), values that are no numbers are ``NaN``
+        or, for ``constants.CATEGORY_VALUE_COLUMNS``, moved to a categorical column next to them. Columns of the schemas
+        that no row has are added. So the columns and data types of a table do not depend on which rows it holds.
+
+        Args:
+            data_frame (pd.DataFrame): Extracted ``DataFrame``
+            element_type (str): One of ``constants.ELEMENT_TAGS`` or ``constants.CHILD_TABLES``
+
+        Raises:
+            ValueError: If a date column does not match the HealthKit format
+
+        Returns:
+            pd.DataFrame: ``DataFrame`` with fixed data types
+        """
+
+        with self.stats.measure(constants.STAGE_FIX_DATA_TYPES, element_type) as measurement:
+            measurement["rows"] = len(data_frame)
+            result = data_frame
+            numeric_dtype = np.float32 if self._compact else np.float64
+            schemas = [constants.NUMERIC_COLUMNS, constants.CATEGORICAL_COLUMNS, constants.DATETIME_COLUMNS, constants.DAY_COLUMNS]
+
+            # columns no row has, e.g., ``unit`` of sleep ``Record``s only, are added as missing values
+            if not result.empty:
+                for column in sorted(set().union(*[schema.get(element_type, set()) for schema in schemas]) - set(result.columns)):
+                    result[column] = None
+
+            for column in constants.NUMERIC_COLUMNS.get(element_type, set()) & set(result.columns):
+                values = result[column]
+
+                if isinstance(values.dtype, pd.CategoricalDtype):
+                    result[column] = numeric_from_categorical(values, numeric_dtype)
+
+                else:
+                    result[column] = pd.to_numeric(values, errors="coerce").astype(numeric_dtype)
+
+                category_column = constants.CATEGORY_VALUE_COLUMNS.get(element_type, {}).get(column)
+
+                # e.g., ``Record`` values of category types are no numbers
+                if category_column is not None:
+                    strings = values.where(result[column].isna()).astype("category").cat.remove_unused_categories()
+                    result.insert(result.columns.get_loc(column) + 1, category_column, strings)
+
+            for column in constants.CATEGORICAL_COLUMNS.get(element_type, set()) & set(result.columns):
+                result[column] = result[column].astype("category")
+
+            for column in constants.DATETIME_COLUMNS.get(element_type, set()) & set(result.columns):
+                result[column], offsets = parse_healthkit_timestamps(result[column])
+                result.insert(result.columns.get_loc(column) + 1, f"{column}{constants.OFFSET_COLUMN_SUFFIX}", offsets)
+
+            for column in constants.DAY_COLUMNS.get(element_type, set()) & set(result.columns):
+                result[column] = pd.to_datetime(result[column], format=constants.DAY_FORMAT)
+
+            return result
+
+    @contextlib.contextmanager
+    def _open_xml(self) -> Iterator[IO[bytes]]:
+        """
+        Opens ``export.xml`` as binary file object, either from ``unzip_path`` or as member of the zipped data dump.
+
+        Yields:
+            IO[bytes]: Opened XML document
+        """
+
+        if not self._read_from_zip:
+            with open(self._xml_path, "rb") as source:
+                yield source
+            return
+
+        with zipfile.ZipFile(self._zip_dump_path) as zipped_export, zipped_export.open(constants.ZIP_XML_MEMBER) as source:
+            yield source
+
+    def _iter_elements(self, element_types: set, ranges: list = None, stream: bool = False) -> Iterator[ET.Element]:
+        """
+        Yields the top-level elements of ``element_types`` in document order, either from the parsed tree or
+        streamed from the XML file.
+
+        Args:
+            element_types (set): Tags of the elements to yield
+            ranges (list, optional): Only stream these ``(start, end)`` byte ranges of top-level elements, see
+                ``get_record_index``. Defaults to None, i.e., the whole document.
+            stream (bool, optional): Flag to stream even if ``streaming`` is not set, the tree is used only if it is
+                parsed already. Defaults to False.
+
+        Yields:
+            ET.Element: Top-level element of one of ``element_types``
+        """
+
+        if ranges is not None:
+            with self._open_xml() as source:
+                yield from streaming.iter_elements(RangeReader(source, ranges), element_types)
+            return
+
+        # the tree is parsed lazily, cached tables do not need it at all
+        if not self._streaming and not stream and self._tree is None:
+            with self._tree_lock:
+                if self._tree is None:
+                    with self.stats.measure(constants.STAGE_PARSE) as measurement, self._open_xml() as source:
+                        tree = ET.parse(source)
+                        measurement["rows"] = len(tree.getroot())
+
+                    self._health_data = tree.getroot()
+                    self._tree = tree
+
+        if self._tree is not None:
+            yield from (element for element in self._health_data if element.tag in element_types)
+            return
+
+        with self._open_xml() as source:
+            yield from streaming.iter_elements(source, element_types)
+
+    def _extract_elements_of_types(self, element_types: set, filters: dict = None, ranges: list = None, child_tables: set = None) -> dict:
+        """
+        Returns a ``DataFrame`` for each of ``element_types`` and ``child_tables``, collected in a single pass over
+        the document. Do not use by your own!
+
+        Args:
+            element_types (set): Each need to fit one of ``constants.ELEMENT_TAGS``
+            filters (dict, optional): Maps element types to predicates on the raw attributes. Elements failing them
+                are skipped before any ``DataFrame`` is built. Defaults to None.
+            ranges (list, optional): Only read these byte ranges, see ``_iter_elements``. Defaults to None.
+            child_tables (set, optional): Each need to fit one of ``constants.CHILD_TABLES`` whose parent is in
+                ``element_types``. Defaults to None.
+
+        Raises:
+            ValueError: If wrong ``element_types`` or ``child_tables`` are given
+
+        Returns:
+            dict: maps each of ``element_types`` and ``child_tables`` to its ``DataFrame`` or ``None`` if empty
+        """
+
+        if not set(element_types) <= constants.ELEMENT_TAGS:
+            raise ValueError(f"'element_types' need to be in: {constants.ELEMENT_TAGS}")
+
+        child_tables = set(child_tables or [])
+
+        if not all(name in constants.CHILD_TABLES and constants.CHILD_TABLES[name][0] in element_types for name in child_tables):
+            raise ValueError(f"'child_tables' need to be in: {set(constants.CHILD_TABLES)} and their parents in 'element_types'")
+
+        # splitting the document into chunks needs the XML on disk and a plain full pass
+        parallel = self._n_jobs > 1 and not self._read_from_zip and self._tree is None and filters is None and ranges is None
+
+        tables = None
+
+        if parallel:
+            with self.stats.measure(constants.STAGE_PARALLEL_PARSE) as measurement:
+                tables = chunks.parse_parallel(self._xml_path, element_types, self._n_jobs, self._compact, child_tables)
+                measurement["rows"] = None if tables is None else sum(len(data_frame) for data_frame in tables.values())
+
+        if tables is None:
+            elements = self._iter_elements(set(element_types), ranges)
+            tables = streaming.collect_tables(elements, element_types, self._compact, filters, child_tables, self.stats)
+
+        result = {}
+
+        for element_type, data_frame in tables.items():
+            data_frame = self._fix_data_types(data_frame, element_type)
+            result[element_type] = None if data_frame.empty else data_frame
+
+        return result
+
+    def _extract_elements_of_type(self, element_type: str) -> pd.DataFrame:
+        """
+        Returns a ``DataFrame`` with the elements of ``element_type``. Do not use by your own!
+
+        Args:
+            element_type (str): Need to fit one of ``constants.ELEMENT_TAGS``
+
+        Raises:
+            ValueError: If wrong ``element_type`` is given
+
+        Returns:
+            pd.DataFrame: of given ``element_type`` or ``None`` if empty
+        """
+
+        if element_type not in constants.ELEMENT_TAGS:
+            raise ValueError(f"'element_type' need to be one of: {constants.ELEMENT_TAGS}")
+
+        return self._extract_elements_of_types({element_type})[element_type]
+
+    def _extract_incremental(self, element_types: set, child_tables: set = None) -> dict:
+        """
+        Like ``_extract_elements_of_types`` but only builds elements from the high-water mark of the previous import on.
+        These replace the stored rows from the high-water mark on, e.g., the still changing ``ActivitySummary`` of
+        the last day. The merged tables are stored for the next import. Stored nested tables of ``element_types`` are
+        always updated along with their parents to keep their ``constants.PARENT_ID_COLUMN`` valid.
+        Do not use by your own!
+
+        Args:
+            element_types (set): Each need to fit one of ``constants.ELEMENT_TAGS``
+            child_tables (set, optional): Each need to fit one of ``constants.CHILD_TABLES`` whose parent is in
+                ``element_types``. Defaults to None.
+
+        Returns:
+            dict: maps each of ``element_types`` and the updated nested tables to its ``DataFrame`` or ``None`` if empty
+        """
+
+        child_tables = set(child_tables or []) | {
+            name for name, (parent, _) in constants.CHILD_TABLES.items() if parent in element_types and name in self._incremental_store
+        }
+        previous_tables = {}
+        watermarks = {}
+        filters = {}
+
+        for element_type in element_types:
+            column = constants.INCREMENTAL_COLUMNS.get(element_type)
+
+            if column is None or element_type not in self._incremental_store:
+                continue
+
+            # previous imports did not keep the nested tables, so they need to be built from scratch
+            if any(parent == element_type and name not in self._incremental_store for name, (parent, _) in constants.CHILD_TABLES.items()
+                   if name in child_tables):
+                continue
+
+            previous_table = self._incremental_store.load(element_type)
+
+            if previous_table is not None and column in previous_table.columns:
+                previous_tables[element_type] = previous_table
+                watermarks[element_type] = pd.to_datetime(previous_table[column], utc=True).max()
+                filters[element_type] = streaming.date_filter(column, start=watermarks[element_type])
+
+        result = self._extract_elements_of_types(element_types, filters, child_tables=child_tables)
+
+        for element_type, watermark in watermarks.items():
+            column = constants.INCREMENTAL_COLUMNS[element_type]
+            previous_table = previous_tables[element_type]
+            previous_mask = pd.to_datetime(previous_table[column], utc=True) < watermark
+            parts = [previous_table[previous_mask]]
+            new_mask = None
+
+            if result[element_type] is not None:
+                new_mask = pd.to_datetime(result[element_type][column], utc=True) >= watermark
+                parts.append(result[element_type][new_mask])
+
+            result[element_type] = concat_tables(parts)
+
+            for name in [name for name in child_tables if constants.CHILD_TABLES[name][0] == element_type]:
+                child_parts = [self._select_children(self._incremental_store.load(name), previous_mask)]
+
+                if new_mask is not None:
+                    child_parts.append(self._select_children(result[name], new_mask, offset=int(previous_mask.sum())))
+
+                child_parts = [part for part in child_parts if part is not None]
+                result[name] = concat_tables(child_parts) if child_parts else None
+
+        for element_type, data_frame in result.items():
+            self._incremental_store.save(element_type, data_frame)
+
+        return result
+
+    def _extract_record_types(self, types: list) -> pd.DataFrame:
+        """
+        Returns the ``Record``s of ``types``. Types that are not extracted yet are selected from all ``Record``s if
+        these are parsed already, otherwise they are read together, if possible by seeking to their byte ranges of the
+        record index. Do not use by your own!
+
+        Args:
+            types (list): ``Record`` types, e.g., ``"HKQuantityTypeIdentifierHeartRate"``
+
+        Returns:
+            pd.DataFrame: ``Record``s grouped by type in the order of ``types`` or ``None`` if empty
+        """
+
+        missing = {record_type for record_type in types if record_type not in self._records_by_type}
+
+        if missing:
+            with self._locked(f"{constants.RECORD_TAG}/{record_type}" for record_type in missing):
+
+                # another thread may have extracted some meanwhile
+                missing = {record_type for record_type in missing if record_type not in self._records_by_type}
+
+                # filter instead of parsing again
+                if constants.RECORD_TAG in self._parsed:
+                    records = self._records
+
+                elif missing:
+                    filters = {constants.RECORD_TAG: lambda attributes: attributes.get("type") in missing}
+                    ranges = None
+
+                    # seeking is pointless if the whole tree is in memory anyway
+                    if self._tree is None and not self.get_record_index().empty:
+                        runs = self._record_index[self._record_index["type"].isin(missing)]
+                        ranges = list(zip(runs["start"], runs["end"]))
+                        filters = None
+
+                    records = self._extract_elements_of_types({constants.RECORD_TAG}, filters, ranges)[constants.RECORD_TAG]
+
+                for record_type in missing:
+                    self._records_by_type[record_type] = None if records is None else self._select_rows(records, records["type"] == record_type)
+
+        parts = [self._records_by_type[record_type] for record_type in types if self._records_by_type[record_type] is not None]
+
+        return concat_tables(parts) if parts else None
+
+    def _extract_time_range(self, element_type: str, start, end, types: list = None) -> pd.DataFrame:
+        """
+        Returns the elements of ``element_type`` whose ``constants.TIME_RANGE_COLUMNS`` is in ``[start, end)``.
+        Uses the tables in memory or the cache if available, otherwise elements out of range are skipped while
+        parsing. The result is not cached. Do not use by your own!
+
+        Args:
+            element_type (str): One of ``constants.TIME_RANGE_COLUMNS``
+            start: Inclusive lower bound, anything ``pd.Timestamp`` understands. Naive values are taken as UTC
+            end: Exclusive upper bound, see ``start``
+            types (list, optional): Only ``Record``s of these types. Defaults to None.
+
+        Returns:
+            pd.DataFrame: of given ``element_type`` or ``None`` if empty
+        """
+
+        column = constants.TIME_RANGE_COLUMNS[element_type]
+        start, end = [None if bound is None else self._to_utc(bound) for bound in (start, end)]
+        raw = False  # post-processing of ``_store`` is missing
+
+        if element_type in self._parsed:
+            data_frame = getattr(self, self._ELEMENT_ATTRIBUTES[element_type])
+
+        elif types is not None and all(record_type in self._records_by_type for record_type in types):
+            data_frame = self._extract_record_types(types)
+
+        elif self._cache is not None and element_type in self._cache:
+            raw = True
+            naive = column in constants.DAY_COLUMNS.get(element_type, set())
+            filters = [
+                (column, operator, bound.tz_convert(None) if naive else bound)
+                for operator, bound in ((">=", start), ("<", end)) if bound is not None
+            ]
+            data_frame = self._cache.load(element_type, filters or None)
+
+        else:
+            raw = True
+            predicates = [streaming.date_filter(column, start, end)]
+            ranges = None
+
+            if types is not None:
+                if self._tree is None and not self.get_record_index().empty:
+                    runs = self._record_index[self._record_index["type"].isin(types)]
+                    ranges = list(zip(runs["start"], runs["end"]))
+
+                else:
+                    predicates.append(lambda attributes: attributes.get("type") in types)
+
+            filters = {element_type: lambda attributes: all(predicate(attributes) for predicate in predicates)}
+            data_frame = self._extract_elements_of_types({element_type}, filters, ranges)[element_type]
+
+        if data_frame is None:
+            return None
+
+        if raw and element_type == constants.WORKOUT_TAG:
+            data_frame = self._shorten_workout_types(data_frame)
+
+        mask = pd.Series(True, index=data_frame.index)
+        times = data_frame[column]
+
+        # e.g., ``dateComponents`` are days without time zone
+        if times.dt.tz is None:
+            times = times.dt.tz_localize("UTC")
+
+        if start is not None:
+            mask &= times >= start
+
+        if end is not None:
+            mask &= times < end
+
+        if types is not None:
+            mask &= data_frame["type"].isin(types)
+
+        result = self._select_rows(data_frame, mask)
+
+        # grouped by type in the order of ``types`` like ``_extract_record_types``
+        if result is not None and types is not None:
+            positions = result["type"].astype(object).map({record_type: position for position, record_type in enumerate(types)})
+            result = result.iloc[np.argsort(positions.to_numpy(), kind="stable")].reset_index(drop=True)
+
+        return result
+
+    @staticmethod
+    def _select_rows(data_frame: pd.DataFrame, mask: pd.Series) -> pd.DataFrame:
+        """
+        Keeps the rows selected by ``mask`` and drops the categories they do not use, so the result has the same data
+        types as if only these rows were parsed.
+
+        Args:
+            data_frame (pd.DataFrame): Table to select from
+            mask (pd.Series): Selects rows of ``data_frame``
+
+        Returns:
+            pd.DataFrame: Selected rows or ``None`` if empty
+        """
+
+        result = data_frame[mask].reset_index(drop=True)
+
+        for column, dtype in result.dtypes.items():
+            if isinstance(dtype, pd.CategoricalDtype):
+                result[column] = result[column].cat.remove_unused_categories()
+
+        return None if result.empty else result
+
+    @staticmethod
+    def _select_children(data_frame: pd.DataFrame, mask: pd.Series, offset: int = 0) -> pd.DataFrame:
+        """
+        Keeps the rows of a nested table whose parents are selected by ``mask`` and renumbers their
+        ``constants.PARENT_ID_COLUMN`` to the positions of the parents after selecting them.
+
+        Args:
+            data_frame (pd.DataFrame): Nested table or ``None`` if empty
+            mask (pd.Series): Selects rows of the parent table
+            offset (int, optional): Is added to the new positions. Defaults to 0.
+
+        Returns:
+            pd.DataFrame: Selected rows or ``None`` if empty
+        """
+
+        if data_frame is None:
+            return None
+
+        mask = mask.to_numpy()
+        positions = np.cumsum(mask) - 1 + offset
+        parent_ids = data_frame[constants.PARENT_ID_COLUMN].to_numpy()
+
+        result = data_frame[mask[parent_ids]].reset_index(drop=True)
+        result[constants.PARENT_ID_COLUMN] = positions[result[constants.PARENT_ID_COLUMN].to_numpy()]
+
+        return None if result.empty else result
+
+    @staticmethod
+    def _to_utc(timestamp) -> pd.Timestamp:
+        """
+        Converts ``timestamp`` to a UTC ``pd.Timestamp``, naive values are taken as UTC.
+        """
+
+        timestamp = pd.Timestamp(timestamp)
+
+        return timestamp.tz_localize("UTC") if timestamp.tz is None else timestamp.tz_convert("UTC")
+
+    @staticmethod
+    def _shorten_workout_types(data_frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Shortens the workout types, e.g., "HKWorkoutActivityTypeRunning" to "running".
+
+        Args:
+            data_frame (pd.DataFrame): ``Workout``s
+
+        Returns:
+            pd.DataFrame: ``Workout``s with short workout types
+        """
+
+        data_frame[constants.WORKOUT_TYPE] = data_frame.apply(
+            lambda row: re.match(constants.WORKOUT_REGEX, row[constants.WORKOUT_TYPE]).group(1).lower(),
+            axis=1
+        )
+
+        return data_frame
+
+    def _store(self, element_type: str, data_frame: pd.DataFrame) -> None:
+        """
+        Post-processes an extracted ``DataFrame`` and caches it in the attribute of its ``element_type``.
+
+        Args:
+            element_type (str): One of ``constants.ELEMENT_TAGS`` or ``constants.CHILD_TABLES``
+            data_frame (pd.DataFrame): Extracted ``DataFrame`` or ``None`` if empty
+        """
+
+        if element_type in constants.CHILD_TABLES:
+            self._children[element_type] = data_frame
+
+        elif element_type == constants.WORKOUT_TAG:
+            if data_frame is not None:
+                data_frame = self._shorten_workout_types(data_frame)
+
+            self._workouts = data_frame
+            self._workout_types = set() if data_frame is None else set(data_frame[constants.WORKOUT_TYPE])
+
+        elif element_type == constants.EXPORT_DATE_TAG:
+            self._export_date = None if data_frame is None else data_frame["value"][0]
+
+        else:
+            setattr(self, self._ELEMENT_ATTRIBUTES[element_type], data_frame)
+
+        self._parsed.add(element_type)
+
+    def _load(self, element_types: set) -> None:
+        """
+        Extracts and caches all of ``element_types`` that are not parsed yet in one pass.
+        Nested tables are built together with their parent elements, which are parsed again if needed.
+
+        Args:
+            element_types (set): Each need to fit one of ``constants.ELEMENT_TAGS`` or ``constants.CHILD_TABLES``
+        """
+
+        missing = set(element_types) - self._parsed
+
+        if not missing:
+            return
+
+        # parents of nested tables are extracted again, so they are locked as well
+        with self._locked(missing | {constants.CHILD_TABLES[name][0] for name in missing & set(constants.CHILD_TABLES)}):
+
+            # another thread may have extracted some meanwhile
+            missing -= self._parsed
+
+            if self._cache is not None:
+                for element_type in [element_type for element_type in missing if element_type in self._cache]:
+                    with self.stats.measure(constants.STAGE_CACHE_LOAD, element_type) as measurement:
+                        data_frame = self._cache.load(element_type)
+                        measurement["rows"] = 0 if data_frame is None else len(data_frame)
+
+                    self._store(element_type, data_frame)
+
+                missing -= self._parsed
+
+            if missing:
+                child_tables = missing & set(constants.CHILD_TABLES)
+                missing = (missing - child_tables) | {constants.CHILD_TABLES[name][0] for name in child_tables}
+
+                if self._incremental_store is not None:
+                    extracted = self._extract_incremental(missing, child_tables)
+                else:
+                    extracted = self._extract_elements_of_types(missing, child_tables=child_tables)
+
+                for element_type, data_frame in extracted.items():
+                    if self._cache is not None:
+                        with self.stats.measure(constants.STAGE_CACHE_SAVE, element_type) as measurement:
+                            self._cache.save(element_type, data_frame)
+                            measurement["rows"] = 0 if data_frame is None else len(data_frame)
+
+                    self._store(element_type, data_frame)
+
+    def extract_all(self, tables: Iterable[str] = None) -> None:
+        """
+        Reads the document once and fills the caches of all element types and nested tables. Afterwards, each
+        ``extract_*`` method and ``get_export_date`` return without parsing again.
+
+        Args:
+            tables (Iterable[str], optional): Only these element types and nested tables, e.g., to read a subset in
+                a single pass as well. Defaults to None, i.e., all.
+
+        Raises:
+            ValueError: If ``tables`` contains unknown names
+        """
+
+        all_tables = constants.ELEMENT_TAGS | set(constants.CHILD_TABLES)
+        tables = all_tables if tables is None else set(tables)
+
+        if not tables <= all_tables:
+            raise ValueError(f"'tables' need to be in: {sorted(all_tables)}\n\tGiven: {sorted(tables - all_tables)}")
+
+        self._load(tables)
+
+    def _iter_chunks(self, element_type: str, chunk_size: int, types: list = None) -> Iterator[pd.DataFrame]:
+        """
+        Yields the typed ``DataFrame`` of ``element_type`` in chunks. Tables in memory are sliced, otherwise the XML is
+        streamed, also if ``streaming`` is not set. Do not use by your own!
+
+        Args:
+            element_type (str): One of ``constants.ELEMENT_TAGS``
+            chunk_size (int): Number of rows per chunk, the last one may be smaller
+            types (list, optional): Only ``Record``s of these types. Defaults to None.
+
+        Raises:
+            ValueError: If ``chunk_size`` is not positive
+
+        Yields:
+            pd.DataFrame: Chunk with the data types of ``_fix_data_types``, applied per chunk. Categorical columns only
+                know the categories of their chunk
+        """
+
+        if chunk_size < 1:
+            raise ValueError(f"'chunk_size' need to be positive\n\tGiven: {chunk_size}")
+
+        if element_type in self._parsed:
+            data_frame = getattr(self, self._ELEMENT_ATTRIBUTES[element_type])
+
+            if data_frame is not None and types is not None:
+                data_frame = data_frame[data_frame["type"].isin(types)].reset_index(drop=True)
+
+            for start in range(0, 0 if data_frame is None else len(data_frame), chunk_size):
+                yield data_frame.iloc[start:start + chunk_size].reset_index(drop=True)
+
+            return
+
+        predicate = None
+        ranges = None
+
+        if types is not None:
+            if self._tree is None and not self.get_record_index().empty:
+                runs = self._record_index[self._record_index["type"].isin(types)]
+                ranges = list(zip(runs["start"], runs["end"]))
+
+            else:
+                predicate = lambda attributes: attributes.get("type") in types  # noqa: E731
+
+        elements = self._iter_elements({element_type}, ranges, stream=True)
+
+        for data_frame in streaming.iter_chunks(elements, element_type, chunk_size, self._compact, predicate):
+            data_frame = self._fix_data_types(data_frame, element_type)
+
+            if element_type == constants.WORKOUT_TAG:
+                data_frame = self._shorten_workout_types(data_frame)
+
+            yield data_frame
+
+    def iter_workouts(self, chunk_size: int = constants.CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """
+        Yields ``Workout`` elements in chunks, see ``iter_records``. Shortens the workout types.
+
+        Args:
+            chunk_size (int, optional): Number of rows per chunk. Defaults to constants.CHUNK_SIZE.
+
+        Yields:
+            pd.DataFrame: Chunk of type ``Workout``
+        """
+
+        yield from self._iter_chunks(constants.WORKOUT_TAG, chunk_size)
+
+    def extract_workouts(self, start=None, end=None) -> (pd.DataFrame, set):
+        """
+        Returns ``Workout`` elements and ``set`` of all workout existing types. Shortens the workout types.
+
+        Args:
+            start (optional): Only ``Workout``s with ``startDate`` from here on, anything ``pd.Timestamp`` understands.
+                Naive values are taken as UTC. Defaults to None, i.e., unbounded.
+            end (optional): Only ``Workout``s with ``startDate`` before this, see ``start``. Defaults to None.
+
+        Returns:
+            (pd.DataFrame, set): of type ``Workout`` or ``None`` if empty and set of available workout types
+        """
+
+        if start is not None or end is not None:
+            workouts = self._extract_time_range(constants.WORKOUT_TAG, start, end)
+            return workouts, set() if workouts is None else set(workouts[constants.WORKOUT_TYPE])
+
+        # increase performace by do not parse again.
+        self._load({constants.WORKOUT_TAG})
+
+        return self._workouts, self._workout_types
+
+    def extract_me(self) -> pd.DataFrame:
+        """
+        Returns ``Me`` elements.
+
+        Returns:
+            pd.DataFrame: of type ``Me`` or ``None`` if empty
+        """
+
+        # increase performace by do not parse again.
+        self._load({constants.ME_TAG})
+
+        return self._me
+
+    def get_record_index(self) -> pd.DataFrame:
+        """
+        Returns the index of ``Record`` types in ``export.xml``. Is built on first use by scanning the raw bytes,
+        without parsing the XML, and persisted in the cache if ``cache_path`` is given.
+
+        Returns:
+            pd.DataFrame: One row per contiguous run of a ``type`` with its byte offsets ``start`` and ``end`` and the
+                ``count`` of records. Is empty if the document is not formatted as Apple exports it
+        """
+
+        if self._record_index is not None:
+            return self._record_index
+
+        with self._locked({constants.RECORD_INDEX_TABLE}):
+            if self._record_index is None:
+                if self._cache is not None and constants.RECORD_INDEX_TABLE in self._cache:
+                    record_index = self._cache.load(constants.RECORD_INDEX_TABLE)
+
+                    if record_index is None:
+                        record_index = pd.DataFrame(columns=INDEX_COLUMNS)
+
+                else:
+                    with self.stats.measure(constants.STAGE_RECORD_INDEX, constants.RECORD_TAG) as measurement, self._open_xml() as source:
+                        record_index = build_record_index(source)
+                        measurement["rows"] = len(record_index)
+
+                    if self._cache is not None:
+                        self._cache.save(constants.RECORD_INDEX_TABLE, record_index)
+
+                self._record_index = record_index
+
+        return self._record_index
+
+    def iter_records(self, chunk_size: int = constants.CHUNK_SIZE, types: list = None) -> Iterator[pd.DataFrame]:
+        """
+        Yields ``Record`` elements in chunks of ``chunk_size`` rows, with the same data types as ``extract_records``.
+        The XML is streamed and only the current chunk is held in memory, so aggregations and writers can process
+        exports larger than the memory. Nothing is cached. All chunks have the same data types, only the categories
+        of categorical columns are the ones of their chunk.
+
+        Args:
+            chunk_size (int, optional): Number of rows per chunk, the last one may be smaller.
+                Defaults to constants.CHUNK_SIZE.
+            types (list, optional): Only ``Record``s of these types, see ``extract_records``. Defaults to None.
+
+        Yields:
+            pd.DataFrame: Chunk of type ``Record`` in document order
+        """
+
+        yield from self._iter_chunks(constants.RECORD_TAG, chunk_size, None if types is None else list(types))
+
+    def extract_records(self, types: list = None, start=None, end=None) -> pd.DataFrame:
+        """
+        Returns ``Record`` elements.
+
+        Args:
+            types (list, optional): Only return ``Record``s of these types, e.g., ``"HKQuantityTypeIdentifierHeartRate"``.
+                Only these are parsed and materialized, later calls seek directly to the data of other types.
+                Defaults to None, i.e., all ``Record``s.
+            start (optional): Only ``Record``s with ``startDate`` from here on, anything ``pd.Timestamp`` understands.
+                Naive values are taken as UTC. Elements out of range are skipped while parsing. Defaults to None.
+            end (optional): Only ``Record``s with ``startDate`` before this, see ``start``. Defaults to None.
+
+        Returns:
+            pd.DataFrame: of type ``Record`` or ``None`` if empty. If ``types`` are given, grouped by type in their order
+        """
+
+        if start is not None or end is not None:
+            return self._extract_time_range(constants.RECORD_TAG, start, end, None if types is None else list(types))
+
+        if types is not None:
+            return self._extract_record_types(list(types))
+
+        # increase performace by do not parse again.
+        self._load({constants.RECORD_TAG})
+
+        return self._records
+
+    def iter_correlations(self, chunk_size: int = constants.CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """
+        Yields ``Correlation`` elements in chunks, see ``iter_records``.
+
+        Args:
+            chunk_size (int, optional): Number of rows per chunk. Defaults to constants.CHUNK_SIZE.
+
+        Yields:
+            pd.DataFrame: Chunk of type ``Correlation``
+        """
+
+        yield from self._iter_chunks(constants.CORRELATION_TAG, chunk_size)
+
+    def extract_correlations(self) -> pd.DataFrame:
+        """
+        Returns ``Correlation`` elements.
+
+        Returns:
+            pd.DataFrame: of type ``Correlation`` or ``None`` if empty
+        """
+
+        # increase performace by do not parse again.
+        self._load({constants.CORRELATION_TAG})
+
+        return self._correlations
+
+    def iter_activity_summaries(self, chunk_size: int = constants.CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """
+        Yields ``ActivitySummary`` elements in chunks, see ``iter_records``.
+
+        Args:
+            chunk_size (int, optional): Number of rows per chunk. Defaults to constants.CHUNK_SIZE.
+
+        Yields:
+            pd.DataFrame: Chunk of type ``ActivitySummary``
+        """
+
+        yield from self._iter_chunks(constants.ACTIVITY_SUMMARY_TAG, chunk_size)
+
+    def extract_activity_summaries(self, start=None, end=None) -> pd.DataFrame:
+        """
+        Returns ``ActivitySummary`` elements.
+
+        Args:
+            start (optional): Only ``ActivitySummary``s with ``dateComponents`` from here on, anything ``pd.Timestamp``
+                understands. Defaults to None, i.e., unbounded.
+            end (optional): Only ``ActivitySummary``s with ``dateComponents`` before this, see ``start``. Defaults to None.
+
+        Returns:
+            pd.DataFrame: of type ``ActivitySummary`` or ``None`` if empty
+        """
+
+        if start is not None or end is not None:
+            return self._extract_time_range(constants.ACTIVITY_SUMMARY_TAG, start, end)
+
+        # increase performace by do not parse again.
+        self._load({constants.ACTIVITY_SUMMARY_TAG})
+
+        return self._activity_summaries
+
+    def iter_clinical_records(self, chunk_size: int = constants.CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """
+        Yields ``ClinicalRecord`` elements in chunks, see ``iter_records``.
+
+        Args:
+            chunk_size (int, optional): Number of rows per chunk. Defaults to constants.CHUNK_SIZE.
+
+        Yields:
+            pd.DataFrame: Chunk of type ``ClinicalRecord``
+        """
+
+        yield from self._iter_chunks(constants.CLINICAL_RECORD_TAG, chunk_size)
+
+    def extract_clinical_records(self) -> pd.DataFrame:
+        """
+        Returns ``ClinicalRecord`` elements.
+
+        Returns:
+            pd.DataFrame: of type ``ClinicalRecord`` or ``None`` if empty
+        """
+
+        # increase performace by do not parse again.
+        self._load({constants.CLINICAL_RECORD_TAG})
+
+        return self._clinical_records
+
+    def extract_record_metadata_entries(self) -> pd.DataFrame:
+        """
+        Returns ``MetadataEntry`` elements of ``Record``s.
+        ``constants.PARENT_ID_COLUMN`` is the row of the parent in ``extract_records``.
+
+        Returns:
+            pd.DataFrame: of table ``constants.RECORD_METADATA_ENTRY_TABLE`` or ``None`` if empty
+        """
+
+        # increase performace by do not parse again.
+        self._load({constants.RECORD_METADATA_ENTRY_TABLE})
+
+        return self._children[constants.RECORD_METADATA_ENTRY_TABLE]
+
+    def extract_instantaneous_beats_per_minute(self) -> pd.DataFrame:
+        """
+        Returns ``InstantaneousBeatsPerMinute`` elements of heart rate variability ``Record``s.
+        ``constants.PARENT_ID_COLUMN`` is the row of the parent in ``extract_records``.
+
+        Returns:
+            pd.DataFrame: of table ``constants.INSTANTANEOUS_BEATS_PER_MINUTE_TABLE`` or ``None`` if empty
+        """
+
+        # increase performace by do not parse again.
+        self._load({constants.INSTANTANEOUS_BEATS_PER_MINUTE_TABLE})
+
+        return self._children[constants.INSTANTANEOUS_BEATS_PER_MINUTE_TABLE]
+
+    def extract_correlation_metadata_entries(self) -> pd.DataFrame:
+        """
+        Returns ``MetadataEntry`` elements of ``Correlation``s.
+        ``constants.PARENT_ID_COLUMN`` is the row of the parent in ``extract_correlations``.
+
+        Returns:
+            pd.DataFrame: of table ``constants.CORRELATION_METADATA_ENTRY_TABLE`` or ``None`` if empty
+        """
+
+        # increase performace by do not parse again.
+        self._load({constants.CORRELATION_METADATA_ENTRY_TABLE})
+
+        return self._children[constants.CORRELATION_METADATA_ENTRY_TABLE]
+
+    def extract_correlation_records(self) -> pd.DataFrame:
+        """
+        Returns ``Record`` elements of ``Correlation``s, e.g., systolic and diastolic blood pressure.
+        ``constants.PARENT_ID_COLUMN`` is the row of the parent in ``extract_correlations``.
+
+        Returns:
+            pd.DataFrame: of table ``constants.CORRELATION_RECORD_TABLE`` or ``None`` if empty
+        """
+
+        # increase performace by do not parse again.
+        self._load({constants.CORRELATION_RECORD_TABLE})
+
+        return self._children[constants.CORRELATION_RECORD_TABLE]
+
+    def extract_workout_metadata_entries(self) -> pd.DataFrame:
+        """
+        Returns ``MetadataEntry`` elements of ``Workout``s.
+        ``constants.PARENT_ID_COLUMN`` is the row of the parent in ``extract_workouts``.
+
+        Returns:
+            pd.DataFrame: of table ``constants.WORKOUT_METADATA_ENTRY_TABLE`` or ``None`` if empty
+        """
+
+        # increase performace by do not parse again.
+        self._load({constants.WORKOUT_METADATA_ENTRY_TABLE})
+
+        return self._children[constants.WORKOUT_METADATA_ENTRY_TABLE]
+
+    def extract_workout_events(self) -> pd.DataFrame:
+        """
+        Returns ``WorkoutEvent`` elements of ``Workout``s, e.g., pauses.
+        ``constants.PARENT_ID_COLUMN`` is the row of the parent in ``extract_workouts``.
+
+        Returns:
+            pd.DataFrame: of table ``constants.WORKOUT_EVENT_TABLE`` or ``None`` if empty
+        """
+
+        # increase performace by do not parse again.
+        self._load({constants.WORKOUT_EVENT_TABLE})
+
+        return self._children[constants.WORKOUT_EVENT_TABLE]
+
+    def extract_workout_routes(self) -> pd.DataFrame:
+        """
+        Returns ``WorkoutRoute`` elements of ``Workout``s. The ``path`` of their GPX file is merged into their rows.
+        ``constants.PARENT_ID_COLUMN`` is the row of the parent in ``extract_workouts``.
+
+        Returns:
+            pd.DataFrame: of table ``constants.WORKOUT_ROUTE_TABLE`` or ``None`` if empty
+        """
+
+        # increase performace by do not parse again.
+        self._load({constants.WORKOUT_ROUTE_TABLE})
+
+        return self._children[constants.WORKOUT_ROUTE_TABLE]
+
+    def get_export_date(self) -> pd.Timestamp:
+        """
+        Returns the ``pd.Timestamp`` of exporting.
+
+        Returns:
+            pd.Timestamp: Export timestamp
+        """
+
+        # increase performace by do not parse again.
+        self._load({constants.EXPORT_DATE_TAG})
+
+        return self._export_date
+
+    def _get_database_path(self, database_path: str = None) -> str:
+        """
+        Returns ``database_path`` or, if it is ``None``, ``constants.SQLITE_NAME`` in the cache directory of the data
+        dump. Do not use by your own!
+
+        Raises:
+            ValueError: If neither ``database_path`` nor ``cache_path`` is given
+        """
+
+        if database_path is not None:
+            return database_path
+
+        if self._cache is None:
+            raise ValueError("The SQLite store needs a 'database_path' or the 'cache_path' of the parser")
+
+        return os.path.join(self._cache.directory, constants.SQLITE_NAME)
+
+    def _get_store(self, database_path: str = None) -> SQLiteStore:
+        """
+        Returns the SQLite store at ``database_path`` and writes it first if it does not exist. Do not use by your own!
+
+        Args:
+            database_path (str, optional): Path of the database. Defaults to None, i.e., ``constants.SQLITE_NAME`` in
+                the cache directory of the data dump.
+
+        Raises:
+            ValueError: If neither ``database_path`` nor ``cache_path`` is given
+
+        Returns:
+            SQLiteStore: Existing store
+        """
+
+        store = SQLiteStore(self._get_database_path(database_path))
+
+        if not store.exists():
+            with self._locked({store.path}):
+
+                # another thread may have written it meanwhile
+                if not store.exists():
+                    self.export_to_sqlite(store.path)
+
+        return store
+
+    def export_to_sqlite(self, database_path: str = None) -> str:
+        """
+        Extracts all tables and bulk-loads them into a SQLite database, see ``store.SQLiteStore``. An existing database
+        is replaced. ``query`` and ``query_records`` use it afterwards without touching the XML.
+
+        Args:
+            database_path (str, optional): Path of the database. Defaults to None, i.e., ``constants.SQLITE_NAME`` in
+                the cache directory of the data dump, which requires ``cache_path``.
+
+        Raises:
+            ValueError: If neither ``database_path`` nor ``cache_path`` is given
+
+        Returns:
+            str: Path of the database
+        """
+
+        database_path = self._get_database_path(database_path)
+
+        with self._locked({database_path}):
+            self.extract_all()
+
+            tables = {element_type: getattr(self, attribute) for element_type, attribute in self._ELEMENT_ATTRIBUTES.items()}
+            tables.update(self._children)
+            tables[constants.EXPORT_DATE_TAG] = None if self._export_date is None else pd.DataFrame({"value": [self._export_date]})
+
+            SQLiteStore(database_path).write(tables)
+
+        return database_path
+
+    def query(self, sql: str, parameters: tuple = None, database_path: str = None) -> pd.DataFrame:
+        """
+        Runs a SQL query against the SQLite store of the data dump, which is written on first use. Tables are named
+        like the element types and nested tables, e.g., ``Record`` or ``WorkoutEvent``.
+
+        Args:
+            sql (str): Query, use ``?`` placeholders for values
+            parameters (tuple, optional): Values of the placeholders. Defaults to None.
+            database_path (str, optional): Path of the database, see ``export_to_sqlite``. An existing database is
+                used as it is. Defaults to None.
+
+        Returns:
+            pd.DataFrame: Result of the query
+        """
+
+        return self._get_store(database_path).query(sql, parameters)
+
+    def query_records(
+        self,
+        types: list = None,
+        source_names: list = None,
+        start=None,
+        end=None,
+        frequency: str = None,
+        database_path: str = None
+    ) -> pd.DataFrame:
+        """
+        Returns ``Record``s filtered and optionally aggregated by the SQLite store of the data dump, which is written
+        on first use. Only the matching rows are loaded, e.g., the mean resting heart rate per month of a source:
+
+            parser.query_records(["HKQuantityTypeIdentifierRestingHeartRate"], ["Apple Watch"], frequency="monthly")
+
+        Args:
+            types (list, optional): Only ``Record``s of these types. Defaults to None, i.e., all.
+            source_names (list, optional): Only ``Record``s of these ``sourceName``s. Defaults to None, i.e., all.
+            start (optional): Only ``Record``s with ``startDate`` from here on, anything ``pd.Timestamp`` understands.
+                Naive values are taken as UTC. Defaults to None, i.e., unbounded.
+            end (optional): Only ``Record``s with ``startDate`` before this, see ``start``. Defaults to None.
+            frequency (str, optional): One of ``constants.SQLITE_FREQUENCIES`` to aggregate numeric ``value``s per
+                ``type``, ``unit`` and local period. Defaults to None, i.e., the ``Record``s themselves.
+            database_path (str, optional): Path of the database, see ``query``. Defaults to None.
+
+        Returns:
+            pd.DataFrame: see ``store.SQLiteStore.query_records`` or ``None`` if empty
+        """
+
+        return self._get_store(database_path).query_records(types, source_names, start, end, frequency)
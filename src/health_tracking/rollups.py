@@ -0,0 +1,197 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import constants
+from .cache import TableCache
+from .compact import concat_tables
+from .parser import AppleHealthParser
+from .streaming import DATE_FILTER_MARGIN
+
+
+def _local_start_dates(records: pd.DataFrame) -> pd.Series:
+    """
+    Returns the ``startDate``s of ``records`` as naive local wall time, i.e., UTC shifted by their original offsets.
+    """
+
+    offsets = records[f"startDate{constants.OFFSET_COLUMN_SUFFIX}"].to_numpy(dtype=np.int64)
+    utc = records["startDate"].dt.tz_convert(None)
+
+    return utc + pd.to_timedelta(offsets, unit="min")
+
+
+def _aggregate(data_frame: pd.DataFrame, aggregations: dict) -> pd.DataFrame:
+    """
+    Groups ``data_frame`` by ``constants.ROLLUP_KEY_COLUMNS`` and adds the ``mean`` of the aggregated ``sum`` and ``count``.
+    """
+
+    result = data_frame.groupby(constants.ROLLUP_KEY_COLUMNS, observed=True, dropna=False, sort=True).agg(**aggregations)
+    result["mean"] = result["sum"] / result["count"]
+
+    return result[constants.ROLLUP_AGGREGATIONS].reset_index()
+
+
+def compute_hourly_rollup(records: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aggregates the values of quantity ``Record``s per ``type``, ``unit`` and local hour of their ``startDate``.
+    Records of other types, e.g., categories of sleep analysis, are ignored.
+
+    Args:
+        records (pd.DataFrame): ``Record``s as extracted by ``AppleHealthParser.extract_records``
+
+    Returns:
+        pd.DataFrame: One row per ``constants.ROLLUP_KEY_COLUMNS`` with the ``constants.ROLLUP_AGGREGATIONS`` of ``value``
+    """
+
+    # typed like the rollups of quantities, so it can be coarsened and concatenated, e.g., of data dumps without any
+    if records is None or records.empty:
+        return pd.DataFrame({
+            "type": pd.Series(dtype="category"),
+            "unit": pd.Series(dtype="category"),
+            constants.ROLLUP_COLUMN_PERIOD: pd.Series(dtype="datetime64[ns]"),
+            **{aggregation: pd.Series(dtype=np.int64 if aggregation == "count" else np.float64) for aggregation in constants.ROLLUP_AGGREGATIONS}
+        })
+
+    quantities = records[records["type"].astype(str).str.startswith(constants.QUANTITY_TYPE_PREFIX)]
+    values = pd.to_numeric(quantities["value"], errors="coerce").astype(np.float64)
+
+    data_frame = pd.DataFrame({
+        "type": quantities["type"],
+        "unit": quantities["unit"] if "unit" in quantities else None,
+        constants.ROLLUP_COLUMN_PERIOD: _local_start_dates(quantities).dt.floor("h"),
+        "value": values
+    })[values.notna()]
+
+    return _aggregate(data_frame, {
+        "sum": ("value", "sum"),
+        "min": ("value", "min"),
+        "max": ("value", "max"),
+        "count": ("value", "count")
+    })
+
+
+def coarsen_rollup(rollup: pd.DataFrame, frequency: str) -> pd.DataFrame:
+    """
+    Combines the rows of a finer rollup, e.g., hourly to daily, without touching the ``Record``s again.
+
+    Args:
+        rollup (pd.DataFrame): Rollup as returned by ``compute_hourly_rollup``
+        frequency (str): ``constants.ROLLUP_DAILY`` or ``constants.ROLLUP_WEEKLY``
+
+    Raises:
+        ValueError: If wrong ``frequency`` is given
+
+    Returns:
+        pd.DataFrame: Rollup of ``frequency``
+    """
+
+    days = rollup[constants.ROLLUP_COLUMN_PERIOD].dt.floor("D")
+
+    if frequency == constants.ROLLUP_DAILY:
+        periods = days
+
+    elif frequency == constants.ROLLUP_WEEKLY:
+        periods = days - pd.to_timedelta(days.dt.dayofweek, unit="D")
+
+    else:
+        raise ValueError(f"'frequency' need to be one of: {[constants.ROLLUP_DAILY, constants.ROLLUP_WEEKLY]}\n\tGiven: {frequency}")
+
+    return _aggregate(rollup.assign(**{constants.ROLLUP_COLUMN_PERIOD: periods}), {
+        "sum": ("sum", "sum"),
+        "min": ("min", "min"),
+        "max": ("max", "max"),
+        "count": ("count", "sum")
+    })
+
+
+class Rollups(object):
+    """
+    Hourly, daily and weekly aggregates of the quantity ``Record``s of a Apple Health App dump data, see
+    ``constants.ROLLUP_AGGREGATIONS``. Periods are local time of the records.
+    The rollups are persisted in ``constants.ROLLUP_DIR_NAME`` below ``cache_path`` and updated incrementally: only
+    records from one day before the last stored hour on are read from a new data dump. Older records that are added
+    to later dumps, e.g., synchronized late, are therefore not included; remove the directory to rebuild everything.
+
+    Args:
+        zip_dump_path (str, optional): Path to the zipped data dump. Defaults to constants.ZIP_PATH.
+        unzip_path (str, optional): Path to the unzipped data dump. Defaults to constants.UNZIP_PATH.
+        force_unzip (bool, optional): Flag to force unzipping the data again. Can be useful for new data. Defaults to False.
+        cache_path (str, optional): Directory to persist the rollups. Defaults to constants.CACHE_PATH.
+        update (bool, optional): Flag to add the records of the data dump. Otherwise, only the stored rollups are
+            loaded and the data dump is not read at all. Defaults to True.
+    """
+
+    def __init__(
+        self,
+        zip_dump_path: str = constants.ZIP_PATH,
+        unzip_path: str = constants.UNZIP_PATH,
+        force_unzip: bool = False,
+        cache_path: str = constants.CACHE_PATH,
+        update: bool = True
+    ) -> None:
+
+        self._zip_dump_path = zip_dump_path
+        self._unzip_path = unzip_path
+        self._force_unzip = force_unzip
+        self._cache = TableCache(os.path.join(cache_path, constants.ROLLUP_DIR_NAME))
+
+        for frequency in constants.ROLLUP_FREQUENCIES:
+            rollup = self._cache.load(frequency) if frequency in self._cache else None
+            setattr(self, frequency, compute_hourly_rollup(None) if rollup is None else rollup)
+
+        if update:
+            self.update()
+
+    def update(self) -> None:
+        """
+        Adds the records of the data dump that are newer than the stored rollups and persists the result.
+        The last stored day is recomputed, it may have been incomplete.
+        """
+
+        parser = AppleHealthParser(self._zip_dump_path, self._unzip_path, self._force_unzip)
+
+        if self.hourly.empty:
+            hourly = compute_hourly_rollup(parser.extract_records())
+
+        else:
+            boundary = self.hourly[constants.ROLLUP_COLUMN_PERIOD].max() - pd.Timedelta(days=1)
+
+            # local time differs at most by ``DATE_FILTER_MARGIN`` from UTC
+            records = parser.extract_records(start=boundary - DATE_FILTER_MARGIN)
+
+            if records is not None:
+                records = records[_local_start_dates(records) >= boundary]
+
+            parts = [
+                self.hourly[self.hourly[constants.ROLLUP_COLUMN_PERIOD] < boundary],
+                compute_hourly_rollup(records)
+            ]
+            hourly = concat_tables([part for part in parts if not part.empty] or parts[:1])
+            hourly = hourly.sort_values(constants.ROLLUP_KEY_COLUMNS, ignore_index=True)
+
+        self.hourly = hourly
+        self.daily = coarsen_rollup(hourly, constants.ROLLUP_DAILY)
+        self.weekly = coarsen_rollup(hourly, constants.ROLLUP_WEEKLY)
+
+        for frequency in constants.ROLLUP_FREQUENCIES:
+            self._cache.save(frequency, getattr(self, frequency))
+
+    def __getitem__(self, frequency: str) -> pd.DataFrame:
+        """
+        Get the rollups with the help of subscriptions.
+
+        Args:
+            frequency (str): One of ``constants.ROLLUP_FREQUENCIES``
+
+        Raises:
+            ValueError: If a incorrect ``frequency`` is give
+
+        Returns:
+            pd.DataFrame: Rollup of ``frequency``, sorted by ``constants.ROLLUP_KEY_COLUMNS``
+        """
+
+        if frequency not in constants.ROLLUP_FREQUENCIES:
+            raise ValueError(f"'frequency' need to be one of: {constants.ROLLUP_FREQUENCIES}\n\tGiven: {frequency}")
+
+        return getattr(self, frequency)
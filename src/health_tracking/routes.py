@@ -0,0 +1,212 @@
+import os
+import re
+import zipfile
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from . import constants
+from .parser import AppleHealthParser
+
+# one point of a track, 28 bytes instead of a Python object per value. Times are UTC
+ROUTE_POINT_DTYPE = np.dtype([
+    ("time", "datetime64[ns]"),
+    ("latitude", np.float64),
+    ("longitude", np.float64),
+    ("elevation", np.float32)
+])
+
+# Apple writes the attributes of ``trkpt`` as ``lon``, ``lat`` and the GPX schema fixes the order of ``ele`` and ``time``
+TRACK_POINT_REGEX = re.compile(
+    rb'<trkpt\s+(?:lon="([^"]*)"\s+lat="([^"]*)"|lat="([^"]*)"\s+lon="([^"]*)")\s*>\s*'
+    rb'(?:<ele>([^<]*)</ele>\s*)?<time>([^<]*?)Z?</time>'
+)
+
+# routes parsed per task of the process pool
+ROUTES_PER_TASK = 16
+
+
+def parse_gpx(content: bytes) -> np.ndarray:
+    """
+    Parses the track points of a GPX file as Apple exports them, e.g., ``workout-routes/route_2019-06-01_7.12am.gpx``.
+    The values are matched on the raw bytes and converted to numbers by numpy at once.
+
+    Args:
+        content (bytes): Content of the GPX file
+
+    Raises:
+        ValueError: If a track point does not match ``TRACK_POINT_REGEX``
+
+    Returns:
+        np.ndarray: Track points in file order with ``ROUTE_POINT_DTYPE``, a missing elevation is ``NaN``
+    """
+
+    matches = TRACK_POINT_REGEX.findall(content)
+
+    if len(matches) != content.count(b"<trkpt"):
+        raise ValueError("GPX track points are not formatted as Apple exports them")
+
+    result = np.empty(len(matches), dtype=ROUTE_POINT_DTYPE)
+
+    if not matches:
+        return result
+
+    lon_first, lat_first, lat_second, lon_second, elevations, times = [np.array(column) for column in zip(*matches)]
+
+    result["longitude"] = np.where(lon_first != b"", lon_first, lon_second).astype(np.float64)
+    result["latitude"] = np.where(lat_first != b"", lat_first, lat_second).astype(np.float64)
+    result["elevation"] = np.where(elevations != b"", elevations, b"nan").astype(np.float32)
+    result["time"] = times.astype("datetime64[ns]")
+
+    return result
+
+
+def load_routes(source: str, paths: list, from_zip: bool = False) -> list:
+    """
+    Loads and parses GPX files. Is executed by the worker processes.
+
+    Args:
+        source (str): Directory of the unzipped data dump or path of the zipped data dump
+        paths (list): Paths of the GPX files relative to the data dump, as stored in ``constants.WORKOUT_ROUTE_PATH``
+        from_zip (bool, optional): Flag to read the files out of the zipped data dump ``source``. Defaults to False.
+
+    Returns:
+        list: Track of each of ``paths``, see ``parse_gpx``. Missing files give empty tracks
+    """
+
+    result = []
+
+    with zipfile.ZipFile(source) if from_zip else contextlib.nullcontext() as zipped_export:
+        for path in paths:
+            relative_path = path.strip("/")
+
+            try:
+                if from_zip:
+                    content = zipped_export.read(f"{constants.EXPORT_DIR_NAME}/{relative_path}")
+
+                else:
+                    with open(os.path.join(source, *relative_path.split("/")), "rb") as file:
+                        content = file.read()
+
+            except (KeyError, FileNotFoundError):
+                content = b""
+
+            result.append(parse_gpx(content))
+
+    return result
+
+
+class WorkoutRoutes(object):
+    """
+    Loads the GPX files of ``WorkoutRoute``s in a process pool and gives access to their tracks.
+    All track points are kept in one numpy array with ``ROUTE_POINT_DTYPE``, each track is a view into it.
+
+    Args:
+        zip_dump_path (str, optional): Path to the zipped data dump. Defaults to constants.ZIP_PATH.
+        unzip_path (str, optional): Path to the unzipped data dump. Defaults to constants.UNZIP_PATH.
+        force_unzip (bool, optional): Flag to force unzipping the data again. Can be useful for new data. Defaults to False.
+        n_jobs (int, optional): Number of processes that parse GPX files. Defaults to None, i.e., one per CPU.
+    """
+
+    def __init__(
+        self,
+        zip_dump_path: str = constants.ZIP_PATH,
+        unzip_path: str = constants.UNZIP_PATH,
+        force_unzip: bool = False,
+        n_jobs: int = None
+    ) -> None:
+
+        self._parser = AppleHealthParser(zip_dump_path, unzip_path, force_unzip)
+        workouts, _ = self._parser.extract_workouts()
+        routes = self._parser.extract_workout_routes()
+
+        if routes is None:
+            routes = pd.DataFrame(columns=[constants.PARENT_ID_COLUMN, constants.WORKOUT_ROUTE_PATH])
+
+        # link each route to its workout
+        routes = routes.copy()
+        parent_ids = routes[constants.PARENT_ID_COLUMN].to_numpy(dtype=np.int64)
+        routes[constants.WORKOUT_TYPE] = [] if workouts is None else workouts[constants.WORKOUT_TYPE].to_numpy()[parent_ids]
+
+        if self._parser._read_from_zip:
+            source, from_zip = self._parser._zip_dump_path, True
+
+        else:
+            source, from_zip = os.path.dirname(self._parser._xml_path), False
+
+        paths = routes[constants.WORKOUT_ROUTE_PATH].tolist()
+        batches = [paths[start:start + ROUTES_PER_TASK] for start in range(0, len(paths), ROUTES_PER_TASK)]
+
+        if n_jobs == 1 or len(batches) <= 1:
+            tracks = [track for batch in batches for track in load_routes(source, batch, from_zip)]
+
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                tracks = [
+                    track
+                    for batch_tracks in executor.map(load_routes, *zip(*[(source, batch, from_zip) for batch in batches]))
+                    for track in batch_tracks
+                ]
+
+        lengths = np.array([len(track) for track in tracks], dtype=np.int64)
+        self._offsets = np.concatenate([[0], np.cumsum(lengths)])
+        self.points = np.concatenate(tracks) if tracks else np.empty(0, dtype=ROUTE_POINT_DTYPE)
+
+        routes[constants.ROUTE_COLUMN_POINTS] = lengths
+        self.routes = routes.reset_index(drop=True)
+
+    def __len__(self) -> int:
+        return len(self.routes)
+
+    def __getitem__(self, route: int) -> np.ndarray:
+        """
+        Get the track of a route with the help of subscriptions.
+
+        Args:
+            route (int): Row of the route in ``routes``
+
+        Raises:
+            IndexError: If ``route`` does not exist
+
+        Returns:
+            np.ndarray: Track points with ``ROUTE_POINT_DTYPE``, a view into ``points``
+        """
+
+        if not -len(self) <= route < len(self):
+            raise IndexError(f"'route' need to be in range of {len(self)} routes\n\tGiven: {route}")
+
+        route %= len(self)
+
+        return self.points[self._offsets[route]:self._offsets[route + 1]]
+
+    def get_workout_tracks(self, workout: int) -> list:
+        """
+        Returns the tracks of a workout, usually one or none.
+
+        Args:
+            workout (int): Row of the workout in ``AppleHealthParser.extract_workouts``
+
+        Returns:
+            list: Track points of each route of ``workout``, see ``__getitem__``
+        """
+
+        return [self[route] for route in np.flatnonzero(self.routes[constants.PARENT_ID_COLUMN].to_numpy() == workout)]
+
+    def to_data_frame(self) -> pd.DataFrame:
+        """
+        Returns all track points as ``DataFrame``, e.g., to aggregate pace or elevation per workout with ``groupby``.
+
+        Returns:
+            pd.DataFrame: Columns of ``ROUTE_POINT_DTYPE`` with ``time`` as UTC, the row of the route in ``routes`` and
+                the row of its workout in ``constants.PARENT_ID_COLUMN``
+        """
+
+        route_ids = np.repeat(np.arange(len(self)), np.diff(self._offsets))
+        result = pd.DataFrame({name: self.points[name] for name in ROUTE_POINT_DTYPE.names})
+        result["time"] = result["time"].dt.tz_localize("UTC")
+        result[constants.ROUTE_COLUMN_ID] = route_ids
+        result[constants.PARENT_ID_COLUMN] = self.routes[constants.PARENT_ID_COLUMN].to_numpy(dtype=np.int64)[route_ids]
+
+        return result
@@ -0,0 +1,132 @@
+import sys
+import time
+import logging
+import threading
+import contextlib
+from typing import Callable, Iterator
+
+import pandas as pd
+
+from . import constants
+
+try:
+    import resource
+
+except ImportError:  # e.g., on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def peak_rss_mib() -> float:
+    """
+    Returns the peak resident set size of the current process in MiB.
+
+    Returns:
+        float: Peak memory so far or ``None`` if the platform does not report it
+    """
+
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # kibibytes on Linux, bytes on macOS
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+class ParseStats(object):
+    """
+    Collects wall time, rows produced and peak memory of the stages of the parsing pipeline, see ``constants.STAGE_*``.
+    Each finished stage is logged with level ``DEBUG`` to the ``health_tracking.stats`` logger and passed to ``hook``.
+    Peak memory is the high-water mark of the whole process, ``peak_rss_increase_mib`` is the part a stage raised it by.
+    Stages of concurrent extractions are recorded as well, but may attribute each other's memory.
+
+    Args:
+        hook (Callable[[dict], None], optional): Is called with each finished stage as ``dict`` of
+            ``constants.STATS_COLUMNS``, e.g., to send it to monitoring. Defaults to None.
+    """
+
+    def __init__(self, hook: Callable[[dict], None] = None) -> None:
+
+        self._hook = hook
+        self._stages = []
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def measure(self, stage: str, table: str = None) -> Iterator[dict]:
+        """
+        Measures the stage executed within the context. Set ``"rows"`` of the yielded ``dict`` to the number of rows
+        produced. Stages that raise are not recorded.
+
+        Args:
+            stage (str): One of ``constants.STAGE_*``
+            table (str, optional): Element type or nested table the stage works on. Defaults to None.
+
+        Yields:
+            dict: Measurement of the stage, completed on exit
+        """
+
+        measurement = {"stage": stage, "table": table, "rows": None}
+        peak_before = peak_rss_mib()
+        start = time.perf_counter()
+
+        yield measurement
+
+        measurement["wall_seconds"] = time.perf_counter() - start
+        measurement["peak_rss_mib"] = peak_rss_mib()
+        measurement["peak_rss_increase_mib"] = None if peak_before is None else measurement["peak_rss_mib"] - peak_before
+
+        with self._lock:
+            self._stages.append(measurement)
+
+        logger.debug(
+            "%s%s: %.3f s, %s rows, peak RSS %s MiB",
+            stage,
+            "" if table is None else f" of {table}",
+            measurement["wall_seconds"],
+            measurement["rows"],
+            None if measurement["peak_rss_mib"] is None else round(measurement["peak_rss_mib"], 1)
+        )
+
+        if self._hook is not None:
+            self._hook(dict(measurement))
+
+    def to_data_frame(self) -> pd.DataFrame:
+        """
+        Returns all recorded stages in the order they finished.
+
+        Returns:
+            pd.DataFrame: One row per stage with the ``constants.STATS_COLUMNS``
+        """
+
+        with self._lock:
+            return pd.DataFrame(list(self._stages), columns=constants.STATS_COLUMNS)
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Sums up the recorded stages, e.g., to find the hot spots of a data dump.
+
+        Returns:
+            pd.DataFrame: One row per stage with its ``count``, total ``wall_seconds`` and ``rows`` and the maximum of
+                ``peak_rss_mib``, sorted by ``wall_seconds`` descending
+        """
+
+        stages = self.to_data_frame()
+
+        result = stages.groupby("stage", sort=False).agg(
+            count=("wall_seconds", "size"),
+            wall_seconds=("wall_seconds", "sum"),
+            rows=("rows", "sum"),
+            peak_rss_mib=("peak_rss_mib", "max")
+        )
+
+        return result.sort_values("wall_seconds", ascending=False).reset_index()
+
+    def clear(self) -> None:
+        """
+        Drops all recorded stages, e.g., to measure the next extraction on its own.
+        """
+
+        with self._lock:
+            self._stages.clear()
@@ -0,0 +1,270 @@
+import os
+import sqlite3
+import contextlib
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from . import constants
+
+# local time of a ``Record``'s start, its UTC ``startDate`` shifted by the original offset
+LOCAL_START_DATE = f"datetime(startDate, startDate{constants.OFFSET_COLUMN_SUFFIX} || ' minutes')"
+
+# SQL expressions of the local start of the period, weeks start on Monday
+PERIOD_EXPRESSIONS = {
+    constants.ROLLUP_HOURLY: f"strftime('%Y-%m-%d %H:00:00', {LOCAL_START_DATE})",
+    constants.ROLLUP_DAILY: f"date({LOCAL_START_DATE})",
+    constants.ROLLUP_WEEKLY: f"date({LOCAL_START_DATE}, 'weekday 0', '-6 days')",
+    constants.ROLLUP_MONTHLY: f"date({LOCAL_START_DATE}, 'start of month')",
+    constants.ROLLUP_YEARLY: f"date({LOCAL_START_DATE}, 'start of year')"
+}
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _column_type(series: pd.Series) -> str:
+    """
+    Returns the SQLite type of a column.
+    """
+
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        return "INTEGER"
+
+    if pd.api.types.is_float_dtype(series):
+        return "REAL"
+
+    return "TEXT"
+
+
+def _to_sql_values(data_frame: pd.DataFrame, day_columns: set) -> list:
+    """
+    Converts the columns of ``data_frame`` into arrays of Python objects ``sqlite3`` can bind, missing values become
+    ``None``. Timestamps are formatted by ``numpy``, which is much faster than ``strftime``.
+    """
+
+    columns = []
+
+    for column, series in data_frame.items():
+        if pd.api.types.is_datetime64_any_dtype(series):
+            if series.dt.tz is not None:
+                series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+
+            unit = "D" if column in day_columns else "s"
+            values = np.datetime_as_string(series.to_numpy(dtype=f"datetime64[{unit}]"), unit=unit).astype(object)
+
+        elif pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+            values = series.to_numpy(dtype=object)
+
+        else:
+            values = series.astype(object).to_numpy()
+
+        values[pd.isna(series).to_numpy()] = None
+        columns.append(values)
+
+    return columns
+
+
+def _to_text(timestamp) -> str:
+    """
+    Formats ``timestamp`` like the stored timestamps, naive values are taken as UTC.
+    """
+
+    timestamp = pd.Timestamp(timestamp)
+    timestamp = timestamp.tz_localize("UTC") if timestamp.tz is None else timestamp.tz_convert("UTC")
+
+    return timestamp.strftime(constants.SQLITE_TIMESTAMP_FORMAT)
+
+
+class SQLiteStore(object):
+    """
+    Embedded SQLite database of the tables of a data dump, to answer questions without loading whole tables.
+    Timestamps are stored as ISO 8601 UTC text (see ``constants.SQLITE_TIMESTAMP_FORMAT``) next to their offset
+    columns, days as ``YYYY-MM-DD``. Every table has indexes on the ``constants.SQLITE_INDEX_COLUMNS`` it contains.
+
+    Args:
+        path (str): Path of the database file. Is created by ``write``
+    """
+
+    def __init__(self, path: str) -> None:
+
+        self.path = path
+
+    def exists(self) -> bool:
+        """
+        Returns whether the database was written.
+        """
+
+        return os.path.exists(self.path)
+
+    def __contains__(self, name: str) -> bool:
+        if not self.exists():
+            return False
+
+        with self._connect() as connection:
+            return connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone() is not None
+
+    @contextlib.contextmanager
+    def _connect(self, path: str = None) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(path or self.path)
+
+        try:
+            yield connection
+
+        finally:
+            connection.close()
+
+    def _create_table(self, connection: sqlite3.Connection, name: str, data_frame: pd.DataFrame) -> None:
+        """
+        Creates the table ``name`` with the columns of ``data_frame``, bulk-loads its rows and indexes it.
+        """
+
+        # SQLite tables need columns
+        if len(data_frame.columns) == 0:
+            return
+
+        columns = ", ".join(f"{_quote(str(column))} {_column_type(series)}" for column, series in data_frame.items())
+        connection.execute(f"CREATE TABLE {_quote(name)} ({columns})")
+
+        if not data_frame.empty:
+            statement = f"INSERT INTO {_quote(name)} VALUES ({', '.join('?' * len(data_frame.columns))})"
+
+            for start in range(0, len(data_frame), constants.SQLITE_BATCH_SIZE):
+                batch = data_frame.iloc[start:start + constants.SQLITE_BATCH_SIZE]
+                connection.executemany(statement, zip(*_to_sql_values(batch, constants.DAY_COLUMNS.get(name, set()))))
+
+        for column in [column for column in constants.SQLITE_INDEX_COLUMNS if column in data_frame.columns]:
+            connection.execute(f"CREATE INDEX {_quote(f'{name}_{column}')} ON {_quote(name)} ({_quote(column)})")
+
+    def write(self, tables: dict) -> None:
+        """
+        Writes ``tables`` into a new database, replacing an existing one. All rows are inserted in batches of
+        ``constants.SQLITE_BATCH_SIZE`` within a single transaction, indexes are created after the rows. The database
+        is built next to ``path`` and moved there when complete, so readers never see a half written one.
+
+        Args:
+            tables (dict): maps table names to their ``DataFrame`` or ``None`` if empty. Tables that are ``None`` or
+                have no columns are not created
+        """
+
+        directory = os.path.dirname(self.path)
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temporary_path = f"{self.path}.tmp"
+
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+        with self._connect(temporary_path) as connection:
+
+            # nothing needs to survive a crash of a file that is not in place yet
+            connection.execute("PRAGMA journal_mode = OFF")
+            connection.execute("PRAGMA synchronous = OFF")
+
+            with connection:
+                connection.execute("BEGIN")
+
+                for name, data_frame in tables.items():
+                    if data_frame is not None:
+                        self._create_table(connection, name, data_frame)
+
+        os.replace(temporary_path, self.path)
+
+    def query(self, sql: str, parameters: tuple = None) -> pd.DataFrame:
+        """
+        Runs a SQL query, e.g., ``SELECT sourceName, COUNT(*) FROM Record GROUP BY sourceName``.
+
+        Args:
+            sql (str): Query, use ``?`` placeholders for values
+            parameters (tuple, optional): Values of the placeholders. Defaults to None.
+
+        Raises:
+            FileNotFoundError: If the database was not written
+
+        Returns:
+            pd.DataFrame: Result of the query
+        """
+
+        if not self.exists():
+            raise FileNotFoundError(f"Database does not exist: {self.path}")
+
+        with self._connect() as connection:
+            return pd.read_sql_query(sql, connection, params=parameters)
+
+    def query_records(
+        self,
+        types: list = None,
+        source_names: list = None,
+        start=None,
+        end=None,
+        frequency: str = None
+    ) -> pd.DataFrame:
+        """
+        Selects ``Record``s by the indexed columns and optionally aggregates their ``value``s per period, e.g., the
+        mean resting heart rate per month of a single source. Only the matching rows are read from the database.
+
+        Args:
+            types (list, optional): Only ``Record``s of these types. Defaults to None, i.e., all.
+            source_names (list, optional): Only ``Record``s of these ``sourceName``s. Defaults to None, i.e., all.
+            start (optional): Only ``Record``s with ``startDate`` from here on, anything ``pd.Timestamp`` understands.
+                Naive values are taken as UTC. Defaults to None, i.e., unbounded.
+            end (optional): Only ``Record``s with ``startDate`` before this, see ``start``. Defaults to None.
+            frequency (str, optional): One of ``constants.SQLITE_FREQUENCIES`` to aggregate numeric ``value``s per
+                ``type``, ``unit`` and local period of their ``startDate``. Defaults to None, i.e., the ``Record``s.
+
+        Raises:
+            ValueError: If wrong ``frequency`` is given
+
+        Returns:
+            pd.DataFrame: ``Record``s sorted by ``startDate`` with UTC timestamps or, if ``frequency`` is given, one row
+                per ``constants.ROLLUP_KEY_COLUMNS`` with the ``constants.ROLLUP_AGGREGATIONS``. ``None`` if empty
+        """
+
+        if frequency is not None and frequency not in PERIOD_EXPRESSIONS:
+            raise ValueError(f"'frequency' need to be one of: {constants.SQLITE_FREQUENCIES}\n\tGiven: {frequency}")
+
+        if constants.RECORD_TAG not in self:
+            return None
+
+        conditions = []
+        parameters = []
+
+        for column, values in (("type", types), ("sourceName", source_names)):
+            if values is not None:
+                values = list(values)
+                conditions.append(f"{column} IN ({', '.join('?' * len(values))})")
+                parameters += values
+
+        for operator, bound in ((">=", start), ("<", end)):
+            if bound is not None:
+                conditions.append(f"startDate {operator} ?")
+                parameters.append(_to_text(bound))
+
+        # ``Record``s of category types have no numeric ``value``
+        if frequency is not None:
+            conditions.append("value IS NOT NULL")
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        if frequency is None:
+            result = self.query(f"SELECT * FROM {_quote(constants.RECORD_TAG)} {where} ORDER BY startDate", tuple(parameters))
+
+            for column in constants.DATETIME_COLUMNS[constants.RECORD_TAG] & set(result.columns):
+                result[column] = pd.to_datetime(result[column], format=constants.SQLITE_TIMESTAMP_FORMAT, utc=True)
+
+            return None if result.empty else result
+
+        period = constants.ROLLUP_COLUMN_PERIOD
+        result = self.query(
+            f"SELECT type, unit, {PERIOD_EXPRESSIONS[frequency]} AS {period}, SUM(value) AS sum, AVG(value) AS mean, "
+            f"MIN(value) AS min, MAX(value) AS max, COUNT(value) AS count FROM {_quote(constants.RECORD_TAG)} {where} "
+            f"GROUP BY type, unit, {period} ORDER BY type, unit, {period}",
+            tuple(parameters)
+        )
+        result[period] = pd.to_datetime(result[period])
+
+        return None if result.empty else result
@@ -0,0 +1,208 @@
+import datetime
+import xml.etree.ElementTree as ET
+from typing import IO, Callable, Iterable, Iterator
+
+import pandas as pd
+
+from . import constants
+from .compact import CompactTable
+from .stats import ParseStats
+
+# local dates of HealthKit timestamps differ at most by this from their UTC dates
+DATE_FILTER_MARGIN = datetime.timedelta(days=1)
+
+
+def iter_elements(source: IO[bytes], element_types: Iterable[str]) -> Iterator[ET.Element]:
+    """
+    Streams the top-level elements of ``element_types`` out of an Apple Health ``export.xml``.
+
+    The document is read with ``iterparse`` and every finished top-level element is detached from the root
+    after it was handed out. Therefore, only the element currently processed lives in memory and not the whole DOM.
+    Nested elements, e.g. ``Record`` elements of a ``Correlation``, are not yielded on their own.
+
+    Args:
+        source (IO[bytes]): Binary file object of the XML document
+        element_types (Iterable[str]): Tags of the top-level elements to yield
+
+    Yields:
+        ET.Element: Complete top-level element, including its children. Only valid until the next one is requested
+    """
+
+    element_types = set(element_types)
+    root = None
+    depth = 0
+
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = element
+
+            depth += 1
+            continue
+
+        depth -= 1
+
+        if depth == 1:
+            if element.tag in element_types:
+                yield element
+
+            # detach finished top-level elements to keep memory flat
+            del root[:]
+
+
+def date_filter(column: str, start: datetime.datetime = None, end: datetime.datetime = None) -> Callable[[dict], bool]:
+    """
+    Creates a cheap predicate on raw element attributes that skips elements far outside of ``[start, end]``.
+    Only the date prefix of the raw HealthKit timestamp is compared, with a margin of ``DATE_FILTER_MARGIN``
+    to cover any UTC offset. Therefore, no element in range gets dropped, but the exact filtering needs to be done
+    on the typed column afterwards.
+
+    Args:
+        column (str): Name of the date attribute
+        start (datetime.datetime, optional): Lower bound. Defaults to None, i.e., unbounded.
+        end (datetime.datetime, optional): Upper bound. Defaults to None, i.e., unbounded.
+
+    Returns:
+        Callable[[dict], bool]: Is ``True`` for attributes that may be in range, also if ``column`` is missing
+    """
+
+    lower = None if start is None else (start - DATE_FILTER_MARGIN).strftime("%Y-%m-%d")
+    upper = None if end is None else (end + DATE_FILTER_MARGIN).strftime("%Y-%m-%d")
+
+    def predicate(attributes: dict) -> bool:
+        value = attributes.get(column)
+
+        if value is None:
+            return True
+
+        day = value[:10]
+        return (lower is None or day >= lower) and (upper is None or day <= upper)
+
+    return predicate
+
+
+def _new_rows(name: str, compact: bool):
+    """
+    Returns an empty row container for the table ``name``, a ``CompactTable`` or a ``list`` of attribute ``dict``s.
+    """
+
+    if compact:
+        return CompactTable(constants.CATEGORICAL_COLUMNS.get(name, set()) | constants.NUMERIC_COLUMNS.get(name, set()))
+
+    return []
+
+
+def _to_data_frame(rows) -> pd.DataFrame:
+    return rows.to_data_frame() if isinstance(rows, CompactTable) else pd.DataFrame(rows)
+
+
+def collect_tables(
+    elements: Iterable[ET.Element],
+    element_types: Iterable[str],
+    compact: bool = False,
+    filters: dict = None,
+    child_tables: Iterable[str] = None,
+    stats: ParseStats = None
+) -> dict:
+    """
+    Routes the attributes of ``elements`` to one table per element type.
+    Nested elements are collected into ``child_tables`` in the same pass. Their ``constants.PARENT_ID_COLUMN``
+    holds the position of the parent's row in its table.
+
+    Args:
+        elements (Iterable[ET.Element]): Top-level elements, e.g., of ``iter_elements``
+        element_types (Iterable[str]): Tags of the tables to build, other elements are ignored
+        compact (bool, optional): Flag to collect column-wise into ``CompactTable``s. Defaults to False.
+        filters (dict, optional): Maps element types to predicates on the raw attributes. Elements failing them
+            and their nested elements are skipped. Defaults to None.
+        child_tables (Iterable[str], optional): Tables of ``constants.CHILD_TABLES`` to build, their parents need to be
+            in ``element_types``. Defaults to None.
+        stats (ParseStats, optional): Records the stages ``constants.STAGE_COLLECT``, which includes streamed parsing
+            of ``elements``, and ``constants.STAGE_BUILD`` per table. Defaults to None.
+
+    Returns:
+        dict: maps each of ``element_types`` and ``child_tables`` to its ``DataFrame`` of raw, i.e., untyped, attributes
+    """
+
+    stats = stats or ParseStats()
+    filters = filters or {}
+    rows = {}
+    children = {}  # parent tag -> [(table name, path)]
+
+    for name in [*element_types, *(child_tables or [])]:
+        rows[name] = _new_rows(name, compact)
+
+    for name in child_tables or []:
+        parent, path = constants.CHILD_TABLES[name]
+        children.setdefault(parent, []).append((name, path))
+
+    with stats.measure(constants.STAGE_COLLECT) as measurement:
+        for element in elements:
+            element_rows = rows.get(element.tag)
+            predicate = filters.get(element.tag)
+
+            if element_rows is None or (predicate is not None and not predicate(element.attrib)):
+                continue
+
+            element_rows.append(element.attrib)
+
+            for name, path in children.get(element.tag, []):
+                flattened = constants.FLATTENED_CHILDREN.get(name)
+
+                for child in element.iterfind(path):
+                    attributes = {constants.PARENT_ID_COLUMN: len(element_rows) - 1, **child.attrib}
+
+                    if flattened is not None:
+                        for grandchild in child.iterfind(flattened):
+                            attributes.update(grandchild.attrib)
+
+                    rows[name].append(attributes)
+
+        measurement["rows"] = sum(len(table_rows) for table_rows in rows.values())
+
+    tables = {}
+
+    for name, table_rows in rows.items():
+        with stats.measure(constants.STAGE_BUILD, name) as measurement:
+            tables[name] = _to_data_frame(table_rows)
+            measurement["rows"] = len(tables[name])
+
+    return tables
+
+
+def iter_chunks(
+    elements: Iterable[ET.Element],
+    element_type: str,
+    chunk_size: int,
+    compact: bool = False,
+    predicate: Callable[[dict], bool] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Like ``collect_tables`` for a single element type, but yields its table in chunks of ``chunk_size`` rows.
+    Only one chunk is held in memory at once.
+
+    Args:
+        elements (Iterable[ET.Element]): Top-level elements, e.g., of ``iter_elements``
+        element_type (str): Tag of the table to build, other elements are ignored
+        chunk_size (int): Number of rows per chunk, the last one may be smaller
+        compact (bool, optional): Flag to collect column-wise into ``CompactTable``s. Defaults to False.
+        predicate (Callable[[dict], bool], optional): Elements whose raw attributes fail it are skipped. Defaults to None.
+
+    Yields:
+        pd.DataFrame: Chunk of raw, i.e., untyped, attributes
+    """
+
+    rows = _new_rows(element_type, compact)
+
+    for element in elements:
+        if element.tag != element_type or (predicate is not None and not predicate(element.attrib)):
+            continue
+
+        rows.append(element.attrib)
+
+        if len(rows) >= chunk_size:
+            yield _to_data_frame(rows)
+            rows = _new_rows(element_type, compact)
+
+    if len(rows) > 0:
+        yield _to_data_frame(rows)
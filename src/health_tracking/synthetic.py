@@ -0,0 +1,272 @@
+import random
+import zipfile
+import datetime
+
+from . import constants
+
+# HealthKit Export Version 11 starts with this DTD, shortened to the elements written here
+EXPORT_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE HealthData [
+<!-- HealthKit Export Version: 11 -->
+<!ELEMENT HealthData (ExportDate,Me,(Record|Correlation|Workout|ActivitySummary|ClinicalRecord)*)>
+<!ATTLIST HealthData
+  locale CDATA #REQUIRED
+>
+<!ELEMENT ExportDate EMPTY>
+<!ATTLIST ExportDate
+  value CDATA #REQUIRED
+>
+<!ELEMENT Me EMPTY>
+<!ELEMENT Record ((MetadataEntry|HeartRateVariabilityMetadataList)*)>
+<!ELEMENT Correlation ((MetadataEntry|Record)*)>
+<!ELEMENT Workout ((MetadataEntry|WorkoutEvent|WorkoutRoute)*)>
+<!ELEMENT WorkoutRoute ((MetadataEntry|FileReference)*)>
+<!ELEMENT ActivitySummary EMPTY>
+]>
+<HealthData locale="en_US">
+"""
+
+# (type, unit, sourceName, minimum value, maximum value, minutes between records)
+RECORD_TYPES = [
+    ("HKQuantityTypeIdentifierHeartRate", "count/min", "Apple Watch", 45, 180, 5),
+    ("HKQuantityTypeIdentifierStepCount", "count", "iPhone", 1, 400, 10),
+    ("HKQuantityTypeIdentifierStepCount", "count", "Apple Watch", 1, 400, 10),
+    ("HKQuantityTypeIdentifierDistanceWalkingRunning", "km", "iPhone", 0.01, 0.4, 10),
+    ("HKQuantityTypeIdentifierActiveEnergyBurned", "kcal", "Apple Watch", 0.1, 20, 5),
+    ("HKQuantityTypeIdentifierBodyMass", "kg", "Scale", 70, 80, 1440),
+    ("HKCategoryTypeIdentifierSleepAnalysis", None, "iPhone", None, None, 480)
+]
+
+WORKOUT_TYPES = ["Running", "Walking", "Cycling", "Swimming"]
+DEVICE = "&lt;&lt;HKDevice: 0x280000000, name:Apple Watch, manufacturer:Apple Inc., model:Watch, hardware:Watch4,4, software:6.1&gt;&gt;"
+START = datetime.datetime(2019, 1, 1, 6, 0)
+
+# bytes written to the zipped XML at once
+WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+
+
+def _timestamp(local: datetime.datetime) -> str:
+    """
+    Formats a local time as HealthKit timestamp, e.g., "2019-06-01 07:12:44 +0200", with the offsets of Central Europe.
+    """
+
+    offset = "+0200" if 4 <= local.month <= 10 else "+0100"
+
+    return f"{local:%Y-%m-%d %H:%M:%S} {offset}"
+
+
+def _records(count: int, generator: random.Random, until: datetime.datetime):
+    """
+    Yields ``count`` ``Record`` elements grouped by type like Apple exports them, only those created before ``until``.
+    """
+
+    for index, (record_type, unit, source, minimum, maximum, interval) in enumerate(RECORD_TYPES):
+        type_count = count // len(RECORD_TYPES) + (index < count % len(RECORD_TYPES))
+        unit_attribute = "" if unit is None else f' unit="{unit}"'
+
+        for position in range(type_count):
+            start = START + datetime.timedelta(minutes=interval * position)
+            end = start + datetime.timedelta(minutes=min(interval, 10))
+            value = "HKCategoryValueSleepAnalysisAsleep" if unit is None else f"{generator.uniform(minimum, maximum):.{0 if maximum > 100 else 2}f}"
+
+            if end >= until:
+                continue
+
+            attributes = (
+                f'type="{record_type}" sourceName="{source}" sourceVersion="6.1" device="{DEVICE}"{unit_attribute} '
+                f'creationDate="{_timestamp(end)}" startDate="{_timestamp(start)}" endDate="{_timestamp(end)}" value="{value}"'
+            )
+
+            if position % 100 == 0:
+                yield f' <Record {attributes}>\n  <MetadataEntry key="HKMetadataKeySyncVersion" value="1"/>\n </Record>\n'
+
+            else:
+                yield f' <Record {attributes}/>\n'
+
+
+def _correlations(count: int, generator: random.Random, until: datetime.datetime):
+    """
+    Yields ``count`` blood pressure ``Correlation`` elements with their systolic and diastolic ``Record``s, only those
+    created before ``until``.
+    """
+
+    for position in range(count):
+        local = START + datetime.timedelta(days=position, hours=2)
+        date = _timestamp(local)
+        dates = f'sourceName="Health" sourceVersion="13.3" creationDate="{date}" startDate="{date}" endDate="{date}"'
+        systolic, diastolic = generator.randint(105, 140), generator.randint(65, 90)
+
+        if local >= until:
+            continue
+
+        yield (
+            f' <Correlation type="HKCorrelationTypeIdentifierBloodPressure" {dates}>\n'
+            f'  <MetadataEntry key="HKWasUserEntered" value="1"/>\n'
+            f'  <Record type="HKQuantityTypeIdentifierBloodPressureSystolic" {dates} unit="mmHg" value="{systolic}"/>\n'
+            f'  <Record type="HKQuantityTypeIdentifierBloodPressureDiastolic" {dates} unit="mmHg" value="{diastolic}"/>\n'
+            f' </Correlation>\n'
+        )
+
+
+def _route_path(position: int) -> str:
+    return f"/workout-routes/route_{position}.gpx"
+
+
+def _workouts(count: int, routes: int, generator: random.Random, until: datetime.datetime, route_positions: list):
+    """
+    Yields ``count`` ``Workout`` elements, the first ``routes`` of them reference a GPX file. Only those created before
+    ``until`` are yielded, the positions of their routes are appended to ``route_positions``.
+    """
+
+    for position in range(count):
+        start = START + datetime.timedelta(days=position, hours=1)
+        duration = generator.uniform(20, 90)
+        distance = duration / generator.uniform(4, 8)
+        end = start + datetime.timedelta(minutes=duration)
+        dates = f'creationDate="{_timestamp(end)}" startDate="{_timestamp(start)}" endDate="{_timestamp(end)}"'
+        route = ""
+
+        if end >= until:
+            continue
+
+        if position < routes:
+            route_positions.append(position)
+            route = (
+                f'  <WorkoutRoute sourceName="Apple Watch" sourceVersion="6.1" {dates}>\n'
+                f'   <FileReference path="{_route_path(position)}"/>\n'
+                f'  </WorkoutRoute>\n'
+            )
+
+        yield (
+            f' <Workout workoutActivityType="HKWorkoutActivityType{WORKOUT_TYPES[position % len(WORKOUT_TYPES)]}" '
+            f'duration="{duration:.4f}" durationUnit="min" totalDistance="{distance:.4f}" '
+            f'totalDistanceUnit="km" totalEnergyBurned="{duration * 10:.2f}" totalEnergyBurnedUnit="kcal" '
+            f'sourceName="Apple Watch" sourceVersion="6.1" device="{DEVICE}" {dates}>\n'
+            f'  <MetadataEntry key="HKIndoorWorkout" value="0"/>\n'
+            f'  <WorkoutEvent type="HKWorkoutEventTypePause" date="{_timestamp(start + datetime.timedelta(minutes=10))}"/>\n'
+            f'  <WorkoutEvent type="HKWorkoutEventTypeResume" date="{_timestamp(start + datetime.timedelta(minutes=11))}"/>\n'
+            f'{route}'
+            f' </Workout>\n'
+        )
+
+
+def _activity_summaries(count: int, generator: random.Random, until: datetime.datetime):
+    """
+    Yields ``count`` ``ActivitySummary`` elements of consecutive days, only those of days starting before ``until``.
+    """
+
+    for position in range(count):
+        local = START + datetime.timedelta(days=position)
+        day = local.strftime(constants.DAY_FORMAT)
+        energy, exercise_time, stand_hours = generator.uniform(100, 900), generator.randint(0, 90), generator.randint(4, 16)
+
+        if datetime.datetime.combine(local.date(), datetime.time()) >= until:
+            continue
+
+        yield (
+            f' <ActivitySummary dateComponents="{day}" activeEnergyBurned="{energy:.3f}" '
+            f'activeEnergyBurnedGoal="500" activeEnergyBurnedUnit="kcal" appleMoveTime="0" appleMoveTimeGoal="0" '
+            f'appleExerciseTime="{exercise_time}" appleExerciseTimeGoal="30" '
+            f'appleStandHours="{stand_hours}" appleStandHoursGoal="12"/>\n'
+        )
+
+
+def _route(position: int, points: int, generator: random.Random) -> str:
+    """
+    Returns a GPX file as the Apple Watch records it, with one point per second.
+    """
+
+    start = START + datetime.timedelta(days=position, hours=1)
+    offset = datetime.timedelta(hours=2 if 4 <= start.month <= 10 else 1)
+    latitude, longitude, elevation = 52.5 + generator.uniform(-0.1, 0.1), 13.4 + generator.uniform(-0.1, 0.1), 35.0
+    lines = []
+
+    for point in range(points):
+        latitude += generator.uniform(-2e-5, 4e-5)
+        longitude += generator.uniform(-2e-5, 4e-5)
+        elevation += generator.uniform(-0.2, 0.2)
+        time = start - offset + datetime.timedelta(seconds=point)
+
+        lines.append(
+            f'   <trkpt lon="{longitude:.6f}" lat="{latitude:.6f}"><ele>{elevation:.6f}</ele><time>{time:%Y-%m-%dT%H:%M:%S}Z</time>'
+            f'<extensions><speed>{generator.uniform(2, 4):.6f}</speed><course>-1.0</course><hAcc>1.5</hAcc><vAcc>1.0</vAcc></extensions></trkpt>\n'
+        )
+
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<gpx version="1.1" creator="Apple Health Export" xmlns="http://www.topografix.com/GPX/1/1">\n'
+        f' <metadata>\n  <time>{start - offset:%Y-%m-%dT%H:%M:%S}Z</time>\n </metadata>\n'
+        ' <trk>\n  <name>Route</name>\n  <trkseg>\n'
+        f'{"".join(lines)}'
+        '  </trkseg>\n </trk>\n</gpx>\n'
+    )
+
+
+def generate_export(
+    path: str,
+    records: int = 10000,
+    workouts: int = 100,
+    correlations: int = 100,
+    activity_summaries: int = 365,
+    routes: int = 10,
+    route_points: int = 1800,
+    seed: int = 0,
+    until: datetime.datetime = None
+) -> None:
+    """
+    Writes a synthetic zipped data dump with the structure of HealthKit Export Version 11, e.g., for benchmarks.
+    The XML is streamed into the archive, so even dumps with tens of millions of ``Record``s need little memory.
+
+    Args:
+        path (str): Path of the zipped data dump to write
+        records (int, optional): Number of top-level ``Record``s, split evenly into ``RECORD_TYPES``. Defaults to 10000.
+        workouts (int, optional): Number of ``Workout``s, one per day. Defaults to 100.
+        correlations (int, optional): Number of blood pressure ``Correlation``s. Defaults to 100.
+        activity_summaries (int, optional): Number of ``ActivitySummary``s, one per day. Defaults to 365.
+        routes (int, optional): Number of ``Workout``s with a GPX route, at most ``workouts``. Defaults to 10.
+        route_points (int, optional): Number of points per route. Defaults to 1800.
+        seed (int, optional): Seed of the random values, the same arguments give the same data dump. Defaults to 0.
+        until (datetime.datetime, optional): Local export time, only elements created before it are written. Dumps of
+            the same other arguments and a later ``until`` are cumulative like real exports. Defaults to None, i.e.,
+            all elements.
+    """
+
+    generator = random.Random(seed)
+    routes = min(routes, workouts)
+    export_date = _timestamp(until or START + datetime.timedelta(days=max(workouts, activity_summaries, correlations)))
+    until = until or datetime.datetime.max
+    route_positions = []
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zipped_export:
+        with zipped_export.open(constants.ZIP_XML_MEMBER, "w", force_zip64=True) as xml:
+            buffer = [
+                EXPORT_HEADER,
+                f' <ExportDate value="{export_date}"/>\n',
+                ' <Me HKCharacteristicTypeIdentifierDateOfBirth="1990-01-01"'
+                ' HKCharacteristicTypeIdentifierBiologicalSex="HKBiologicalSexNotSet"'
+                ' HKCharacteristicTypeIdentifierBloodType="HKBloodTypeNotSet"'
+                ' HKCharacteristicTypeIdentifierFitzpatrickSkinType="HKFitzpatrickSkinTypeNotSet"/>\n'
+            ]
+            size = 0
+
+            elements = [
+                _records(records, generator, until),
+                _correlations(correlations, generator, until),
+                _workouts(workouts, routes, generator, until, route_positions),
+                _activity_summaries(activity_summaries, generator, until)
+            ]
+
+            for element_generator in elements:
+                for element in element_generator:
+                    buffer.append(element)
+                    size += len(element)
+
+                    if size >= WRITE_BUFFER_SIZE:
+                        xml.write("".join(buffer).encode())
+                        buffer, size = [], 0
+
+            buffer.append(f"</{constants.HEALTH_DATA_TAG}>\n")
+            xml.write("".join(buffer).encode())
+
+        for position in route_positions:
+            zipped_export.writestr(f"{constants.EXPORT_DIR_NAME}{_route_path(position)}", _route(position, route_points, generator))
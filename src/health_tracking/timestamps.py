@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+# HealthKit timestamps have a fixed layout: "2019-06-01 07:12:44 +0200"
+TIMESTAMP_LENGTH = 25
+
+_SEPARATORS = {4: b"-", 7: b"-", 10: b" ", 13: b":", 16: b":", 19: b" "}
+_DIGITS = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18, 21, 22, 23, 24]
+_NANOSECONDS_PER_SECOND = 10 ** 9
+
+# years whose timestamps fit into ``datetime64[ns]``
+_MIN_YEAR = 1678
+_MAX_YEAR = 2261
+
+
+def _number(digits: np.ndarray, start: int, stop: int) -> np.ndarray:
+    """
+    Combines the digit columns ``[start, stop)`` of a character matrix to numbers.
+    """
+
+    result = np.zeros(digits.shape[0], dtype=np.int64)
+
+    for position in range(start, stop):
+        result = result * 10 + digits[:, position]
+
+    return result
+
+
+def parse_healthkit_timestamps(values: pd.Series) -> (pd.Series, pd.Series):
+    """
+    Vectorized parser for the fixed HealthKit timestamp format, e.g., ``"2019-06-01 07:12:44 +0200"``.
+    Works on the raw bytes of all values at once and does not need to guess formats or handle mixed UTC offsets
+    with Python objects.
+
+    Args:
+        values (pd.Series): Timestamp strings, missing values are allowed
+
+    Raises:
+        ValueError: If a value does not match the HealthKit format or a field is out of range, e.g., month 13 or
+            February 30
+
+    Returns:
+        (pd.Series, pd.Series): Timestamps as ``datetime64[ns, UTC]`` (``NaT`` if missing) and their UTC offsets
+            in minutes as ``int16`` (0 if missing)
+    """
+
+    missing = values.isna().to_numpy()
+    strings = values.to_numpy(dtype=object, copy=True)
+    strings[missing] = "1970-01-01 00:00:00 +0000"
+
+    # one more byte than needed to detect too long values, numpy pads shorter ones with zeros
+    try:
+        encoded = np.asarray(strings, dtype=f"S{TIMESTAMP_LENGTH + 1}")
+
+    except UnicodeEncodeError:
+        raise ValueError("HealthKit timestamps need to be ASCII")
+
+    characters = encoded.view(np.uint8).reshape(-1, TIMESTAMP_LENGTH + 1)
+    digits = characters.astype(np.int64) - ord("0")
+
+    valid = characters[:, TIMESTAMP_LENGTH] == 0
+    valid &= np.isin(characters[:, 20], (ord("+"), ord("-")))
+    valid &= ((digits[:, _DIGITS] >= 0) & (digits[:, _DIGITS] <= 9)).all(axis=1)
+
+    for position, separator in _SEPARATORS.items():
+        valid &= characters[:, position] == ord(separator)
+
+    if not valid.all():
+        raise ValueError(f"Value does not match the HealthKit timestamp format: '{values.iloc[np.argmin(valid)]}'")
+
+    year, month, day = _number(digits, 0, 4), _number(digits, 5, 7), _number(digits, 8, 10)
+    hour, minute, second = _number(digits, 11, 13), _number(digits, 14, 16), _number(digits, 17, 19)
+    offset_hour, offset_minute = _number(digits, 21, 23), _number(digits, 23, 25)
+
+    months = ((year - 1970) * 12 + month - 1).astype("datetime64[M]")
+    days_in_month = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(np.int64)
+
+    valid = (year >= _MIN_YEAR) & (year <= _MAX_YEAR) & (month >= 1) & (month <= 12) & (day >= 1) & (day <= days_in_month)
+    valid &= (hour < 24) & (minute < 60) & (second < 60) & (offset_hour < 24) & (offset_minute < 60)
+
+    if not valid.all():
+        raise ValueError(f"Value is out of range of the HealthKit timestamp format: '{values.iloc[np.argmin(valid)]}'")
+
+    days = months.astype("datetime64[D]").astype(np.int64) + day - 1
+    seconds = hour * 3600 + minute * 60 + second
+
+    sign = np.where(characters[:, 20] == ord("-"), -1, 1)
+    offsets = sign * (offset_hour * 60 + offset_minute)
+
+    # local wall time minus its offset is UTC
+    nanoseconds = (days * 86400 + seconds - offsets * 60) * _NANOSECONDS_PER_SECOND
+    nanoseconds[missing] = np.iinfo(np.int64).min  # is NaT
+    offsets[missing] = 0
+
+    timestamps = pd.Series(
+        pd.DatetimeIndex(nanoseconds.view("datetime64[ns]")).tz_localize("UTC"),
+        index=values.index,
+        name=values.name
+    )
+
+    return timestamps, pd.Series(offsets.astype(np.int16), index=values.index)
@@ -1,13 +1,15 @@
+import numpy as np
 import pandas as pd
-import seaborn as sns
 
-from . import AppleHealthParser, constants
+from . import constants
+from .parser import AppleHealthParser
 
 
 class Workouts(object):
     """
     Parse and gives access to ``Workout`` data of a Apple Health App dump data.
     Provides plotting functionalities.
+    The ``DataFrame`` of a workout type, e.g., ``runnings``, is built on first access and kept afterwards.
 
     Args:
         zip_dump_path (str, optional): Path to the zipped data dump. Defaults to constants.ZIP_PATH.
@@ -22,32 +24,49 @@ class Workouts(object):
         force_unzip: bool = False
     ) -> None:
 
-        def create_offset_column(row: pd.DataFrame) -> None:
-            """
-            Helper for creating offset column since the first training
-
-            Args:
-                row (pd.DataFrame): Workouts ``pd.DataFrame``
-            """
-            first_workout = row[constants.WORKOUT_COLUMN_DATE][0]
-            row[constants.WORKOUT_COLUMN_OFFSET] = row.apply(lambda row: (row[constants.WORKOUT_COLUMN_DATE] - first_workout).days, axis=1)
-
         self._parser = AppleHealthParser(zip_dump_path, unzip_path, force_unzip)
-        self.workouts, self.workout_types = self._parser.extract_workouts()
+        workouts, self.workout_types = self._parser.extract_workouts()
         self._valid_data_frames = [*[f"{workout_type}s" for workout_type in self.workout_types], "workouts"]
 
-        # new column with the offset in days since the first workout
-        create_offset_column(self.workouts)
+        dates = workouts[constants.WORKOUT_COLUMN_DATE]
+        types = workouts[constants.WORKOUT_TYPE]
+
+        # new columns with the offset in days since the first workout and the pace, the parser's table is not changed
+        self.workouts = workouts.assign(**{
+            constants.WORKOUT_COLUMN_OFFSET: (dates - dates[0]).dt.days,
+            constants.WORKOUT_COLUMN_MINUTES_PER_KM: compute_minutes_per_km(workouts)
+        })
+
+        # positions of the workouts of each type and their offset in days since the first workout of their type
+        self._type_positions = types.groupby(types, sort=False).indices
+        self._type_offsets = (dates - dates.groupby(types, sort=False).transform("first")).dt.days.to_numpy()
+
+    def __getattr__(self, name: str) -> pd.DataFrame:
+        """
+        Builds the ``DataFrame`` of a workout type, e.g., ``runnings``, on first access. Is only called for
+        attributes that do not exist yet.
+
+        Args:
+            name (str): Workout type with trailing "s"
+
+        Raises:
+            AttributeError: If ``name`` is no workout type
+
+        Returns:
+            pd.DataFrame: The ``DataFrame`` of the workout type with the offset in days since its first workout
+        """
+
+        positions = self.__dict__.get("_type_positions", {}).get(name[:-1]) if name.endswith("s") else None
 
-        # create data frames for each workout type
-        for workout_type in self.workout_types:
-            type_df = self.workouts[self.workouts[constants.WORKOUT_TYPE] == workout_type].copy().reset_index(drop=True)
-            type_df[constants.WORKOUT_COLUMN_MINUTES_PER_KM] = type_df.apply(calc_minutes_per_km, axis=1)
+        if positions is None:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
 
-            # new column with the offset in days since the first workout of ``workout_type``
-            create_offset_column(type_df)
+        type_df = self.workouts.iloc[positions].reset_index(drop=True)
+        type_df[constants.WORKOUT_COLUMN_OFFSET] = self._type_offsets[positions]
 
-            self.__setattr__(f"{workout_type.lower()}s", type_df)
+        setattr(self, name, type_df)
+
+        return type_df
 
     def __getitem__(self, workout_type: str) -> pd.DataFrame:
         """
@@ -65,7 +84,7 @@ class Workouts(object):
         if workout_type not in self._valid_data_frames:
             raise ValueError(f"'workout_type' need to be one of: {self._valid_data_frames}\n\tGiven: {workout_type}")
 
-        return self.__getattribute__(workout_type)
+        return getattr(self, workout_type)
 
     def plot(
         self,
@@ -125,6 +144,9 @@ class Workouts(object):
         else:
             raise ValueError(f"Value of 'xlim' is invalid!\n\tGiven: {xlim}")
 
+        # plotting dependencies are slow to import and only needed here
+        import seaborn as sns
+
         # Plot or raise Exception
         if plot_type in ["joint", "jointplot", "joint_plot", "joint-plot", "joint plot"]:
 
@@ -145,6 +167,26 @@ class Workouts(object):
             raise ValueError(f"Parameter 'plot_type' is invalid!\n\tGiven: {plot_type}")
 
 
+def compute_minutes_per_km(workouts: pd.DataFrame) -> pd.Series:
+    """
+    Calculates the pace as minutes per kilometer of all workouts at once, like ``calc_minutes_per_km`` does per row.
+
+    Args:
+        workouts (pd.DataFrame): Workouts ``pd.DataFrame``
+
+    Returns:
+        pd.Series: New column for workflow ``DataFrame``, 0 if duration or distance is 0
+    """
+
+    duration = workouts[constants.WORKOUT_COLUMN_DURATION]
+    distance = workouts[constants.WORKOUT_COLUMN_DISTANCE]
+
+    # Calculation or downstream computations will fail if one of the operands is 0
+    error_state = (duration == 0) | (distance == 0)
+
+    return pd.Series(np.where(error_state, 0, duration / distance.mask(error_state)), index=workouts.index)
+
+
 def calc_minutes_per_km(row: pd.DataFrame) -> pd.Series:
     """
     Helper function that calculates the pace as minutes per kilometer.
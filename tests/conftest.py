@@ -1,10 +1,106 @@
 # -*- coding: utf-8 -*-
 """
-    Dummy conftest.py for health_tracking.
+    Fixtures for health_tracking.
 
-    If you don't know what this is for, just leave it empty.
-    Read more about conftest.py under:
-    https://pytest.org/latest/plugins.html
+    The tests run on small synthetic data dumps, see ``health_tracking.synthetic``.
 """
 
-# import pytest
+import os
+
+import pandas as pd
+import pytest
+
+import health_tracking as ht
+from health_tracking import constants, synthetic
+
+# small enough to parse in well under a second, large enough for every element type and nested table
+RECORDS = 2000
+WORKOUTS = 20
+ACTIVITY_SUMMARIES = 40
+ROUTE_POINTS = 60
+
+
+def generate_export(path: str, **kwargs) -> str:
+    """
+    Writes a small synthetic data dump to ``path``, see ``synthetic.generate_export``.
+    """
+
+    arguments = dict(
+        records=RECORDS,
+        workouts=WORKOUTS,
+        correlations=WORKOUTS,
+        activity_summaries=ACTIVITY_SUMMARIES,
+        routes=2,
+        route_points=ROUTE_POINTS
+    )
+    arguments.update(kwargs)
+    synthetic.generate_export(str(path), **arguments)
+
+    return str(path)
+
+
+def extract_tables(parser) -> dict:
+    """
+    Extracts everything and returns all tables by name, ``None`` if empty.
+    """
+
+    parser.extract_all()
+
+    tables = {element_type: getattr(parser, attribute) for element_type, attribute in parser._ELEMENT_ATTRIBUTES.items()}
+    tables.update(parser._children)
+    tables[constants.EXPORT_DATE_TAG] = parser.get_export_date()
+
+    return tables
+
+
+def assert_tables_equal(tables: dict, expected: dict) -> None:
+    assert set(tables) == set(expected)
+
+    for name, data_frame in expected.items():
+        if isinstance(data_frame, pd.DataFrame):
+            pd.testing.assert_frame_equal(tables[name], data_frame, obj=name)
+
+        else:
+            assert tables[name] == data_frame, name
+
+
+@pytest.fixture(autouse=True)
+def clear_instances():
+    """
+    Every test constructs its parsers from scratch.
+    """
+
+    ht.InstanceRegistry.clear()
+    yield
+    ht.InstanceRegistry.clear()
+
+
+@pytest.fixture(scope="session")
+def export_path(tmp_path_factory) -> str:
+    return generate_export(tmp_path_factory.mktemp("export") / constants.EXPORT_NAME)
+
+
+@pytest.fixture
+def make_parser(tmp_path):
+    """
+    Returns a factory of parsers of a data dump, each with an own ``unzip_path`` below ``tmp_path``.
+    """
+
+    counter = iter(range(1000))
+
+    def make(zip_dump_path: str, **kwargs) -> ht.AppleHealthParser:
+        ht.InstanceRegistry.clear()
+        unzip_path = os.path.join(str(tmp_path), f"unzipped_{next(counter)}", constants.EXPORT_DIR_NAME)
+
+        return ht.AppleHealthParser(zip_dump_path, unzip_path, **kwargs)
+
+    return make
+
+
+@pytest.fixture
+def expected(export_path, make_parser) -> dict:
+    """
+    Tables of the default parser, i.e., of the whole ``ElementTree``.
+    """
+
+    return extract_tables(make_parser(export_path))
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import os
+import asyncio
+
+import pandas as pd
+import pytest
+
+from health_tracking import constants
+from health_tracking.background import BackgroundParser
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_prefetch_reads_the_document_once(export_path, tmp_path, streaming):
+    unzip_path = os.path.join(str(tmp_path), constants.EXPORT_DIR_NAME)
+
+    with BackgroundParser(export_path, unzip_path, streaming=streaming) as background:
+        futures = {name: background.extract_async(name) for name in constants.PREFETCH_ORDER}
+        workouts, _ = futures[constants.WORKOUT_TAG].result(timeout=60)
+        records = futures[constants.RECORD_TAG].result(timeout=60)
+        stages = background.get_parser().result().stats.to_data_frame()["stage"]
+
+    assert len(workouts) > 0 and len(records) > 0
+    assert all(future.done() for future in futures.values())
+
+    # one ``ElementTree`` or one streamed pass for all prefetched element types
+    stage = constants.STAGE_COLLECT if streaming else constants.STAGE_PARSE
+    assert (stages == stage).sum() == 1
+
+
+def test_extract_awaitable(export_path, tmp_path):
+    unzip_path = os.path.join(str(tmp_path), constants.EXPORT_DIR_NAME)
+
+    with BackgroundParser(export_path, unzip_path, order=[constants.ME_TAG], streaming=True) as background:
+        me = asyncio.run(background.extract(constants.ME_TAG))
+
+    assert isinstance(me, pd.DataFrame)
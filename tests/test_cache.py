@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import os
+
+import health_tracking as ht
+from health_tracking import constants
+
+from conftest import assert_tables_equal, extract_tables, generate_export
+
+
+def test_cache_round_trip(export_path, make_parser, expected, tmp_path):
+    cache_path = str(tmp_path / "cache")
+
+    assert_tables_equal(extract_tables(make_parser(export_path, cache_path=cache_path)), expected)
+
+    cached = make_parser(export_path, cache_path=cache_path)
+    assert_tables_equal(extract_tables(cached), expected)
+
+    stages = set(cached.stats.to_data_frame()["stage"])
+    assert constants.STAGE_CACHE_LOAD in stages
+    assert constants.STAGE_PARSE not in stages
+
+
+def test_new_data_dump_in_place_of_the_old_one(tmp_path):
+    zip_dump_path = str(tmp_path / constants.EXPORT_NAME)
+    unzip_path = os.path.join(str(tmp_path), "interim", constants.EXPORT_DIR_NAME)
+    cache_path = str(tmp_path / "cache")
+
+    generate_export(zip_dump_path, records=700)
+    assert len(ht.AppleHealthParser(zip_dump_path, unzip_path, cache_path=cache_path).extract_records()) == 700
+
+    # neither ``force_unzip`` nor a new ``unzip_path``
+    generate_export(zip_dump_path, records=2100)
+    assert len(ht.AppleHealthParser(zip_dump_path, unzip_path, cache_path=cache_path).extract_records()) == 2100
+
+    ht.InstanceRegistry.clear()
+    cached = ht.AppleHealthParser(zip_dump_path, unzip_path, cache_path=cache_path)
+
+    assert len(cached.extract_records()) == 2100
+    assert constants.STAGE_CACHE_LOAD in set(cached.stats.to_data_frame()["stage"])
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from health_tracking import constants
+
+from conftest import assert_tables_equal, extract_tables
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_parallel_equals_tree(export_path, make_parser, expected, streaming):
+    parser = make_parser(export_path, n_jobs=2, streaming=streaming)
+
+    assert_tables_equal(extract_tables(parser), expected)
+    assert constants.STAGE_PARALLEL_PARSE in set(parser.stats.to_data_frame()["stage"])
+
+
+def test_parallel_equals_serial_compact(export_path, make_parser):
+    serial = make_parser(export_path, compact=True)
+    parallel = make_parser(export_path, compact=True, n_jobs=3)
+
+    assert_tables_equal(extract_tables(parallel), extract_tables(serial))
+    assert constants.STAGE_PARALLEL_PARSE in set(parallel.stats.to_data_frame()["stage"])
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pandas as pd
+import pytest
+
+from health_tracking import cli, constants
+
+
+def test_convert_writes_parquet_tables(export_path, tmp_path, capsys):
+    output_path = str(tmp_path / "tables")
+
+    assert cli.main(["convert", export_path, "--output", output_path, "--jobs", "1", "--tables", constants.RECORD_TAG]) == 0
+
+    records = pd.read_parquet(os.path.join(output_path, "export", f"{constants.RECORD_TAG}.parquet"))
+    assert records["value"].dtype == "float64"
+    assert "Converted 1 of 1 data dumps" in capsys.readouterr().out
+
+
+def test_convert_needs_a_parquet_engine(export_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(cli, "PARQUET_ENGINES", ["no_such_parquet_engine"])
+
+    with pytest.raises(SystemExit):
+        cli.main(["convert", export_path, "--output", str(tmp_path / "tables")])
+
+    assert not os.path.exists(str(tmp_path / "tables"))
+
+
+def test_streaming_is_the_default(export_path, tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(cli, "convert", lambda *args, **kwargs: calls.append(kwargs) or 0)
+
+    cli.main(["convert", export_path, "--output", str(tmp_path)])
+    cli.main(["convert", export_path, "--output", str(tmp_path), "--no-streaming"])
+
+    assert [call["streaming"] for call in calls] == [True, False]
+
+
+@pytest.mark.parametrize("tables", [
+    [constants.RECORD_TAG, constants.WORKOUT_TAG, constants.ACTIVITY_SUMMARY_TAG],
+    [constants.EXPORT_DATE_TAG, constants.WORKOUT_EVENT_TABLE],
+    cli.TABLES
+])
+def test_convert_reads_a_data_dump_once(export_path, tmp_path, tables):
+    measurements = []
+    output_path = str(tmp_path / "export")
+
+    result = cli._convert_export(export_path, output_path, tables, dict(streaming=True, stats_hook=measurements.append))
+
+    assert [measurement["stage"] for measurement in measurements].count(constants.STAGE_COLLECT) == 1
+    assert sorted(os.listdir(output_path)) == sorted(f"{name}.parquet" for name in tables)
+    assert result["rows"] > 0
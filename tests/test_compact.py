@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+
+from health_tracking import constants
+from health_tracking.compact import numeric_from_categorical
+
+from conftest import extract_tables
+
+
+def test_compact_has_the_same_schema(export_path, make_parser, expected):
+    tables = extract_tables(make_parser(export_path, compact=True))
+
+    for name, data_frame in expected.items():
+        if not isinstance(data_frame, pd.DataFrame):
+            continue
+
+        numeric_columns = constants.NUMERIC_COLUMNS.get(name, set())
+        assert list(tables[name].columns) == list(data_frame.columns), name
+        assert all(tables[name][column].dtype == "float32" for column in numeric_columns & set(data_frame.columns)), name
+
+        # float32 only keeps about 7 significant digits
+        tables[name] = tables[name].astype({column: "float64" for column in numeric_columns & set(data_frame.columns)})
+        pd.testing.assert_frame_equal(tables[name], data_frame, obj=name, check_exact=False, rtol=1e-6)
+
+
+def test_numeric_from_categorical():
+    values = pd.Series(["1.5", "HKCategoryValueSleepAnalysisAsleep", None, "1.5", "70"], dtype="category", name="value")
+
+    result = numeric_from_categorical(values, np.float32)
+
+    assert result.dtype == "float32" and result.name == "value"
+    np.testing.assert_array_equal(result.to_numpy(), np.array([1.5, np.nan, np.nan, 1.5, 70], dtype=np.float32))
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+import pytest
+
+from health_tracking import constants
+from health_tracking.deduplication import deduplicate_records
+
+STEPS = "HKQuantityTypeIdentifierStepCount"
+DISTANCE = "HKQuantityTypeIdentifierDistanceWalkingRunning"
+DAY = pd.Timestamp("2020-01-01", tz="UTC")
+
+
+def _records(rows: list) -> pd.DataFrame:
+    """
+    ``Record``s of ``(type, sourceName, start minute, end minute, value)`` rows.
+    """
+
+    types, sources, starts, ends, values = zip(*rows)
+
+    return pd.DataFrame({
+        "type": pd.Categorical(types),
+        "sourceName": pd.Categorical(sources),
+        "startDate": DAY + pd.to_timedelta(starts, unit="min"),
+        "endDate": DAY + pd.to_timedelta(ends, unit="min"),
+        "value": np.array(values, dtype=np.float64)
+    })
+
+
+def _covered_share(start: int, end: int, intervals: list) -> float:
+    """
+    Brute force reference, the share of the minutes of ``[start, end)`` that lie in any of ``intervals``.
+    """
+
+    minutes = [minute for minute in range(start, end) if any(other_start <= minute < other_end for other_start, other_end in intervals)]
+
+    return len(minutes) / (end - start)
+
+
+def test_partial_overlaps_keep_the_uncovered_share():
+    records = _records([
+        (STEPS, "Apple Watch", 0, 10, 100),
+        (STEPS, "iPhone", 5, 15, 60),  # half covered by the watch
+        (STEPS, "iPhone", 20, 30, 40),  # not covered
+        (STEPS, "iPhone", 2, 8, 30),  # completely covered
+        (STEPS, "Apple Watch", 8, 12, 20),  # the same source overlaps, both are kept
+        (STEPS, "iPhone", 3, 3, 5),  # no duration in covered time
+        (STEPS, "iPhone", 16, 16, 7),  # no duration in uncovered time
+        (DISTANCE, "iPhone", 0, 10, 1.0),  # another type is not covered by steps
+        ("HKQuantityTypeIdentifierHeartRate", "Apple Watch", 0, 10, 60)  # no cumulative type
+    ])
+
+    result = deduplicate_records(records, source_priority=["Apple Watch", "iPhone"])
+
+    assert result[["type", "sourceName"]].astype(str).values.tolist() == [
+        [DISTANCE, "iPhone"],
+        [STEPS, "Apple Watch"],
+        [STEPS, "iPhone"],
+        [STEPS, "Apple Watch"],
+        [STEPS, "iPhone"],
+        [STEPS, "iPhone"]
+    ]
+    # the second iPhone record is covered from minute 5 to 12 by both watch records
+    assert result["value"].tolist() == pytest.approx([1.0, 100, 60 * 3 / 10, 20, 7, 40])
+
+
+def test_unlisted_sources_follow_in_alphabetical_order():
+    records = _records([(STEPS, "iPhone", 0, 10, 100), (STEPS, "Apple Watch", 0, 10, 100), (STEPS, "Scale", 5, 10, 10)])
+
+    result = deduplicate_records(records)
+    assert result["sourceName"].astype(str).tolist() == ["Apple Watch"]
+
+    result = deduplicate_records(records, source_priority=["Scale"])
+    assert result["sourceName"].astype(str).tolist() == ["Apple Watch", "Scale"]
+    assert result["value"].tolist() == pytest.approx([50, 10])
+
+
+def test_equals_a_brute_force_reference():
+    generator = np.random.default_rng(0)
+    sources = ["Apple Watch", "iPhone", "Garmin"]
+    rows = []
+
+    for _ in range(300):
+        start = int(generator.integers(0, 600))
+        rows.append((STEPS, sources[generator.integers(0, 3)], start, start + int(generator.integers(1, 30)), float(generator.integers(1, 100))))
+
+    result = deduplicate_records(_records(rows), source_priority=sources)
+
+    expected = []
+
+    for rank, source in enumerate(sources):
+        covering = [(start, end) for _, other_source, start, end, _ in rows if other_source in sources[:rank]]
+
+        for _, row_source, start, end, value in rows:
+            share = 1 - _covered_share(start, end, covering)
+
+            if row_source == source and share > 0:
+                expected.append((start, value * share))
+
+    assert len(result) == len(expected)
+    assert result["value"].sum() == pytest.approx(sum(value for _, value in expected))
+    assert sorted(result["value"]) == pytest.approx(sorted(value for _, value in expected))
+
+
+def test_data_dump_steps_of_two_devices(export_path, make_parser):
+    records = make_parser(export_path).extract_records()
+    steps = records[records["type"] == STEPS]
+
+    result = deduplicate_records(records, source_priority=["Apple Watch"])
+
+    # both devices count the same minutes
+    assert set(result.loc[result["type"] == STEPS, "sourceName"]) == {"Apple Watch"}
+    assert result.loc[result["type"] == STEPS, "value"].sum() == pytest.approx(steps.loc[steps["sourceName"] == "Apple Watch", "value"].sum())
+    assert set(result["type"]) <= constants.DEDUPLICATION_TYPES
+    assert deduplicate_records(None) is None
+    assert deduplicate_records(records, types=["HKCategoryTypeIdentifierMindfulSession"]) is None
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import health_tracking as ht
+from health_tracking import constants, electrocardiograms
+
+from conftest import generate_export
+
+HEADER = (
+    "Name,Jane Doe\n"
+    'Date of Birth,"Jan 1, 1990"\n'
+    "Recorded Date,{date}\n"
+    "Classification,Sinus Rhythm\n"
+    "Symptoms,\n"
+    "Software Version,1.70\n"
+    'Device,"Watch4,4"\n'
+    "Sample Rate,{rate}\n"
+    "Lead,Lead I\n"
+    "Unit,µV\n"
+    "\n"
+)
+
+
+def _generate_export(path, recordings: dict) -> str:
+    """
+    Writes a small synthetic data dump with the ECG CSV files ``recordings``, i.e., file name -> (recorded date, samples).
+    """
+
+    generate_export(path)
+
+    with zipfile.ZipFile(path, "a") as zipped_export:
+        for name, (date, samples) in recordings.items():
+            # the locale of the second recording uses a decimal comma
+            if name.endswith("_2.csv"):
+                content = HEADER.format(date=date, rate="512,0 Hz") + "".join(f'"{sample:.3f}"\n'.replace(".", ",") for sample in samples)
+
+            else:
+                content = HEADER.format(date=date, rate="512 hertz") + "".join(f"{sample:.3f}\n" for sample in samples)
+
+            zipped_export.writestr(f"{constants.EXPORT_DIR_NAME}/{constants.ECG_DIR_NAME}/{name}", content.encode())
+
+    return str(path)
+
+
+@pytest.fixture
+def recordings() -> dict:
+    generator = np.random.default_rng(0)
+
+    return {
+        "ecg_2020-01-01.csv": ("2020-01-01 10:00:00 +0100", np.round(generator.uniform(-500, 500, 300), 3)),
+        "ecg_2020-01-01_2.csv": ("2020-01-01 12:30:00 +0100", np.round(generator.uniform(-500, 500, 200), 3))
+    }
+
+
+@pytest.mark.parametrize("read_from_zip", [False, True])
+def test_samples_equal_the_csv_files(tmp_path, make_parser, recordings, read_from_zip):
+    zip_dump_path = _generate_export(tmp_path / constants.EXPORT_NAME, recordings)
+    unzip_path = os.path.dirname(make_parser(zip_dump_path, read_from_zip=read_from_zip)._xml_path)
+    ecgs = electrocardiograms.Electrocardiograms(zip_dump_path, unzip_path, cache_path=str(tmp_path / "cache"))
+
+    assert len(ecgs) == 2
+    assert ecgs.metadata[constants.ECG_COLUMN_FILE].tolist() == [f"{constants.ECG_DIR_NAME}/{name}" for name in recordings]
+    assert ecgs.metadata[constants.ECG_COLUMN_SAMPLE_RATE].tolist() == [512.0, 512.0]
+    assert ecgs.metadata[constants.ECG_COLUMN_RECORDED_DATE].tolist() == [
+        pd.Timestamp("2020-01-01 09:00", tz="UTC"),
+        pd.Timestamp("2020-01-01 11:30", tz="UTC")
+    ]
+    assert ecgs.metadata["Device"].tolist() == ["Watch4,4"] * 2
+
+    for recording, (_, samples) in enumerate(recordings.values()):
+        np.testing.assert_array_equal(ecgs[recording], samples.astype(np.float32))
+
+    assert isinstance(ecgs.samples, np.memmap)
+
+    with pytest.raises(IndexError):
+        ecgs[2]
+
+
+def test_converted_recordings_are_not_parsed_again(tmp_path, make_parser, recordings, monkeypatch):
+    zip_dump_path = _generate_export(tmp_path / constants.EXPORT_NAME, recordings)
+    unzip_path = os.path.dirname(make_parser(zip_dump_path)._xml_path)
+    cache_path = str(tmp_path / "cache")
+    expected = electrocardiograms.Electrocardiograms(zip_dump_path, unzip_path, cache_path=cache_path)
+
+    monkeypatch.setattr(electrocardiograms, "parse_electrocardiogram", None)
+    ht.InstanceRegistry.clear()
+    cached = electrocardiograms.Electrocardiograms(zip_dump_path, unzip_path, cache_path=cache_path)
+
+    pd.testing.assert_frame_equal(cached.metadata, expected.metadata)
+    np.testing.assert_array_equal(cached.samples, expected.samples)
+
+
+def test_new_data_dump_in_place_of_the_old_one(tmp_path, recordings):
+    zip_dump_path = str(tmp_path / constants.EXPORT_NAME)
+    unzip_path = os.path.join(str(tmp_path), "interim", constants.EXPORT_DIR_NAME)
+    cache_path = str(tmp_path / "cache")
+
+    _generate_export(zip_dump_path, dict(list(recordings.items())[:1]))
+    assert len(electrocardiograms.Electrocardiograms(zip_dump_path, unzip_path, cache_path=cache_path)) == 1
+
+    # neither ``force_unzip`` nor a new ``unzip_path``
+    _generate_export(zip_dump_path, recordings)
+    assert len(electrocardiograms.Electrocardiograms(zip_dump_path, unzip_path, cache_path=cache_path)) == 2
+
+
+def test_data_dump_without_recordings(export_path, make_parser, tmp_path):
+    unzip_path = os.path.dirname(make_parser(export_path)._xml_path)
+    ecgs = electrocardiograms.Electrocardiograms(export_path, unzip_path, cache_path=str(tmp_path / "cache"))
+
+    assert len(ecgs) == 0 and len(ecgs.samples) == 0
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+``import health_tracking`` needs to stay within an import-time budget and must not load heavy dependencies.
+Each measurement imports the package in a fresh interpreter with ``-X importtime``, the fastest one is compared to the
+budget, so a busy machine does not fail the test.
+"""
+
+import os
+import re
+import sys
+import subprocess
+
+import health_tracking as ht
+
+MODULE = "health_tracking"
+BUDGET_SECONDS = 0.05
+REPEAT = 5
+
+# only needed once tables are extracted or plotted
+HEAVY_MODULES = ["pandas", "numpy", "xml.etree.ElementTree", "matplotlib", "seaborn", "pkg_resources", "importlib.metadata"]
+
+IMPORT_TIME_REGEX = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \| (\S+)$")
+
+
+def measure_import(module: str = MODULE) -> (float, list):
+    """
+    Imports ``module`` in a fresh interpreter that finds the same ``health_tracking`` as the tests.
+
+    Returns:
+        (float, list): Cumulative import time of ``module`` in seconds and the ``HEAVY_MODULES`` it loaded
+    """
+
+    code = f"import sys, {module}; print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))"
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(ht.__file__)))
+    python_path = [package_root] + [path for path in os.environ.get("PYTHONPATH", "").split(os.pathsep) if path]
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(python_path))
+
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        env=environment
+    )
+
+    seconds = None
+
+    for line in process.stderr.splitlines():
+        match = IMPORT_TIME_REGEX.match(line)
+
+        if match is not None and match.group(2) == module:
+            seconds = int(match.group(1)) / 10 ** 6
+
+    loaded = [name for name in process.stdout.strip().split(",") if name]
+
+    return seconds, loaded
+
+
+def test_import_loads_no_heavy_modules():
+    _, loaded = measure_import()
+
+    assert loaded == []
+
+
+def test_import_time_is_within_budget():
+    seconds = min(measure_import()[0] for _ in range(REPEAT))
+
+    assert seconds <= BUDGET_SECONDS, f"import {MODULE} took {seconds * 1000:.1f} ms, budget: {BUDGET_SECONDS * 1000:.1f} ms"
+
+
+def test_lazy_attributes():
+    assert isinstance(ht.__version__, str)
+    assert ht.AppleHealthParser.__name__ == "AppleHealthParser"
+    assert "InstanceRegistry" in dir(ht)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import datetime
+
+import pandas as pd
+import pytest
+
+from health_tracking import constants, synthetic
+
+from conftest import generate_export
+
+# export time of the first of two cumulative data dumps, after the last sleep ``Record``, so the new tail of ``Record``s
+# only holds quantities
+FIRST_EXPORT = synthetic.START + datetime.timedelta(days=120, hours=12)
+
+# one ``Workout``, ``Correlation`` and ``ActivitySummary`` per day, some of them in the new tail
+DAYS = 150
+
+# element types whose rows are merged by incremental imports
+INCREMENTAL_TABLES = [constants.RECORD_TAG, constants.WORKOUT_TAG, constants.CORRELATION_TAG, constants.ACTIVITY_SUMMARY_TAG]
+
+
+def _sorted(data_frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Merged tables keep the previous rows first, so they are compared independent of row order.
+    """
+
+    return data_frame.sort_values(list(data_frame.columns)).reset_index(drop=True)
+
+
+def _with_parents(parser, name: str) -> pd.DataFrame:
+    """
+    Replaces the ``constants.PARENT_ID_COLUMN`` of a nested table by the sort key of its parent's row, ``None`` if empty.
+    """
+
+    if parser._children[name] is None:
+        return None
+
+    parent = getattr(parser, parser._ELEMENT_ATTRIBUTES[constants.CHILD_TABLES[name][0]])
+    children = parser._children[name].copy()
+    keys = parent[["creationDate", "startDate"]].astype(str).agg("|".join, axis=1)
+    children[constants.PARENT_ID_COLUMN] = keys.to_numpy()[children[constants.PARENT_ID_COLUMN].to_numpy()]
+
+    return _sorted(children)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_incremental_import_of_cumulative_dumps_equals_full_parse(tmp_path, make_parser, compact):
+    days = dict(workouts=DAYS, correlations=DAYS, activity_summaries=DAYS)
+    first_path = generate_export(tmp_path / "first.zip", until=FIRST_EXPORT, **days)
+    second_path = generate_export(tmp_path / "second.zip", **days)
+    cache_path = str(tmp_path / "cache")
+
+    first = make_parser(first_path, cache_path=cache_path, incremental=True, compact=compact)
+    first.extract_all()
+
+    incremental = make_parser(second_path, cache_path=cache_path, incremental=True, compact=compact)
+    incremental.extract_all()
+
+    full = make_parser(second_path, compact=compact)
+    full.extract_all()
+
+    # the second import only built the new tail
+    assert len(first.extract_records()) < len(full.extract_records())
+
+    for element_type in INCREMENTAL_TABLES:
+        attribute = incremental._ELEMENT_ATTRIBUTES[element_type]
+        pd.testing.assert_frame_equal(_sorted(getattr(incremental, attribute)), _sorted(getattr(full, attribute)))
+
+    for name in constants.CHILD_TABLES:
+        expected = _with_parents(full, name)
+
+        if expected is None:
+            assert incremental._children[name] is None
+
+        else:
+            pd.testing.assert_frame_equal(_with_parents(incremental, name), expected)
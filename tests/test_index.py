@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import pandas as pd
+import pytest
+
+from health_tracking import constants, index
+
+HEART_RATE = "HKQuantityTypeIdentifierHeartRate"
+SLEEP = "HKCategoryTypeIdentifierSleepAnalysis"
+TYPES = [SLEEP, HEART_RATE]
+
+
+@pytest.mark.parametrize("arguments", [dict(), dict(streaming=True), dict(read_from_zip=True)])
+def test_extract_records_of_types(export_path, make_parser, expected, arguments):
+    records = expected[constants.RECORD_TAG]
+    selected = pd.concat([records[records["type"] == record_type] for record_type in TYPES], ignore_index=True)
+
+    # as if only these types were parsed
+    for column in selected.select_dtypes("category"):
+        selected[column] = selected[column].cat.remove_unused_categories()
+
+    parser = make_parser(export_path, **arguments)
+    pd.testing.assert_frame_equal(parser.extract_records(types=TYPES), selected)
+
+    # the same query returns the same table after all ``Record``s are parsed
+    parser.extract_records()
+    pd.testing.assert_frame_equal(parser.extract_records(types=TYPES), selected)
+
+
+def test_record_index_counts_the_records_of_each_type(export_path, make_parser, expected, monkeypatch):
+    record_index = make_parser(export_path).get_record_index()
+    counts = expected[constants.RECORD_TAG]["type"].astype(str).value_counts()
+
+    assert list(record_index.columns) == index.INDEX_COLUMNS
+    assert record_index.groupby("type")["count"].sum().to_dict() == counts.to_dict()
+    assert (record_index["start"] < record_index["end"]).all()
+
+    # records crossing the blocks the document is scanned in
+    monkeypatch.setattr(index, "INDEX_BLOCK_SIZE", 4096)
+    monkeypatch.setattr(index, "INDEX_BLOCK_OVERLAP", 1024)
+    pd.testing.assert_frame_equal(make_parser(export_path).get_record_index(), record_index)
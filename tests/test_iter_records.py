@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+import pandas as pd
+import pytest
+
+from health_tracking import constants
+
+HEART_RATE = "HKQuantityTypeIdentifierHeartRate"
+
+
+@pytest.mark.parametrize("arguments", [dict(), dict(compact=True)])
+def test_iter_records_equals_extract_records(export_path, make_parser, arguments):
+    parser = make_parser(export_path, **arguments)
+    chunks = list(parser.iter_records(chunk_size=300))
+    expected = make_parser(export_path, **arguments).extract_records()
+
+    assert all(len(chunk) == 300 for chunk in chunks[:-1])
+
+    # e.g., chunks of sleep ``Record``s only have the columns and data types of all others
+    for chunk in chunks:
+        pd.testing.assert_series_equal(chunk.dtypes.astype(str).sort_index(), expected.dtypes.astype(str).sort_index())
+
+    records = pd.concat([chunk[expected.columns].astype(object) for chunk in chunks], ignore_index=True)
+    pd.testing.assert_frame_equal(records, expected.astype(object))
+
+
+def test_iter_other_element_types(export_path, make_parser, expected):
+    parser = make_parser(export_path)
+
+    for element_type, iterate in [
+        (constants.WORKOUT_TAG, parser.iter_workouts),
+        (constants.CORRELATION_TAG, parser.iter_correlations),
+        (constants.ACTIVITY_SUMMARY_TAG, parser.iter_activity_summaries)
+    ]:
+        chunks = list(iterate(chunk_size=7))
+
+        assert all(len(chunk) == 7 for chunk in chunks[:-1])
+        assert sum(len(chunk) for chunk in chunks) == len(expected[element_type]), element_type
+
+    heart_rates = pd.concat(parser.iter_records(chunk_size=100, types=[HEART_RATE]), ignore_index=True)
+    records = expected[constants.RECORD_TAG]
+    assert len(heart_rates) == (records["type"] == HEART_RATE).sum()
+    assert set(heart_rates["type"]) == {HEART_RATE}
+
+
+def test_invalid_chunk_size(export_path, make_parser):
+    with pytest.raises(ValueError):
+        list(make_parser(export_path).iter_records(chunk_size=0))
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from health_tracking import constants
+
+from conftest import assert_tables_equal, extract_tables
+
+
+def _extract_separately(parser) -> dict:
+    """
+    Extracts each table with its own ``extract_*`` method.
+    """
+
+    return {
+        constants.EXPORT_DATE_TAG: parser.get_export_date(),
+        constants.ME_TAG: parser.extract_me(),
+        constants.RECORD_TAG: parser.extract_records(),
+        constants.WORKOUT_TAG: parser.extract_workouts()[0],
+        constants.CORRELATION_TAG: parser.extract_correlations(),
+        constants.ACTIVITY_SUMMARY_TAG: parser.extract_activity_summaries(),
+        constants.CLINICAL_RECORD_TAG: parser.extract_clinical_records(),
+        constants.RECORD_METADATA_ENTRY_TABLE: parser.extract_record_metadata_entries(),
+        constants.INSTANTANEOUS_BEATS_PER_MINUTE_TABLE: parser.extract_instantaneous_beats_per_minute(),
+        constants.CORRELATION_METADATA_ENTRY_TABLE: parser.extract_correlation_metadata_entries(),
+        constants.CORRELATION_RECORD_TABLE: parser.extract_correlation_records(),
+        constants.WORKOUT_METADATA_ENTRY_TABLE: parser.extract_workout_metadata_entries(),
+        constants.WORKOUT_EVENT_TABLE: parser.extract_workout_events(),
+        constants.WORKOUT_ROUTE_TABLE: parser.extract_workout_routes()
+    }
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_extract_all_reads_the_document_once(export_path, make_parser, streaming):
+    parser = make_parser(export_path, streaming=streaming)
+    tables = extract_tables(parser)
+    stages = parser.stats.to_data_frame()["stage"]
+
+    assert (stages == (constants.STAGE_COLLECT if streaming else constants.STAGE_PARSE)).sum() == 1
+
+    # the ``extract_*`` methods return the tables without parsing again
+    assert_tables_equal(_extract_separately(parser), tables)
+    assert len(parser.stats.to_data_frame()) == len(stages)
+
+    assert_tables_equal(_extract_separately(make_parser(export_path, streaming=streaming)), tables)
+
+
+def test_unknown_element_type(export_path, make_parser):
+    parser = make_parser(export_path)
+
+    with pytest.raises(ValueError):
+        parser.extract_all([constants.RECORD_TAG, "Unknown"])
+
+    with pytest.raises(ValueError):
+        parser._extract_elements_of_type("Unknown")
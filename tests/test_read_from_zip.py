@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+
+from conftest import assert_tables_equal, extract_tables
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_read_from_zip_equals_tree(export_path, make_parser, expected, streaming):
+    parser = make_parser(export_path, read_from_zip=True, streaming=streaming)
+
+    assert_tables_equal(extract_tables(parser), expected)
+
+    # nothing is unzipped
+    assert not os.path.exists(os.path.dirname(parser._xml_path))
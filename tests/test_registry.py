@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import health_tracking as ht
+from health_tracking import constants
+
+from conftest import generate_export
+
+
+def _unzip_path(tmp_path, name: str) -> str:
+    return os.path.join(str(tmp_path), name, constants.EXPORT_DIR_NAME)
+
+
+def test_one_parser_per_data_dump(export_path, tmp_path):
+    other_path = generate_export(tmp_path / "other.zip", records=700)
+
+    parser = ht.AppleHealthParser(export_path, _unzip_path(tmp_path, "first"))
+    other = ht.AppleHealthParser(other_path, _unzip_path(tmp_path, "second"))
+
+    # further arguments are only used by the first construction
+    assert ht.AppleHealthParser(export_path, _unzip_path(tmp_path, "first"), streaming=True) is parser
+    assert other is not parser
+    assert len(other.extract_records()) == 700
+    assert len(parser.extract_records()) != 700
+
+
+def test_least_recently_used_idle_parsers_are_evicted(export_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(constants, "MAX_PARSER_INSTANCES", 2)
+    first = ht.AppleHealthParser(export_path, _unzip_path(tmp_path, "first"))
+    second = ht.AppleHealthParser(export_path, _unzip_path(tmp_path, "second"))
+
+    assert ht.AppleHealthParser(export_path, _unzip_path(tmp_path, "first")) is first
+    ht.AppleHealthParser(export_path, _unzip_path(tmp_path, "third"))
+
+    assert ht.AppleHealthParser(export_path, _unzip_path(tmp_path, "first")) is first
+    assert ht.AppleHealthParser(export_path, _unzip_path(tmp_path, "second")) is not second
+
+    # parsers that extract tables are kept
+    with first._locked([constants.RECORD_TAG]):
+        ht.AppleHealthParser(export_path, _unzip_path(tmp_path, "fourth"))
+        ht.AppleHealthParser(export_path, _unzip_path(tmp_path, "fifth"))
+
+        assert ht.AppleHealthParser(export_path, _unzip_path(tmp_path, "first")) is first
+
+
+def test_concurrent_extraction_parses_once(export_path, tmp_path):
+    unzip_path = _unzip_path(tmp_path, "concurrent")
+    barrier = threading.Barrier(4)
+
+    def extract(position: int):
+        parser = ht.AppleHealthParser(export_path, unzip_path)
+        barrier.wait()
+
+        return parser, parser.extract_records() if position % 2 else parser.extract_workouts()[0]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(extract, range(4)))
+
+    parsers = {id(parser) for parser, _ in results}
+    assert len(parsers) == 1
+
+    # the same ``DataFrame``s of one ``ElementTree``
+    assert results[1][1] is results[3][1] and results[0][1] is results[2][1]
+    stages = results[0][0].stats.to_data_frame()["stage"]
+    assert (stages == constants.STAGE_PARSE).sum() == 1
+    assert (stages == constants.STAGE_UNZIP).sum() == 1
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import datetime
+import os
+
+import pandas as pd
+import pytest
+
+from health_tracking import constants, rollups, synthetic
+
+from conftest import generate_export
+
+HEART_RATE = "HKQuantityTypeIdentifierHeartRate"
+
+
+def _rollups(zip_dump_path: str, cache_path: str) -> rollups.Rollups:
+    unzip_path = os.path.join(os.path.dirname(zip_dump_path), os.path.basename(zip_dump_path) + "_unzipped", constants.EXPORT_DIR_NAME)
+
+    return rollups.Rollups(zip_dump_path, unzip_path, cache_path=cache_path)
+
+
+def test_rollups_aggregate_quantities(export_path, make_parser, tmp_path):
+    result = _rollups(export_path, str(tmp_path / "cache"))
+    records = make_parser(export_path).extract_records()
+    quantities = records[records["value"].notna()]
+
+    assert result.hourly["type"].astype(str).str.startswith(constants.QUANTITY_TYPE_PREFIX).all()
+    assert result.hourly["count"].sum() == result.daily["count"].sum() == result.weekly["count"].sum() == len(quantities)
+    assert result.weekly["sum"].sum() == pytest.approx(quantities["value"].sum())
+    assert (result.weekly[constants.ROLLUP_COLUMN_PERIOD].dt.dayofweek == 0).all()
+
+    heart_rates = result[constants.ROLLUP_DAILY][result.daily["type"] == HEART_RATE]
+    assert (heart_rates["min"] <= heart_rates["mean"]).all() and (heart_rates["mean"] <= heart_rates["max"]).all()
+
+    with pytest.raises(ValueError):
+        result["monthly"]
+
+
+def test_incremental_rollups_equal_a_full_rebuild(tmp_path):
+    # in the middle of the heart rates and step counts
+    first_path = generate_export(tmp_path / "first.zip", until=synthetic.START + datetime.timedelta(days=1, hours=5))
+    second_path = generate_export(tmp_path / "second.zip")
+
+    _rollups(first_path, str(tmp_path / "incremental"))
+    incremental = _rollups(second_path, str(tmp_path / "incremental"))
+    full = _rollups(second_path, str(tmp_path / "full"))
+
+    for frequency in constants.ROLLUP_FREQUENCIES:
+        pd.testing.assert_frame_equal(incremental[frequency], full[frequency], check_categorical=False, obj=frequency)
+
+    # only the stored rollups
+    stored = rollups.Rollups(second_path, "does_not_exist", cache_path=str(tmp_path / "incremental"), update=False)
+    pd.testing.assert_frame_equal(stored.daily, full.daily, check_categorical=False)
+
+
+def test_rollups_of_a_data_dump_without_records(tmp_path):
+    zip_dump_path = generate_export(tmp_path / constants.EXPORT_NAME, records=0)
+    result = _rollups(zip_dump_path, str(tmp_path / "cache"))
+
+    for frequency in constants.ROLLUP_FREQUENCIES:
+        assert result[frequency].empty
+        assert str(result[frequency][constants.ROLLUP_COLUMN_PERIOD].dtype) == "datetime64[ns]"
+        assert result[frequency]["sum"].dtype == "float64"
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import os
+import zipfile
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+
+from health_tracking import constants, routes
+
+from conftest import ROUTE_POINTS
+
+GPX_NAMESPACE = {"gpx": "http://www.topografix.com/GPX/1/1"}
+
+
+def _parse_with_element_tree(content: bytes) -> np.ndarray:
+    """
+    Reference parser of GPX files.
+    """
+
+    points = ET.fromstring(content).findall(".//gpx:trkpt", GPX_NAMESPACE)
+    result = np.empty(len(points), dtype=routes.ROUTE_POINT_DTYPE)
+
+    for position, point in enumerate(points):
+        result[position] = (
+            np.datetime64(point.find("gpx:time", GPX_NAMESPACE).text.rstrip("Z"), "ns"),
+            float(point.get("lat")),
+            float(point.get("lon")),
+            float(point.find("gpx:ele", GPX_NAMESPACE).text)
+        )
+
+    return result
+
+
+def test_parse_gpx_attribute_orders_and_missing_elevation():
+    content = (
+        b'<trkseg><trkpt lat="52.5" lon="13.4"><time>2019-06-01T05:12:44Z</time></trkpt>\n'
+        b'<trkpt lon="13.5" lat="52.6"><ele>35.5</ele><time>2019-06-01T05:12:45Z</time></trkpt></trkseg>'
+    )
+    track = routes.parse_gpx(content)
+
+    np.testing.assert_array_equal(track["latitude"], [52.5, 52.6])
+    np.testing.assert_array_equal(track["longitude"], [13.4, 13.5])
+    assert np.isnan(track["elevation"][0]) and track["elevation"][1] == np.float32(35.5)
+    assert track["time"][1] == np.datetime64("2019-06-01T05:12:45", "ns")
+
+    assert len(routes.parse_gpx(b"")) == 0
+
+    with pytest.raises(ValueError):
+        routes.parse_gpx(b'<trkpt lat="52.5"><time>2019-06-01T05:12:44Z</time></trkpt>')
+
+
+@pytest.mark.parametrize("arguments", [dict(n_jobs=1), dict(n_jobs=2, read_from_zip=True)])
+def test_tracks_equal_the_gpx_files(export_path, make_parser, monkeypatch, arguments):
+    # one route per task, so two routes use the process pool
+    monkeypatch.setattr(routes, "ROUTES_PER_TASK", 1)
+    parser = make_parser(export_path, read_from_zip=arguments.pop("read_from_zip", False))
+    workout_routes = routes.WorkoutRoutes(export_path, os.path.dirname(parser._xml_path), **arguments)
+    workouts, _ = parser.extract_workouts()
+
+    assert len(workout_routes) == 2
+    assert workout_routes.routes[constants.ROUTE_COLUMN_POINTS].tolist() == [ROUTE_POINTS] * 2
+    assert workout_routes.routes[constants.WORKOUT_TYPE].tolist() == workouts[constants.WORKOUT_TYPE].iloc[:2].tolist()
+
+    with zipfile.ZipFile(export_path) as zipped_export:
+        for route, path in enumerate(workout_routes.routes[constants.WORKOUT_ROUTE_PATH]):
+            expected = _parse_with_element_tree(zipped_export.read(f"{constants.EXPORT_DIR_NAME}{path}"))
+
+            np.testing.assert_array_equal(workout_routes[route], expected)
+            np.testing.assert_array_equal(workout_routes.get_workout_tracks(route)[0], expected)
+
+    points = workout_routes.to_data_frame()
+    assert len(points) == len(workout_routes.points) == 2 * ROUTE_POINTS
+    assert points.groupby(constants.PARENT_ID_COLUMN).size().tolist() == [ROUTE_POINTS] * 2
+    assert str(points["time"].dt.tz) == "UTC"
+
+    with pytest.raises(IndexError):
+        workout_routes[2]
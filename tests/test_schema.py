@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+import pandas as pd
+
+from health_tracking import constants
+
+HEART_RATE = "HKQuantityTypeIdentifierHeartRate"
+SLEEP = "HKCategoryTypeIdentifierSleepAnalysis"
+
+
+def test_tables_have_schema_data_types(expected):
+    records = expected[constants.RECORD_TAG]
+
+    assert records["value"].dtype == "float64"
+    assert isinstance(records["type"].dtype, pd.CategoricalDtype)
+    assert str(records["startDate"].dtype) == "datetime64[ns, UTC]"
+    assert records.loc[records["type"] == SLEEP, "value"].isna().all()
+    assert (records.loc[records["type"] == SLEEP, "categoryValue"] == "HKCategoryValueSleepAnalysisAsleep").all()
+    assert records.loc[records["type"] == HEART_RATE, "categoryValue"].isna().all()
+
+
+def test_data_types_do_not_depend_on_the_rows(export_path, make_parser, expected):
+    records = expected[constants.RECORD_TAG]
+
+    # neither a number nor a ``unit`` in any row
+    sleep = make_parser(export_path).extract_records(types=[SLEEP])
+
+    assert set(sleep.columns) == set(records.columns)
+    assert sleep["unit"].isna().all()
+    pd.testing.assert_series_equal(sleep.dtypes.astype(str).sort_index(), records.dtypes.astype(str).sort_index())
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import logging
+
+import pandas as pd
+import pytest
+
+from health_tracking import constants
+from health_tracking.stats import ParseStats
+
+
+def test_measure_records_finished_stages():
+    measurements = []
+    stats = ParseStats(measurements.append)
+
+    with stats.measure(constants.STAGE_BUILD, constants.RECORD_TAG) as measurement:
+        measurement["rows"] = 10
+
+    with pytest.raises(RuntimeError):
+        with stats.measure(constants.STAGE_PARSE):
+            raise RuntimeError()
+
+    stages = stats.to_data_frame()
+
+    assert list(stages.columns) == constants.STATS_COLUMNS
+    assert stages[["stage", "table", "rows"]].values.tolist() == [[constants.STAGE_BUILD, constants.RECORD_TAG, 10]]
+    assert stages["wall_seconds"].iloc[0] >= 0
+    assert [measurement["stage"] for measurement in measurements] == [constants.STAGE_BUILD]
+
+    stats.clear()
+    assert stats.to_data_frame().empty
+
+
+def test_parser_reports_its_stages(export_path, make_parser, caplog):
+    measurements = []
+
+    with caplog.at_level(logging.DEBUG, logger="health_tracking.stats"):
+        parser = make_parser(export_path, stats_hook=measurements.append)
+        records = parser.extract_records()
+
+    stages = parser.stats.to_data_frame()
+
+    pd.testing.assert_frame_equal(stages, pd.DataFrame(measurements, columns=constants.STATS_COLUMNS))
+    assert {constants.STAGE_UNZIP, constants.STAGE_PARSE, constants.STAGE_BUILD, constants.STAGE_FIX_DATA_TYPES} <= set(stages["stage"])
+    assert stages.loc[(stages["stage"] == constants.STAGE_BUILD) & (stages["table"] == constants.RECORD_TAG), "rows"].tolist() == [len(records)]
+    assert len(caplog.records) == len(stages)
+
+    summary = parser.stats.summary()
+    assert summary["count"].sum() == len(stages)
+    assert summary["wall_seconds"].is_monotonic_decreasing
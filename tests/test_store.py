@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from health_tracking import constants, rollups
+
+HEART_RATE = "HKQuantityTypeIdentifierHeartRate"
+SLEEP = "HKCategoryTypeIdentifierSleepAnalysis"
+KEY_COLUMNS = ["type", "sourceName", "startDate"]
+
+
+def _comparable(records: pd.DataFrame, columns: list = KEY_COLUMNS) -> pd.DataFrame:
+    """
+    Sorts ``records`` by ``columns`` and gives them the data types of the database, i.e., strings and floats.
+    """
+
+    result = records.sort_values(columns, ignore_index=True)
+
+    for column, dtype in result.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            result[column] = result[column].astype(object).where(result[column].notna(), None)
+
+        elif pd.api.types.is_integer_dtype(dtype):
+            result[column] = result[column].astype(np.int64)
+
+    return result
+
+
+@pytest.mark.parametrize("query", [
+    dict(),
+    dict(types=[SLEEP, HEART_RATE]),
+    dict(types=[HEART_RATE], start="2019-01-01 12:00", end=pd.Timestamp("2019-01-01 18:00", tz="Europe/Berlin")),
+    dict(start="2019-03-01")
+])
+def test_query_records_equals_extract_records(export_path, make_parser, tmp_path, query):
+    parser = make_parser(export_path)
+    database_path = str(tmp_path / "health.sqlite")
+
+    expected = parser.extract_records(**query)
+    result = parser.query_records(database_path=database_path, **query)
+
+    assert result["startDate"].is_monotonic_increasing
+    pd.testing.assert_frame_equal(_comparable(result), _comparable(expected), check_dtype=False)
+
+
+def test_query_records_of_sources_and_periods(export_path, make_parser, tmp_path):
+    parser = make_parser(export_path, cache_path=str(tmp_path / "cache"))
+    records = parser.extract_records()
+
+    steps = parser.query_records(["HKQuantityTypeIdentifierStepCount"], ["iPhone"])
+    assert set(steps["sourceName"]) == {"iPhone"}
+    assert len(steps) == ((records["type"] == "HKQuantityTypeIdentifierStepCount") & (records["sourceName"] == "iPhone")).sum()
+    assert os.path.exists(os.path.join(parser._cache.directory, constants.SQLITE_NAME))
+
+    # the same aggregates as the rollups, without the sleep analysis
+    daily = parser.query_records(frequency=constants.ROLLUP_DAILY)
+    expected = rollups.coarsen_rollup(rollups.compute_hourly_rollup(records), constants.ROLLUP_DAILY)
+
+    assert SLEEP not in set(daily["type"])
+    pd.testing.assert_frame_equal(daily, _comparable(expected, constants.ROLLUP_KEY_COLUMNS), check_dtype=False)
+
+    monthly = parser.query_records(types=[HEART_RATE], frequency=constants.ROLLUP_MONTHLY)
+    assert monthly[constants.ROLLUP_COLUMN_PERIOD].dt.day.eq(1).all()
+    assert monthly["count"].sum() == (records["type"] == HEART_RATE).sum()
+
+    assert parser.query_records(types=["HKQuantityTypeIdentifierUnknown"]) is None
+
+    with pytest.raises(ValueError):
+        parser.query_records(frequency="minutely")
+
+
+def test_export_to_sqlite_writes_all_tables(export_path, make_parser, tmp_path):
+    parser = make_parser(export_path)
+    database_path = parser.export_to_sqlite(str(tmp_path / "health.sqlite"))
+    parser.extract_all()
+
+    for name in [*parser._ELEMENT_ATTRIBUTES, *constants.CHILD_TABLES]:
+        table = getattr(parser, parser._ELEMENT_ATTRIBUTES[name]) if name in parser._ELEMENT_ATTRIBUTES else parser._children[name]
+
+        if table is not None:
+            assert parser.query(f'SELECT COUNT(*) AS rows FROM "{name}"', database_path=database_path)["rows"].iloc[0] == len(table), name
+
+    indexes = parser.query("SELECT name FROM sqlite_master WHERE type = 'index'", database_path=database_path)["name"]
+    assert {f"{constants.RECORD_TAG}_{column}" for column in ["type", "sourceName", "startDate"]} <= set(indexes)
+
+    export_date = parser.query("SELECT value FROM ExportDate", database_path=database_path)["value"].iloc[0]
+    assert pd.Timestamp(export_date, tz="UTC") == parser.get_export_date()
+
+    with pytest.raises(ValueError):
+        parser.query("SELECT 1")
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+from health_tracking import constants
+
+from conftest import assert_tables_equal, extract_tables
+
+
+def test_streaming_equals_tree(export_path, make_parser, expected):
+    parser = make_parser(export_path, streaming=True)
+
+    assert_tables_equal(extract_tables(parser), expected)
+
+    # no ``ElementTree`` is kept
+    assert parser._tree is None
+    assert constants.STAGE_PARSE not in set(parser.stats.to_data_frame()["stage"])
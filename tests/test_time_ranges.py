@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+import pandas as pd
+import pytest
+
+from health_tracking import constants
+
+HEART_RATE = "HKQuantityTypeIdentifierHeartRate"
+SLEEP = "HKCategoryTypeIdentifierSleepAnalysis"
+TYPES = [SLEEP, HEART_RATE]
+
+START = "2019-01-02"
+END = pd.Timestamp("2019-02-01 12:00", tz="Europe/Berlin")
+
+
+@pytest.mark.parametrize("arguments", [dict(), dict(streaming=True)])
+def test_extract_time_ranges(export_path, make_parser, expected, arguments):
+    records = expected[constants.RECORD_TAG]
+    start, end = pd.Timestamp(START, tz="UTC"), END.tz_convert("UTC")
+    in_range = (records["startDate"] >= start) & (records["startDate"] < end)
+
+    parser = make_parser(export_path, **arguments)
+    result = parser.extract_records(start=START, end=END)
+
+    pd.testing.assert_frame_equal(result.astype(object), records[in_range].reset_index(drop=True).astype(object))
+
+    heart_rates = parser.extract_records(types=[HEART_RATE], start=START, end=END)
+    assert len(heart_rates) == (in_range & (records["type"] == HEART_RATE)).sum()
+    assert set(heart_rates["type"]) == {HEART_RATE}
+
+    workouts, workout_types = parser.extract_workouts(end=END)
+    assert len(workouts) == (expected[constants.WORKOUT_TAG]["startDate"] < end).sum()
+    assert workout_types <= set(expected[constants.WORKOUT_TAG][constants.WORKOUT_TYPE])
+
+    summaries = parser.extract_activity_summaries(start=START)
+    days = expected[constants.ACTIVITY_SUMMARY_TAG]["dateComponents"]
+    assert summaries["dateComponents"].tolist() == days[days >= pd.Timestamp(START)].tolist()
+
+
+def test_extract_time_range_from_cache(export_path, make_parser, tmp_path):
+    cache_path = str(tmp_path / "cache")
+    expected = make_parser(export_path).extract_records(types=TYPES, start=START, end=END)
+
+    make_parser(export_path, cache_path=cache_path).extract_all()
+
+    pd.testing.assert_frame_equal(make_parser(export_path, cache_path=cache_path).extract_records(types=TYPES, start=START, end=END), expected)
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+import pytest
+
+from health_tracking.timestamps import parse_healthkit_timestamps
+
+
+def test_parse_healthkit_timestamps_converts_to_utc_and_keeps_offsets():
+    timestamps, offsets = parse_healthkit_timestamps(pd.Series(["2019-06-01 07:12:44 +0200", None, "2020-02-29 23:59:59 -0930"]))
+
+    expected = pd.Series(pd.to_datetime(["2019-06-01 05:12:44", None, "2020-03-01 09:29:59"]).tz_localize("UTC"))
+    pd.testing.assert_series_equal(timestamps, expected)
+    assert offsets.dtype == np.int16
+    assert offsets.tolist() == [120, 0, -570]
+
+
+@pytest.mark.parametrize("value", [
+    "2019-06-01 07:12:44",
+    "2019-06-01T07:12:44 +0200",
+    "2019-06-01 07:12:44 +02:00",
+    "2019-13-45 07:12:44 +0200",
+    "2019-00-10 07:12:44 +0200",
+    "2019-01-00 07:12:44 +0200",
+    "2019-02-29 07:12:44 +0200",
+    "2019-04-31 07:12:44 +0200",
+    "2019-02-28 25:61:99 +0000",
+    "2019-02-28 24:00:00 +0000",
+    "2019-02-28 00:00:00 +0060",
+    "3000-01-01 00:00:00 +0000"
+])
+def test_parse_healthkit_timestamps_rejects_invalid_values(value):
+    with pytest.raises(ValueError):
+        parse_healthkit_timestamps(pd.Series(["2019-06-01 07:12:44 +0200", value]))
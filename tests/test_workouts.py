@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pandas as pd
+import pytest
+
+from health_tracking import constants
+from health_tracking.workouts import Workouts, calc_minutes_per_km, compute_minutes_per_km
+
+
+def _row_wise(workouts: pd.DataFrame, workout_type: str) -> pd.DataFrame:
+    """
+    The ``DataFrame`` of ``workout_type`` as it was built row by row before.
+    """
+
+    type_df = workouts[workouts[constants.WORKOUT_TYPE] == workout_type].copy().reset_index(drop=True)
+    type_df[constants.WORKOUT_COLUMN_MINUTES_PER_KM] = type_df.apply(calc_minutes_per_km, axis=1)
+
+    first_workout = type_df[constants.WORKOUT_COLUMN_DATE][0]
+    type_df[constants.WORKOUT_COLUMN_OFFSET] = type_df.apply(lambda row: (row[constants.WORKOUT_COLUMN_DATE] - first_workout).days, axis=1)
+
+    return type_df
+
+
+def test_workout_types_equal_the_row_wise_results(export_path, make_parser):
+    parser = make_parser(export_path)
+    workouts = Workouts(export_path, os.path.dirname(parser._xml_path))
+    parsed, workout_types = parser.extract_workouts()
+
+    assert workout_types == {"running", "walking", "cycling", "swimming"}
+    assert constants.WORKOUT_COLUMN_OFFSET not in parsed.columns
+
+    for workout_type in workout_types:
+        expected = _row_wise(parsed, workout_type)
+        result = workouts[f"{workout_type}s"]
+
+        pd.testing.assert_series_equal(result[constants.WORKOUT_COLUMN_OFFSET], expected[constants.WORKOUT_COLUMN_OFFSET], check_dtype=False)
+        pd.testing.assert_series_equal(result[constants.WORKOUT_COLUMN_MINUTES_PER_KM], expected[constants.WORKOUT_COLUMN_MINUTES_PER_KM])
+        pd.testing.assert_frame_equal(result[parsed.columns], expected[parsed.columns])
+
+    assert workouts.runnings is workouts["runnings"]
+    dates = parsed[constants.WORKOUT_COLUMN_DATE]
+    assert workouts["workouts"][constants.WORKOUT_COLUMN_OFFSET].tolist() == [(date - dates[0]).days for date in dates]
+
+    with pytest.raises(ValueError):
+        workouts["hikings"]
+
+    with pytest.raises(AttributeError):
+        workouts.hikings
+
+
+def test_minutes_per_km_of_zero_duration_or_distance():
+    workouts = pd.DataFrame({
+        constants.WORKOUT_COLUMN_DURATION: [30.0, 0.0, 25.0, 0.0],
+        constants.WORKOUT_COLUMN_DISTANCE: [5.0, 3.0, 0.0, 0.0]
+    })
+
+    expected = workouts.apply(calc_minutes_per_km, axis=1)
+
+    pd.testing.assert_series_equal(compute_minutes_per_km(workouts), expected, check_dtype=False)
+    assert compute_minutes_per_km(workouts).tolist() == [6.0, 0, 0, 0]